@@ -0,0 +1,105 @@
+"""Record/replay cassettes for LLM calls.
+
+Every LLM request is keyed by a SHA-256 over its canonical JSON (call kind,
+model, input items, tools and reasoning options). In ``record`` mode the
+response, or the streamed event sequence with each event's offset from the
+request, is written to ``LLM_CASSETTE_DIR/<key>.json``. In ``replay`` mode
+those files are served instead of calling OpenAI and a missing one is an
+error. ``cache`` mode replays non-streaming calls (sub-agents, compaction)
+when a cassette exists and records them when it doesn't; streaming calls go
+to OpenAI as usual.
+
+Replayed latency is the recorded latency times LLM_CASSETTE_LATENCY_SCALE:
+0 serves instantly, 1 reproduces the original timing.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+OFF = "off"
+RECORD = "record"
+REPLAY = "replay"
+CACHE = "cache"
+
+CALL = "call"
+STREAM = "stream"
+
+stats = {"hits": 0, "misses": 0, "recorded": 0}
+
+
+class CassetteMiss(LookupError):
+    """Replay mode was asked for a request that was never recorded."""
+
+
+def mode() -> str:
+    return settings.LLM_CASSETTE_MODE.lower()
+
+
+def should_replay(kind: str) -> bool:
+    return mode() == REPLAY or (mode() == CACHE and kind == CALL)
+
+
+def should_record(kind: str) -> bool:
+    return mode() == RECORD or (mode() == CACHE and kind == CALL)
+
+
+def request_key(kind: str, request: dict) -> str:
+    canonical = json.dumps(
+        {"kind": kind, **request}, sort_keys=True, separators=(",", ":"), default=str
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def _path(key: str) -> Path:
+    return Path(settings.LLM_CASSETTE_DIR) / f"{key}.json"
+
+
+def load(key: str) -> dict | None:
+    path = _path(key)
+    if not path.exists():
+        stats["misses"] += 1
+        return None
+    stats["hits"] += 1
+    return json.loads(path.read_text())
+
+
+def save(key: str, kind: str, request: dict, record: dict) -> None:
+    path = _path(key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    document = {
+        "kind": kind,
+        "model": request.get("model"),
+        "recorded_at": datetime.now(timezone.utc).isoformat(),
+        **record,
+    }
+    # Write-then-rename so a concurrent reader never sees half a file
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(document, default=str))
+    tmp.replace(path)
+    stats["recorded"] += 1
+
+
+def require(key: str) -> dict:
+    record = load(key)
+    if record is None:
+        raise CassetteMiss(f"No LLM cassette for request {key[:12]} in {settings.LLM_CASSETTE_DIR}")
+    return record
+
+
+async def wait_until(started: float, offset: float) -> None:
+    """Sleep until ``offset`` recorded seconds (scaled) after ``started``."""
+    scale = settings.LLM_CASSETTE_LATENCY_SCALE
+    if scale <= 0:
+        return
+    remaining = started + offset * scale - time.monotonic()
+    if remaining > 0:
+        await asyncio.sleep(remaining)
@@ -0,0 +1,145 @@
+"""Rolling context compaction for long sessions.
+
+Once a session's LLM input grows past a token threshold, every turn except
+the most recent few is summarized into a CONTEXT_SUMMARY entry. The summary
+records the last seq it covers; ``build_responses_input`` then replays the
+summary plus only the entries after it. Cuts are made at user-message
+boundaries, so a tool call and its result always land on the same side.
+"""
+
+import json
+import logging
+import uuid
+
+from agent.llm import call_llm
+from agent.memory_retrieval import estimate_tokens
+from agent.usage import record_usage
+from config import settings
+from observability import tracing
+from db.models import EntryKind
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_PROMPT = (
+    "You compress the earlier part of a conversation between a user and a parking sign "
+    "assistant so it can continue without the full transcript.\n\n"
+    "Write a concise summary that keeps everything a later turn may rely on: "
+    "signs that were read (with their key rules), locations saved or searched and their results, "
+    "uploaded_file_ids, facts the user stated, and any open questions or promises. "
+    "Drop greetings, reasoning and raw tool payloads. Use short bullet points."
+)
+
+_RESULT_CHARS = 600
+
+
+def estimate_input_tokens(items: list[dict]) -> int:
+    total = 0
+    for item in items:
+        total += estimate_tokens(
+            item.get("content") or item.get("output") or item.get("arguments") or ""
+        )
+    return total
+
+
+def latest_summary(entries: list):
+    for entry in reversed(entries):
+        if entry.kind == EntryKind.CONTEXT_SUMMARY:
+            return entry
+    return None
+
+
+def select_compactable(entries: list, recent_turns: int) -> list:
+    """Entries not yet summarized that fall before the last ``recent_turns`` turns.
+
+    Returns an empty list when there is nothing to compact, or when cutting
+    there would separate a function call from its output. Calls that never
+    got an output, e.g. after a crash mid-tool, are summarized as such.
+    """
+    summary = latest_summary(entries)
+    through_seq = summary.data["through_seq"] if summary else 0
+    live = [
+        e for e in entries
+        if e.seq > through_seq and e.kind != EntryKind.CONTEXT_SUMMARY
+    ]
+    turn_starts = [i for i, e in enumerate(live) if e.kind == EntryKind.USER_MESSAGE]
+    if len(turn_starts) <= recent_turns:
+        return []
+    cut = turn_starts[-recent_turns]
+    old = live[:cut]
+
+    call_ids = {e.data["call_id"] for e in old if e.kind == EntryKind.TOOL_CALL}
+    if any(e.kind == EntryKind.TOOL_RESULT and e.data["call_id"] in call_ids for e in live[cut:]):
+        return []
+    return old
+
+
+def _render_transcript(entries: list) -> str:
+    result_ids = {e.data["call_id"] for e in entries if e.kind == EntryKind.TOOL_RESULT}
+    lines = []
+    for entry in entries:
+        data = entry.data
+        if entry.kind == EntryKind.USER_MESSAGE:
+            text = data.get("content", "")
+            if entry.uploaded_file_id:
+                text += f" [attached image, file_id: {entry.uploaded_file_id}]"
+            lines.append(f"User: {text}")
+        elif entry.kind == EntryKind.ASSISTANT_MESSAGE:
+            lines.append(f"Assistant: {data['content']}")
+        elif entry.kind == EntryKind.TOOL_CALL:
+            agent = data.get("agent_name")
+            if agent and agent != "orchestrator":
+                continue
+            line = f"Tool call {data['tool_name']}({json.dumps(data['arguments'])})"
+            if data["call_id"] not in result_ids:
+                line += " (interrupted, no result)"
+            lines.append(line)
+        elif entry.kind == EntryKind.TOOL_RESULT:
+            lines.append(f"Tool result: {json.dumps(data['result'])[:_RESULT_CHARS]}")
+    return "\n".join(lines)
+
+
+@tracing.traced("agent.compaction")
+async def compact_session(session_id: uuid.UUID, entries: list):
+    """Summarize old turns into a new CONTEXT_SUMMARY entry, if there are any.
+
+    Returns the new entry, or None when nothing was compacted.
+    """
+    from db.database import get_db
+    from db.repository import append_entry
+    from interface.models import entry_frame
+    from worker.registry import push_to_client
+
+    old = select_compactable(entries, settings.CONTEXT_RECENT_TURNS)
+    if not old:
+        return None
+
+    previous = latest_summary(entries)
+    source = _render_transcript(old)
+    if previous:
+        source = f"Summary so far:\n{previous.data['content']}\n\nLater conversation:\n{source}"
+
+    response = await call_llm(
+        [
+            {"role": "system", "content": SUMMARY_PROMPT},
+            {"role": "user", "content": source},
+        ],
+        agent_name="compaction",
+    )
+    if not response.content:
+        await record_usage(session_id, "compaction", response.usage)
+        return None
+
+    async with get_db() as db:
+        entry = await append_entry(
+            db,
+            session_id,
+            EntryKind.CONTEXT_SUMMARY,
+            {"content": response.content, "through_seq": old[-1].seq},
+        )
+    await push_to_client(session_id, entry_frame(entry))
+    await record_usage(session_id, "compaction", response.usage, entry_id=entry.id)
+    logger.info(
+        "Compacted %d entries of session %s through seq %d",
+        len(old), session_id, old[-1].seq,
+    )
+    return entry
@@ -1,16 +1,25 @@
 import json
 import logging
+import time
 from collections.abc import AsyncIterator
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 
 from openai import AsyncOpenAI
 
+from agent import cassette, profiles
+from agent.llm_scheduler import scheduler
 from config import settings
 from db.models import EntryKind
+from interface import wire
+from observability import tracing
+from tools._registry import project_result
 
 logger = logging.getLogger(__name__)
 
-openai_client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+# Retries are the scheduler's job, so the SDK must not retry on its own too
+openai_client = AsyncOpenAI(
+    api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL, max_retries=0
+)
 
 
 @dataclass
@@ -24,6 +33,8 @@ class ToolCallResult:
 class LLMResponse:
     content: str | None = None
     tool_calls: list[ToolCallResult] | None = None
+    # Token counts, see _usage()
+    usage: dict | None = None
 
 
 # --- Streaming delta types ---
@@ -47,12 +58,28 @@ class ToolCallDelta:
     arguments_chunk: str = ""
 
 
+@dataclass
+class ToolCallDone:
+    """A tool call whose arguments have finished streaming."""
+
+    index: int
+    call_id: str
+    tool_name: str
+    arguments: dict
+
+
 @dataclass
 class StreamDone:
     finish_reason: str
+    usage: dict | None = None
 
 
-type StreamEvent = ReasoningDelta | ContentDelta | ToolCallDelta | StreamDone
+type StreamEvent = ReasoningDelta | ContentDelta | ToolCallDelta | ToolCallDone | StreamDone
+
+_STREAM_EVENT_TYPES = {
+    cls.__name__: cls
+    for cls in (ReasoningDelta, ContentDelta, ToolCallDelta, ToolCallDone, StreamDone)
+}
 
 
 def _tools_to_responses_format(tools: list[dict]) -> list[dict]:
@@ -70,19 +97,72 @@ def _tools_to_responses_format(tools: list[dict]) -> list[dict]:
 
 
 async def call_llm_streaming(
-    messages: list[dict], tools: list[dict] | None = None
+    messages: list[dict],
+    tools: list[dict] | None = None,
+    agent_name: str = "orchestrator",
+    effort: str | None = None,
 ) -> AsyncIterator[StreamEvent]:
-    """Async generator yielding streaming events via the Responses API."""
-    kwargs: dict = {
-        "model": settings.OPENAI_MODEL,
-        "input": messages,
-        "reasoning": {"effort": "medium", "summary": "detailed"},
-        "stream": True,
-    }
+    """Async generator yielding streaming events via the Responses API.
+
+    Served from or recorded to a cassette depending on LLM_CASSETTE_MODE.
+    ``agent_name`` selects the request profile and labels the call in traces
+    and metrics; ``effort`` overrides the profile's reasoning effort.
+    """
+    request: dict = {"input": messages, **profiles.request_options(agent_name, effort)}
     if tools:
-        kwargs["tools"] = _tools_to_responses_format(tools)
+        request["tools"] = _tools_to_responses_format(tools)
+
+    # Not made current: the generator is consumed from the caller's context
+    span = tracing.start_span(
+        "llm.stream",
+        model=request["model"],
+        agent=agent_name,
+        effort=request["reasoning"]["effort"],
+    )
+    try:
+        async for event in _cassette_stream(request, agent_name):
+            if "ttft_ms" not in span.attributes:
+                span.set(ttft_ms=round((time.time() - span.start) * 1000))
+            yield event
+    except Exception:
+        span.finish(error=True)
+        raise
+    finally:
+        span.finish()
+
+
+async def _cassette_stream(request: dict, agent_name: str) -> AsyncIterator[StreamEvent]:
+    key = cassette.request_key(cassette.STREAM, request)
+    if cassette.should_replay(cassette.STREAM):
+        record = cassette.require(key)
+        started = time.monotonic()
+        for event in record["events"]:
+            await cassette.wait_until(started, event["t"])
+            yield _STREAM_EVENT_TYPES[event["type"]](**event["data"])
+        return
+
+    recorded: list[dict] | None = [] if cassette.should_record(cassette.STREAM) else None
+    started = time.monotonic()
+    async for event in scheduler.stream(agent_name, request, lambda: _stream_responses(request)):
+        if recorded is not None:
+            recorded.append({
+                "t": round(time.monotonic() - started, 4),
+                "type": type(event).__name__,
+                "data": asdict(event),
+            })
+        yield event
+    # Only complete streams are recorded
+    if recorded is not None:
+        cassette.save(
+            key,
+            cassette.STREAM,
+            request,
+            {"elapsed": round(time.monotonic() - started, 4), "events": recorded},
+        )
+
 
-    stream = await openai_client.responses.create(**kwargs)
+async def _stream_responses(request: dict) -> AsyncIterator[StreamEvent]:
+    stream = await openai_client.responses.create(**request, stream=True)
 
     # Track tool calls by output_index so we can emit ToolCallDelta with call_id/name
     pending_tool_calls: dict[int, dict] = {}
@@ -118,22 +198,89 @@ async def call_llm_streaming(
             idx = event.output_index
             yield ToolCallDelta(index=idx, arguments_chunk=event.delta)
 
-        # Stream complete
+        # Tool call complete, with its full arguments
+        elif etype == "response.output_item.done":
+            item = event.item
+            if getattr(item, "type", None) == "function_call":
+                yield ToolCallDone(
+                    index=event.output_index,
+                    call_id=item.call_id,
+                    tool_name=item.name,
+                    arguments=json.loads(item.arguments or "{}"),
+                )
+
+        # Stream complete, with the response's token usage
         elif etype == "response.completed":
-            yield StreamDone(finish_reason="stop")
+            yield StreamDone(finish_reason="stop", usage=_usage(event.response))
 
 
-async def call_llm(messages: list[dict], tools: list[dict] | None = None) -> LLMResponse:
-    """Non-streaming LLM call using the Responses API."""
-    kwargs: dict = {
-        "model": settings.OPENAI_MODEL,
-        "input": messages,
-        "reasoning": {"effort": "medium"},
-    }
+@tracing.traced("llm.call")
+async def call_llm(
+    messages: list[dict],
+    tools: list[dict] | None = None,
+    agent_name: str = "orchestrator",
+    effort: str | None = None,
+) -> LLMResponse:
+    """Non-streaming LLM call using the Responses API.
+
+    Served from or recorded to a cassette depending on LLM_CASSETTE_MODE.
+    ``agent_name`` selects the request profile and labels the call in traces
+    and metrics; ``effort`` overrides the profile's reasoning effort.
+    """
+    request: dict = {"input": messages, **profiles.request_options(agent_name, effort)}
     if tools:
-        kwargs["tools"] = _tools_to_responses_format(tools)
+        request["tools"] = _tools_to_responses_format(tools)
+    tracing.current_span().set(
+        model=request["model"], agent=agent_name, effort=request["reasoning"]["effort"]
+    )
+
+    key = cassette.request_key(cassette.CALL, request)
+    started = time.monotonic()
+    if cassette.should_replay(cassette.CALL):
+        record = cassette.require(key) if cassette.mode() == cassette.REPLAY else cassette.load(key)
+        if record is not None:
+            await cassette.wait_until(started, record["elapsed"])
+            return _decode_response(record["response"])
+
+    response = await scheduler.call(agent_name, request, lambda: _create_response(request))
+    if cassette.should_record(cassette.CALL):
+        cassette.save(
+            key,
+            cassette.CALL,
+            request,
+            {"elapsed": round(time.monotonic() - started, 4), "response": asdict(response)},
+        )
+    return response
+
+
+def _decode_response(data: dict) -> LLMResponse:
+    tool_calls = data.get("tool_calls")
+    return LLMResponse(
+        content=data.get("content"),
+        tool_calls=[ToolCallResult(**tc) for tc in tool_calls] if tool_calls else None,
+        usage=data.get("usage"),
+    )
+
+
+def _usage(response) -> dict | None:
+    """Model, reasoning effort and token counts of a Responses API response."""
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return None
+    input_details = getattr(usage, "input_tokens_details", None)
+    output_details = getattr(usage, "output_tokens_details", None)
+    return {
+        "model": response.model,
+        "effort": getattr(getattr(response, "reasoning", None), "effort", None),
+        "input_tokens": usage.input_tokens,
+        "cached_input_tokens": getattr(input_details, "cached_tokens", 0) or 0,
+        "output_tokens": usage.output_tokens,
+        "reasoning_tokens": getattr(output_details, "reasoning_tokens", 0) or 0,
+    }
 
-    response = await openai_client.responses.create(**kwargs)
+
+async def _create_response(request: dict) -> LLMResponse:
+    response = await openai_client.responses.create(**request)
 
     # Collect tool calls and text content from output items
     tool_calls: list[ToolCallResult] = []
@@ -153,10 +300,11 @@ async def call_llm(messages: list[dict], tools: list[dict] | None = None) -> LLM
                 if hasattr(part, "text"):
                     content_parts.append(part.text)
 
+    usage = _usage(response)
     if tool_calls:
-        return LLMResponse(tool_calls=tool_calls)
+        return LLMResponse(tool_calls=tool_calls, usage=usage)
 
-    return LLMResponse(content="".join(content_parts) or "")
+    return LLMResponse(content="".join(content_parts) or "", usage=usage)
 
 
 def build_llm_messages(entries: list, system_prompt: str) -> list[dict]:
@@ -207,14 +355,35 @@ def build_llm_messages(entries: list, system_prompt: str) -> list[dict]:
     return messages
 
 
-def build_responses_input(entries: list, system_prompt: str) -> list[dict]:
+def build_responses_input(
+    entries: list, system_prompt: str, project: bool = True
+) -> list[dict]:
     """Map Entry rows to OpenAI Responses API input format.
 
     Unlike Chat Completions, the Responses API represents tool calls and
     results as top-level items rather than nested in assistant messages.
+    Tool results are passed through their tool's projection unless
+    ``project`` is False.
+
+    If the session has been compacted, the latest CONTEXT_SUMMARY stands in
+    for every entry up to its ``through_seq``.
     """
     items: list[dict] = [{"role": "system", "content": system_prompt}]
 
+    summary = next(
+        (e for e in reversed(entries) if e.kind == EntryKind.CONTEXT_SUMMARY), None
+    )
+    if summary:
+        through_seq = summary.data["through_seq"]
+        entries = [e for e in entries if e.seq > through_seq]
+        items.append({
+            "role": "system",
+            "content": f"Summary of the earlier conversation:\n{summary.data['content']}",
+        })
+
+    # call_id -> tool_name of orchestrator calls emitted so far
+    call_tools: dict[str, str] = {}
+
     for entry in entries:
         kind = entry.kind
         data = entry.data
@@ -233,29 +402,29 @@ def build_responses_input(entries: list, system_prompt: str) -> list[dict]:
             agent = data.get("agent_name")
             if agent and agent != "orchestrator":
                 continue
+            call_tools[data["call_id"]] = data["tool_name"]
             items.append({
                 "type": "function_call",
                 "name": data["tool_name"],
-                "arguments": json.dumps(data["arguments"]),
+                "arguments": wire.dumps_str(data["arguments"]),
                 "call_id": data["call_id"],
             })
 
         elif kind == EntryKind.TOOL_RESULT:
             # Skip results for sub-agent internal tool calls
             # (their call_ids won't match any orchestrator function_call)
-            # We check if there's a matching function_call in items
-            matching = any(
-                i.get("type") == "function_call" and i.get("call_id") == data["call_id"]
-                for i in items
-            )
-            if not matching:
+            tool_name = call_tools.get(data["call_id"])
+            if tool_name is None:
                 continue
+            result = data["result"]
+            if project:
+                result = project_result(tool_name, result)
             items.append({
                 "type": "function_call_output",
                 "call_id": data["call_id"],
-                "output": json.dumps(data["result"]),
+                "output": wire.dumps_str(result),
             })
 
-        # reasoning, sub_agent_call, sub_agent_result are excluded
+        # reasoning, sub_agent_call, sub_agent_result, context_summary are excluded
 
     return items
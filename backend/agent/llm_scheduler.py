@@ -0,0 +1,256 @@
+"""Process-wide scheduler in front of every OpenAI request.
+
+Requests wait for a slot in priority order: the orchestrator's user-facing
+stream (and compaction, which it waits on) first, sub-agents next, and
+background memory work last; FIFO within a lane. A slot is granted when
+fewer than LLM_MAX_CONCURRENCY requests are in flight and both per-minute
+token buckets, requests and estimated tokens, can pay for it. The token
+estimate is settled against the real usage once the response reports it.
+
+429s, 5xx and connection errors are retried with full-jitter exponential
+backoff, honoring Retry-After. A 429 also pauses every lane for that long,
+since the next request would most likely be rejected too. A stream is only
+retried if it failed before yielding anything.
+"""
+
+import asyncio
+import enum
+import heapq
+import itertools
+import json
+import logging
+import random
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable
+
+import openai
+
+from config import settings
+from observability import metrics, tracing
+
+logger = logging.getLogger(__name__)
+
+
+class Lane(enum.IntEnum):
+    INTERACTIVE = 0
+    AGENT = 1
+    BACKGROUND = 2
+
+
+AGENT_LANES = {
+    "orchestrator": Lane.INTERACTIVE,
+    "compaction": Lane.INTERACTIVE,
+    "location_agent": Lane.AGENT,
+    "memory_manager": Lane.BACKGROUND,
+}
+
+RETRYABLE = (openai.RateLimitError, openai.InternalServerError, openai.APIConnectionError)
+
+
+class TokenBucket:
+    """Refills ``per_minute`` units evenly over a minute; 0 means unlimited."""
+
+    def __init__(self, per_minute: float):
+        self.rate = per_minute / 60
+        self.capacity = float(per_minute)
+        self.level = float(per_minute)
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        if not self.rate:
+            return 0.0
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+    def take(self, amount: float, now: float) -> None:
+        if self.rate:
+            self._refill(now)
+            self.level -= amount
+
+    def refund(self, amount: float) -> None:
+        """Give back (or, if negative, charge) units after the fact."""
+        if self.rate:
+            self.level = min(self.capacity, self.level + amount)
+
+
+def estimate_tokens(request: dict) -> int:
+    """Input tokens at ~4 characters each plus the output reserve."""
+    chars = len(json.dumps(request.get("input", ""))) + len(json.dumps(request.get("tools", "")))
+    return chars // 4 + settings.LLM_OUTPUT_TOKEN_RESERVE
+
+
+def _retry_delay(error: Exception, attempt: int) -> float:
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    if retry_after:
+        try:
+            return min(float(retry_after), settings.LLM_RETRY_MAX_SECONDS)
+        except ValueError:
+            pass
+    cap = min(settings.LLM_RETRY_MAX_SECONDS, settings.LLM_RETRY_BASE_SECONDS * 2**attempt)
+    return random.uniform(0, cap)
+
+
+class LLMScheduler:
+    def __init__(self, max_concurrency: int, requests_per_minute: int, tokens_per_minute: int):
+        self.max_concurrency = max_concurrency
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.in_flight = 0
+        self._paused_until = 0.0
+        # (lane, arrival, tokens, future)
+        self._waiters: list[tuple[int, int, int, asyncio.Future]] = []
+        self._arrivals = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+
+    @classmethod
+    def from_settings(cls) -> "LLMScheduler":
+        return cls(
+            settings.LLM_MAX_CONCURRENCY,
+            settings.LLM_REQUESTS_PER_MINUTE,
+            settings.LLM_TOKENS_PER_MINUTE,
+        )
+
+    # --- Slots ---
+
+    async def acquire(self, lane: Lane, tokens: int) -> None:
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (lane, next(self._arrivals), tokens, future))
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Granted just as we were cancelled: hand the slot on
+                self.release()
+            raise
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._dispatch()
+
+    def pause(self, seconds: float) -> None:
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def settle(self, estimated: int, usage: dict | None) -> None:
+        """Correct the token bucket once the real usage is known."""
+        if usage:
+            self.tokens.refund(estimated - usage["input_tokens"] - usage["output_tokens"])
+
+    def queued(self) -> dict[Lane, int]:
+        counts = dict.fromkeys(Lane, 0)
+        for lane, _, _, future in self._waiters:
+            if not future.done():
+                counts[Lane(lane)] += 1
+        return counts
+
+    def _dispatch(self) -> None:
+        while self._waiters:
+            lane, _, tokens, future = self._waiters[0]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if self.max_concurrency and self.in_flight >= self.max_concurrency:
+                return  # release() dispatches again
+            now = time.monotonic()
+            wait = max(
+                self._paused_until - now,
+                self.requests.wait_time(1, now),
+                self.tokens.wait_time(tokens, now),
+            )
+            if wait > 0:
+                self._wake_in(wait)
+                return
+            heapq.heappop(self._waiters)
+            self.requests.take(1, now)
+            self.tokens.take(tokens, now)
+            self.in_flight += 1
+            future.set_result(None)
+
+    def _wake_in(self, delay: float) -> None:
+        loop = asyncio.get_running_loop()
+        when = loop.time() + delay
+        if self._timer is not None and self._timer.when() <= when:
+            return
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = loop.call_at(when, self._on_timer)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self._dispatch()
+
+    async def _wait_for_slot(self, agent_name: str, tokens: int) -> None:
+        lane = AGENT_LANES.get(agent_name, Lane.AGENT)
+        started, wall_started = time.monotonic(), time.time()
+        await self.acquire(lane, tokens)
+        waited = time.monotonic() - started
+        metrics.LLM_QUEUE_WAIT_SECONDS.labels(lane.name.lower()).observe(waited)
+        if waited > 0.001:
+            tracing.record("llm.queue_wait", wall_started, lane=lane.name.lower())
+
+    def _should_retry(self, error: Exception, agent_name: str, attempt: int) -> float | None:
+        """Seconds to back off before the next attempt, or None to give up."""
+        if attempt >= settings.LLM_MAX_RETRIES:
+            return None
+        delay = _retry_delay(error, attempt)
+        if isinstance(error, openai.RateLimitError):
+            self.pause(delay)
+        metrics.LLM_RETRIES.labels(agent_name, type(error).__name__).inc()
+        logger.warning(
+            "LLM request for %s failed (%s), retry %d in %.1fs",
+            agent_name, type(error).__name__, attempt + 1, delay,
+        )
+        return delay
+
+    # --- Requests ---
+
+    async def call(self, agent_name: str, request: dict, send: Callable[[], Awaitable]):
+        """Run ``send()`` in a slot, retrying transient failures."""
+        tokens = estimate_tokens(request)
+        for attempt in itertools.count():
+            await self._wait_for_slot(agent_name, tokens)
+            try:
+                response = await send()
+            except RETRYABLE as e:
+                delay = self._should_retry(e, agent_name, attempt)
+                if delay is None:
+                    raise
+            else:
+                self.settle(tokens, getattr(response, "usage", None))
+                return response
+            finally:
+                self.release()
+            await asyncio.sleep(delay)
+
+    async def stream(
+        self, agent_name: str, request: dict, open_stream: Callable[[], AsyncIterator]
+    ) -> AsyncIterator:
+        """Yield from ``open_stream()`` in a slot held until the stream ends."""
+        tokens = estimate_tokens(request)
+        for attempt in itertools.count():
+            await self._wait_for_slot(agent_name, tokens)
+            started = False
+            try:
+                async for event in open_stream():
+                    started = True
+                    usage = getattr(event, "usage", None)
+                    if usage:
+                        self.settle(tokens, usage)
+                    yield event
+                return
+            except RETRYABLE as e:
+                delay = None if started else self._should_retry(e, agent_name, attempt)
+                if delay is None:
+                    raise
+            finally:
+                self.release()
+            await asyncio.sleep(delay)
+
+
+scheduler = LLMScheduler.from_settings()
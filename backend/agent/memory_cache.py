@@ -0,0 +1,187 @@
+"""Versioned in-process cache of user memories.
+
+Memories only change when the memory tools (or the REST delete) run, yet every
+orchestrator turn needs them. The cache keeps one MemoryIndex per version and
+the rendered "User memories" prompt fragment per (version, selection). Writers
+call ``invalidate()`` after committing; it bumps the local version and sends a
+Postgres NOTIFY so other processes drop their copy too. If the LISTEN
+connection can't be opened or drops, it is retried in the background and the
+cache is dropped once it is back, since notifications may have been missed in
+between. Until then a cached index is only trusted for a few seconds.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+
+from agent.memory_retrieval import MemoryIndex
+
+logger = logging.getLogger(__name__)
+
+NOTIFY_CHANNEL = "memories_changed"
+_MAX_FRAGMENTS = 128
+_RECONNECT_MIN_SECONDS = 1.0
+_RECONNECT_MAX_SECONDS = 30.0
+# How long a cached index is served while no invalidations can be received
+_UNLISTENED_TTL_SECONDS = 5.0
+
+# Identifies this process so it can ignore its own notifications
+_instance_id = uuid.uuid4().hex
+
+_version = 0
+# (version, index, monotonic load time)
+_index: tuple[int, MemoryIndex, float] | None = None
+_fragments: dict[tuple[int, tuple[uuid.UUID, ...]], str] = {}
+_listener_conn = None
+_reconnect_task: asyncio.Task | None = None
+
+# Each hit is one list_memories round trip saved
+stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+
+def current_version() -> int:
+    return _version
+
+
+def _bump() -> None:
+    global _version, _index
+    _version += 1
+    _index = None
+    _fragments.clear()
+    stats["invalidations"] += 1
+
+
+async def get_memory_index() -> MemoryIndex:
+    """Return the index for the current version, loading memories on a miss."""
+    global _index
+    if (
+        _index is not None
+        and _listener_conn is None
+        and time.monotonic() - _index[2] > _UNLISTENED_TTL_SECONDS
+    ):
+        # Other processes' writes can't reach us; drop the index and its fragments
+        _bump()
+    if _index is not None and _index[0] == _version:
+        stats["hits"] += 1
+        return _index[1]
+
+    from db.database import get_db
+    from db.repository import list_memories
+
+    stats["misses"] += 1
+    version = _version
+    async with get_db() as db:
+        memories = await list_memories(db)
+    index = MemoryIndex(memories)
+    # An invalidation that raced the load means these rows may be stale
+    if version == _version:
+        _index = (version, index, time.monotonic())
+    return index
+
+
+async def memories_prompt_fragment(query: str, token_budget: int) -> str:
+    """The "User memories" block for a system prompt, ranked against ``query``."""
+    index = await get_memory_index()
+    version = _version
+    selected = index.select(query, token_budget)
+    key = (version, tuple(m.id for m in selected))
+    fragment = _fragments.get(key)
+    if fragment is None:
+        if selected:
+            memories_text = "\n".join(f"- {m.content}" for m in selected)
+            fragment = f"User memories:\n{memories_text}"
+        else:
+            fragment = "User memories: (none yet)"
+        if len(_fragments) >= _MAX_FRAGMENTS:
+            _fragments.clear()
+        _fragments[key] = fragment
+    return fragment
+
+
+async def invalidate() -> None:
+    """Drop cached memories here and, via NOTIFY, in every other process."""
+    from sqlalchemy import text
+
+    from db.database import get_db
+
+    _bump()
+    try:
+        async with get_db() as db:
+            await db.execute(
+                text("SELECT pg_notify(:channel, :origin)"),
+                {"channel": NOTIFY_CHANNEL, "origin": _instance_id},
+            )
+    except Exception:
+        logger.exception("Failed to broadcast memory cache invalidation")
+
+
+def _on_notification(connection, pid, channel, payload) -> None:
+    if payload != _instance_id:
+        _bump()
+
+
+async def _connect() -> None:
+    global _listener_conn
+    import asyncpg
+
+    from config import settings
+
+    dsn = settings.DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://", 1)
+    conn = await asyncpg.connect(dsn)
+    await conn.add_listener(NOTIFY_CHANNEL, _on_notification)
+    conn.add_termination_listener(_on_terminated)
+    _listener_conn = conn
+    # Anything may have changed while we weren't listening
+    _bump()
+
+
+def _on_terminated(connection) -> None:
+    global _listener_conn, _reconnect_task
+    # stop_listener clears _listener_conn before closing it
+    if connection is not _listener_conn:
+        return
+    _listener_conn = None
+    logger.warning("Memory cache listener connection lost; reconnecting")
+    _reconnect_task = asyncio.get_running_loop().create_task(_reconnect())
+
+
+async def _reconnect() -> None:
+    global _reconnect_task
+    delay = _RECONNECT_MIN_SECONDS
+    while True:
+        await asyncio.sleep(delay)
+        try:
+            await _connect()
+        except Exception:
+            delay = min(delay * 2, _RECONNECT_MAX_SECONDS)
+            logger.warning(
+                "Memory cache listener reconnect failed; retrying in %.0fs", delay, exc_info=True
+            )
+            continue
+        logger.info("Memory cache listener reconnected; cached memories dropped")
+        _reconnect_task = None
+        return
+
+
+async def start_listener() -> None:
+    """LISTEN for invalidations from other processes, retrying in the background."""
+    global _reconnect_task
+    try:
+        await _connect()
+    except Exception:
+        logger.warning(
+            "Memory cache listener unavailable; retrying in the background",
+            exc_info=True,
+        )
+        _reconnect_task = asyncio.get_running_loop().create_task(_reconnect())
+
+
+async def stop_listener() -> None:
+    global _listener_conn, _reconnect_task
+    if _reconnect_task is not None:
+        _reconnect_task.cancel()
+        _reconnect_task = None
+    conn, _listener_conn = _listener_conn, None
+    if conn is not None:
+        await conn.close()
@@ -0,0 +1,86 @@
+"""Local near-duplicate detection for messages sent to the memory manager.
+
+A message like "I live in San Francisco" adds nothing when a memory already
+says "User lives in San Francisco". Messages and memories are reduced to
+content-word shingles; a message counts as known when nearly all of its
+shingles are contained in a single existing memory. Anything that reads as a
+change or negation ("no longer", "moved", "not") always goes to the LLM, and
+a negated or past-tense memory ("does not have", "used to drive") is never a
+match, since a plain restatement of it is a correction.
+"""
+
+import re
+from collections.abc import Sequence
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Function words plus the first/third-person framing that differs between a
+# user's message ("I have ...") and the stored memory ("User has ...")
+_STOPWORDS = frozenset(
+    "a about am an and are as at be been by do does for from has have i i'm im in is it "
+    "its me my of on or our so that the their there they this to user user's users "
+    "usually was we with".split()
+)
+
+_CHANGE_RE = re.compile(
+    r"\b(not|no|never|don'?t|doesn'?t|isn'?t|anymore|longer|moved|moving|changed|"
+    r"instead|now|new|sold|switched|stopped|forget|wrong|actually|correction)\b",
+    re.IGNORECASE,
+)
+
+# Past-tense markers: a memory using them records what no longer holds
+_PAST_RE = re.compile(r"\b(used to|formerly|previously|former|ex)\b", re.IGNORECASE)
+
+MIN_TOKENS = 2
+CONTAINMENT_THRESHOLD = 0.8
+
+
+def _stem(token: str) -> str:
+    """Crude plural/third-person folding: lives -> live, permits -> permit."""
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+        return token[:-1]
+    return token
+
+
+def content_tokens(text: str) -> list[str]:
+    return [
+        _stem(t) for t in _TOKEN_RE.findall(text.lower().replace("'", ""))
+        if t not in _STOPWORDS
+    ]
+
+
+def shingles(text: str) -> frozenset[str]:
+    """Unigram and bigram shingles over content words."""
+    tokens = content_tokens(text)
+    bigrams = (f"{a} {b}" for a, b in zip(tokens, tokens[1:]))
+    return frozenset([*tokens, *bigrams])
+
+
+def containment(message: frozenset[str], memory: frozenset[str]) -> float:
+    """Fraction of the message's shingles that also appear in the memory."""
+    if not message:
+        return 0.0
+    return len(message & memory) / len(message)
+
+
+def find_known(message: str, memories: Sequence) -> object | None:
+    """The existing memory that already states ``message``, if any."""
+    if _CHANGE_RE.search(message):
+        return None
+    if len(content_tokens(message)) < MIN_TOKENS:
+        return None
+    message_shingles = shingles(message)
+    for memory in memories:
+        if _CHANGE_RE.search(memory.content) or _PAST_RE.search(memory.content):
+            continue
+        if containment(message_shingles, shingles(memory.content)) >= CONTAINMENT_THRESHOLD:
+            return memory
+    return None
+
+
+def split_known(messages: Sequence[str], memories: Sequence) -> tuple[list[str], list[str]]:
+    """Partition messages into (new, already known)."""
+    new, known = [], []
+    for message in messages:
+        (known if find_known(message, memories) is not None else new).append(message)
+    return new, known
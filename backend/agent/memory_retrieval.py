@@ -0,0 +1,91 @@
+"""Local relevance ranking of user memories for prompt injection.
+
+Memories are scored against the current message with Okapi BM25 and packed
+into a token budget. Memories about the user's city or permits apply to
+almost every parking question, so they are pinned ahead of the ranking.
+"""
+
+import math
+import re
+from collections import Counter
+from collections.abc import Sequence
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+_STOPWORDS = frozenset(
+    "a an and are as at be by can do for from has have i in is it me my of on "
+    "or so that the this to user was we what when where will with you".split()
+)
+
+# Memories matching these are always relevant to a parking answer
+_PINNED_RE = re.compile(
+    r"\b(live|lives|living|city|neighbou?rhood|permit|permits|rpp|zone)\b", re.IGNORECASE
+)
+
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+
+def tokenize(text: str) -> list[str]:
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS]
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for English text)."""
+    return len(text) // 4 + 1
+
+
+def is_pinned(content: str) -> bool:
+    return _PINNED_RE.search(content) is not None
+
+
+class MemoryIndex:
+    """BM25 index over a snapshot of memory rows (anything with ``.content``)."""
+
+    def __init__(self, memories: Sequence):
+        self.memories = list(memories)
+        self._term_freqs = [Counter(tokenize(m.content)) for m in self.memories]
+        self._lengths = [sum(tf.values()) for tf in self._term_freqs]
+        self._avg_length = (sum(self._lengths) / len(self._lengths)) if self._lengths else 0.0
+        doc_freq: Counter = Counter()
+        for tf in self._term_freqs:
+            doc_freq.update(tf.keys())
+        n = len(self.memories)
+        self._idf = {
+            term: math.log(1 + (n - df + 0.5) / (df + 0.5)) for term, df in doc_freq.items()
+        }
+
+    def scores(self, query: str) -> list[float]:
+        terms = set(tokenize(query))
+        result = []
+        for tf, length in zip(self._term_freqs, self._lengths):
+            score = 0.0
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * length / (self._avg_length or 1))
+            for term in terms:
+                freq = tf.get(term)
+                if freq:
+                    score += self._idf[term] * freq * (BM25_K1 + 1) / (freq + norm)
+            result.append(score)
+        return result
+
+    def select(self, query: str, token_budget: int) -> list:
+        """Pinned memories, then the best matches for ``query``, within the budget.
+
+        Memories that don't match at all still fill leftover budget (newest
+        first), so small memory sets are injected in full as before.
+        """
+        scores = self.scores(query)
+        order = sorted(
+            range(len(self.memories)),
+            key=lambda i: (not is_pinned(self.memories[i].content), -scores[i], -i),
+        )
+        chosen: list[int] = []
+        used = 0
+        for i in order:
+            cost = estimate_tokens(self.memories[i].content)
+            if used + cost > token_budget:
+                continue
+            chosen.append(i)
+            used += cost
+        # Keep the original (chronological) order in the prompt
+        return [self.memories[i] for i in sorted(chosen)]
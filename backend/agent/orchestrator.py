@@ -5,8 +5,8 @@ import uuid
 from worker.registry import enqueue_entry, push_to_client, register_batch
 from db.database import get_db
 from db.models import EntryKind
-from db.repository import append_entry, get_session_entries, list_memories
-from interface.models import entry_to_wire
+from db.repository import append_entry, get_session_entries
+from interface.models import entry_frame
 
 from agent.llm import (
     build_llm_messages,
@@ -19,6 +19,12 @@ from agent.llm import (
     ToolCallDelta,
     ToolCallResult,
 )
+from agent.compaction import compact_session, estimate_input_tokens
+from agent.memory_cache import memories_prompt_fragment
+from agent.profiles import orchestrator_effort
+from agent.usage import record_usage
+from config import settings
+from observability import tracing
 from tools import TOOL_DEFINITIONS
 
 logger = logging.getLogger(__name__)
@@ -30,6 +36,9 @@ SYSTEM_PROMPT = (
     "to extract the sign's rules. Then call get_current_time "
     "to determine the current date, time, and day of week. "
     "Use both results to give a clear yes/no/conditional answer with a brief explanation.\n\n"
+    "To answer whether the user can park at a given time (now, later, or for how long), "
+    "call check_parking_rules with the sign's file_id instead of re-reading the sign text. "
+    "Only reason over the raw sign text yourself when it reports ambiguous: true.\n\n"
     "When the user mentions persistent parking-relevant personal info — such as their city, "
     "neighborhood, parking permits, vehicle type, work schedule, or regular parking habits — "
     "call the store_memory tool with the relevant message text so it can be remembered "
@@ -41,7 +50,9 @@ SYSTEM_PROMPT = (
     "call task_location with a task like 'Save this parking sign at: <location>' "
     "along with the uploaded_file_id and sign_text from the earlier reading.\n"
     "- When the user asks 'where can I park near X?' or similar, call task_location "
-    "with a search task description like 'Search for parking signs near: <location>'.\n"
+    "with a search task description like 'Search for parking signs near: <location>'. "
+    "If they want to park for a specific time window, include it in the task, e.g. "
+    "'Search for parking signs near: <location>, legal from 2026-10-24T18:00 to 2026-10-24T23:00'.\n"
     "- Default search radius is ~1 mile (1600m). If the user asks to expand, include that in the task.\n"
     "- The location agent returns nearby signs with their rules text — check the current time "
     "against each sign's rules to tell the user which are viable parking options right now."
@@ -52,6 +63,7 @@ ORCHESTRATOR_TOOLS = [
     "get_current_time",
     "store_memory",
     "task_location",
+    "check_parking_rules",
 ]
 
 
@@ -66,6 +78,7 @@ async def start_session(
     image_url: str | None = None,
 ) -> None:
     """Called when a user sends a message. Writes user_message entry and kicks off the agent loop."""
+    tracing.start_turn(session_id, has_image=uploaded_file_id is not None)
     data: dict = {"content": content}
     if image_url:
         data["image_url"] = image_url
@@ -76,26 +89,37 @@ async def start_session(
             uploaded_file_id=uploaded_file_id,
         )
 
-    await push_to_client(session_id, entry_to_wire(entry))
+    await push_to_client(session_id, entry_frame(entry))
     await continue_session(session_id)
 
 
+@tracing.traced("orchestrator.continue_session")
 async def continue_session(session_id: uuid.UUID) -> None:
     """Load all entries, build LLM messages, stream LLM response, write resulting entries."""
     async with get_db() as db:
         entries = await get_session_entries(db, session_id)
-        memories = await list_memories(db)
 
-    # Inject existing memories into system prompt
-    prompt = SYSTEM_PROMPT
-    if memories:
-        memories_text = "\n".join(f"- {m.content}" for m in memories)
-        prompt += f"\n\nUser memories:\n{memories_text}"
-    else:
-        prompt += "\n\nUser memories: (none yet)"
-
-    messages = build_responses_input(entries, prompt)
+    with tracing.span("orchestrator.build_input", entries=len(entries)):
+        # Inject the memories most relevant to the latest user message
+        query = next(
+            (e.data.get("content", "") for e in reversed(entries) if e.kind == EntryKind.USER_MESSAGE),
+            "",
+        )
+        fragment = await memories_prompt_fragment(query, settings.MEMORY_PROMPT_TOKEN_BUDGET)
+        prompt = f"{SYSTEM_PROMPT}\n\n{fragment}"
+
+        messages = build_responses_input(entries, prompt)
+        if estimate_input_tokens(messages) > settings.CONTEXT_COMPACTION_THRESHOLD_TOKENS:
+            try:
+                summary = await compact_session(session_id, entries)
+            except Exception:
+                logger.exception("Context compaction failed for session %s", session_id)
+                summary = None
+            if summary:
+                entries.append(summary)
+                messages = build_responses_input(entries, prompt)
     tools = _get_tools(ORCHESTRATOR_TOOLS)
+    effort = orchestrator_effort(entries)
 
     try:
         # Accumulators for the stream
@@ -103,8 +127,9 @@ async def continue_session(session_id: uuid.UUID) -> None:
         content_text = ""
         # Tool calls accumulator: index -> {call_id, tool_name, arguments_json}
         tool_calls_acc: dict[int, dict] = {}
+        usage = None
 
-        async for event in call_llm_streaming(messages, tools=tools):
+        async for event in call_llm_streaming(messages, tools=tools, effort=effort):
             if isinstance(event, ReasoningDelta):
                 reasoning_text += event.text
                 await push_to_client(session_id, {"type": "reasoning_delta", "text": event.text})
@@ -122,7 +147,7 @@ async def continue_session(session_id: uuid.UUID) -> None:
                 tc["arguments_json"] += event.arguments_chunk
 
             elif isinstance(event, StreamDone):
-                pass  # handled below
+                usage = event.usage
 
     except Exception:
         logger.exception("LLM streaming failed for session %s", session_id)
@@ -133,17 +158,22 @@ async def continue_session(session_id: uuid.UUID) -> None:
                 EntryKind.ASSISTANT_MESSAGE,
                 {"content": "Sorry, I encountered an error processing your request."},
             )
-        await push_to_client(session_id, entry_to_wire(entry))
+        await push_to_client(session_id, entry_frame(entry))
         await push_to_client(session_id, {"type": "turn_complete"})
+        tracing.end_turn(session_id, error=True)
         return
 
+    # Usage is linked to the first entry written from this response
+    first_entry_id = None
+
     # Persist reasoning if received
     if reasoning_text:
         async with get_db() as db:
             entry = await append_entry(
                 db, session_id, EntryKind.REASONING, {"content": reasoning_text}
             )
-        await push_to_client(session_id, entry_to_wire(entry))
+        first_entry_id = entry.id
+        await push_to_client(session_id, entry_frame(entry))
 
     # Handle tool calls
     if tool_calls_acc:
@@ -170,7 +200,8 @@ async def continue_session(session_id: uuid.UUID) -> None:
                 entry = await append_entry(
                     db, session_id, EntryKind.TOOL_CALL, tool_data
                 )
-            await push_to_client(session_id, entry_to_wire(entry))
+            first_entry_id = first_entry_id or entry.id
+            await push_to_client(session_id, entry_frame(entry))
             enqueue_entry(session_id, entry.id)
     elif content_text:
         async with get_db() as db:
@@ -180,5 +211,10 @@ async def continue_session(session_id: uuid.UUID) -> None:
                 EntryKind.ASSISTANT_MESSAGE,
                 {"content": content_text},
             )
-        await push_to_client(session_id, entry_to_wire(entry))
+        first_entry_id = first_entry_id or entry.id
+        await push_to_client(session_id, entry_frame(entry))
         await push_to_client(session_id, {"type": "turn_complete"})
+        tracing.end_turn(session_id)
+
+    # Off the critical path: the client already has everything
+    await record_usage(session_id, "orchestrator", usage, entry_id=first_entry_id)
@@ -0,0 +1,103 @@
+"""Per-agent LLM request settings.
+
+Each agent gets its own model, reasoning effort, reasoning summary and output
+token cap instead of the orchestrator's settings. The sub-agents follow
+short, tool-driven instructions and do fine on low effort. LLM_PROFILES can
+override any field per agent.
+
+The orchestrator's effort is also chosen per call. Once a turn's tool
+results are all plain facts, such as a sign whose rules parsed cleanly, the
+current time and an unambiguous check_parking_rules verdict, only the answer
+remains to be written, so the call runs on low effort. Anything else keeps
+the profile's effort.
+"""
+
+from dataclasses import dataclass, fields, replace
+
+from config import settings
+from db.models import EntryKind
+
+
+@dataclass(frozen=True)
+class LLMProfile:
+    # None means settings.OPENAI_MODEL
+    model: str | None = None
+    effort: str = "medium"
+    # Reasoning summary detail ("auto", "concise", "detailed"), None for none
+    summary: str | None = None
+    max_output_tokens: int | None = None
+
+
+PROFILES = {
+    "orchestrator": LLMProfile(effort="medium", summary="auto"),
+    "compaction": LLMProfile(effort="low", max_output_tokens=4000),
+    "location_agent": LLMProfile(effort="low", max_output_tokens=2000),
+    "memory_manager": LLMProfile(effort="low", max_output_tokens=1000),
+}
+
+SIMPLE_EFFORT = "low"
+
+# Tools whose results are facts the answer can be written from directly
+_FACT_TOOLS = {"task_read_parking_sign", "get_current_time", "check_parking_rules"}
+# Tools that run in the background and don't shape the answer
+_NEUTRAL_TOOLS = {"store_memory"}
+
+
+def profile(agent_name: str) -> LLMProfile:
+    base = PROFILES.get(agent_name, LLMProfile())
+    overrides = settings.LLM_PROFILES.get(agent_name)
+    if not overrides:
+        return base
+    known = {f.name for f in fields(LLMProfile)}
+    return replace(base, **{k: v for k, v in overrides.items() if k in known})
+
+
+def request_options(agent_name: str, effort: str | None = None) -> dict:
+    """The model, reasoning and output cap fields of a Responses API request."""
+    p = profile(agent_name)
+    reasoning = {"effort": effort or p.effort}
+    if p.summary:
+        reasoning["summary"] = p.summary
+    options: dict = {"model": p.model or settings.OPENAI_MODEL, "reasoning": reasoning}
+    if p.max_output_tokens:
+        options["max_output_tokens"] = p.max_output_tokens
+    return options
+
+
+def orchestrator_effort(entries: list) -> str | None:
+    """SIMPLE_EFFORT if the current turn only has fact results to answer from.
+
+    None keeps the profile's effort: the first call of a turn has to plan,
+    and results from sub-agent searches, errors or ambiguous signs need the
+    full reasoning.
+    """
+    if not settings.LLM_ADAPTIVE_EFFORT:
+        return None
+    # call_id -> tool_name of the orchestrator's calls this turn
+    calls: dict[str, str] = {}
+    results = []
+    for entry in reversed(entries):
+        if entry.kind == EntryKind.USER_MESSAGE:
+            break
+        if entry.kind == EntryKind.TOOL_CALL and entry.data.get("agent_name") in (None, "orchestrator"):
+            calls[entry.data["call_id"]] = entry.data["tool_name"]
+        elif entry.kind == EntryKind.TOOL_RESULT:
+            results.append(entry.data)
+
+    facts = 0
+    for data in results:
+        tool_name = calls.get(data["call_id"])
+        if tool_name is None or tool_name in _NEUTRAL_TOOLS:
+            continue
+        result = data["result"]
+        if tool_name not in _FACT_TOOLS or not _is_clean(result):
+            return None
+        facts += 1
+    return SIMPLE_EFFORT if facts else None
+
+
+def _is_clean(result) -> bool:
+    if not isinstance(result, dict) or "error" in result or result.get("ambiguous"):
+        return False
+    # A sign read only counts once its rules were compiled
+    return "text" not in result or "rules" in result
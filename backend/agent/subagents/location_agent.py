@@ -2,13 +2,14 @@ import json
 import logging
 import uuid
 
-from agent.llm import call_llm
-from db.database import get_db
-from db.models import EntryKind
-from db.repository import append_entry
-from interface.models import entry_to_wire
+from agent.llm import ToolCallResult
+from agent.subagents.location_tasks import SaveTask, SearchTask, parse_task
+from agent.subagents.streaming import stream_llm_turn
+from agent.subagents.tool_runner import run_tool_calls
+from agent.usage import record_usage
+from observability import tracing
 from tools import TOOL_DEFINITIONS, TOOL_REGISTRY
-from worker.registry import push_to_client
+from tools._registry import project_result
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +34,9 @@ SYSTEM_PROMPT = (
     "and the provided sign_text and uploaded_file_id.\n"
     "- When searching for nearby signs, geocode the user's described location first, then search.\n"
     "- Default search radius is 1600 meters (~1 mile).\n"
+    "- When the task asks where parking is allowed during a time window, pass start_time and "
+    "end_time (local ISO 8601) to search_nearby_signs; it then only returns signs that are legal "
+    "for the whole window.\n"
     "- Return clear, structured results. When returning search results, include distance and sign rules.\n"
     "- When done, respond with a summary of what you did and the key results."
 )
@@ -42,13 +46,136 @@ def _get_tools() -> list[dict]:
     return [d for d in TOOL_DEFINITIONS if d["function"]["name"] in LOCATION_AGENT_TOOLS]
 
 
+async def _run_tool(tc: ToolCallResult, session_id: uuid.UUID | None) -> dict:
+    return (await run_tool_calls([tc], session_id, "location_agent"))[0]
+
+
+def _call(tool_name: str, **arguments) -> ToolCallResult:
+    return ToolCallResult(
+        call_id=f"loc_{uuid.uuid4().hex[:12]}", tool_name=tool_name, arguments=arguments
+    )
+
+
+async def _save_fast_path(
+    task: SaveTask,
+    session_id: uuid.UUID | None,
+    uploaded_file_id: str | None,
+    sign_text: str | None,
+) -> dict | None:
+    if not uploaded_file_id or not sign_text:
+        return None
+    query_a, query_b = task.intersection_queries()
+    # Both intersections in parallel: the save costs one geocode round trip
+    point_a, point_b = await run_tool_calls(
+        [_call("mapbox_geocode", query=query_a), _call("mapbox_geocode", query=query_b)],
+        session_id,
+        "location_agent",
+    )
+    if "error" in point_a or "error" in point_b:
+        return None
+
+    midpoint = await _run_tool(
+        _call(
+            "geo_midpoint",
+            lat1=point_a["lat"], lon1=point_a["lon"], lat2=point_b["lat"], lon2=point_b["lon"],
+        ),
+        session_id,
+    )
+    saved = await _run_tool(
+        _call(
+            "save_parking_sign_location",
+            uploaded_file_id=uploaded_file_id,
+            latitude=midpoint["lat"],
+            longitude=midpoint["lon"],
+            description=task.description,
+            sign_text=sign_text,
+        ),
+        session_id,
+    )
+    if "error" in saved:
+        return None
+    return {
+        "summary": (
+            f"Saved the parking sign at {task.description} "
+            f"({midpoint['lat']:.6f}, {midpoint['lon']:.6f}), midway between "
+            f"{point_a['full_address'] or query_a} and {point_b['full_address'] or query_b}."
+        ),
+        "actions": [
+            f"mapbox_geocode: {json.dumps(point_a)}",
+            f"mapbox_geocode: {json.dumps(point_b)}",
+            f"geo_midpoint: {json.dumps(midpoint)}",
+            f"save_parking_sign_location: {json.dumps(saved)}",
+        ],
+    }
+
+
+async def _search_fast_path(task: SearchTask, session_id: uuid.UUID | None) -> dict | None:
+    center = await _run_tool(_call("mapbox_geocode", query=task.query), session_id)
+    if "error" in center:
+        return None
+    window = {}
+    if task.start_time:
+        window = {"start_time": task.start_time, "end_time": task.end_time}
+    found = await _run_tool(
+        _call(
+            "search_nearby_signs",
+            latitude=center["lat"],
+            longitude=center["lon"],
+            radius_meters=task.radius_meters,
+            **window,
+        ),
+        session_id,
+    )
+    if "error" in found:
+        return None
+
+    where = center["full_address"] or task.query
+    legal = f" legal from {task.start_time} to {task.end_time}" if window else ""
+    if not found["results"]:
+        lines = [f"No saved parking signs{legal} within {task.radius_meters:.0f} m of {where}."]
+    else:
+        lines = [
+            f"Found {found['total_results']} saved parking sign(s){legal} within "
+            f"{task.radius_meters:.0f} m of {where} "
+            f"(page {found['page']} of {found['total_pages']}):"
+        ]
+        for r in found["results"]:
+            lines.append(f"- {r['description']} ({r['distance_meters']} m away): {r['sign_text']}")
+    if found.get("unknown_rules"):
+        lines.append(
+            f"{found['unknown_rules']} nearby sign(s) have rules that couldn't be checked "
+            "automatically and were left out."
+        )
+    return {
+        "summary": "\n".join(lines),
+        "actions": [
+            f"mapbox_geocode: {json.dumps(center)}",
+            f"search_nearby_signs: {json.dumps(found)}",
+        ],
+    }
+
+
+@tracing.traced("agent.location_agent")
 async def run_agent(
     task_description: str,
     session_id: uuid.UUID | None = None,
     uploaded_file_id: str | None = None,
     sign_text: str | None = None,
 ) -> dict:
-    """Run the location sub-agent with an LLM reasoning loop."""
+    """Run the location sub-agent.
+
+    Recognized save/search tasks run as a fixed plan without the LLM; anything
+    else, or a plan that hits an error, falls back to the LLM reasoning loop.
+    """
+    task = parse_task(task_description)
+    fast_result = None
+    if isinstance(task, SaveTask):
+        fast_result = await _save_fast_path(task, session_id, uploaded_file_id, sign_text)
+    elif isinstance(task, SearchTask):
+        fast_result = await _search_fast_path(task, session_id)
+    if fast_result is not None:
+        return fast_result
+
     user_content = f"Task: {task_description}"
     if uploaded_file_id:
         user_content += f"\n\nuploaded_file_id: {uploaded_file_id}"
@@ -63,10 +190,14 @@ async def run_agent(
     actions_taken = []
 
     for _turn in range(5):
-        response = await call_llm(messages, tools=tools)
+        response = await stream_llm_turn(messages, tools, session_id, "location_agent")
+        await record_usage(session_id, "location_agent", response.usage)
 
         if response.tool_calls:
-            for tc in response.tool_calls:
+            results = await run_tool_calls(
+                response.tool_calls, session_id, "location_agent", record_calls=False
+            )
+            for tc, result in zip(response.tool_calls, results):
                 messages.append({
                     "type": "function_call",
                     "name": tc.tool_name,
@@ -74,41 +205,13 @@ async def run_agent(
                     "call_id": tc.call_id,
                 })
 
-                if session_id:
-                    tool_call_data = {
-                        "call_id": tc.call_id,
-                        "tool_name": tc.tool_name,
-                        "arguments": tc.arguments,
-                        "agent_name": "location_agent",
-                    }
-                    async with get_db() as db:
-                        tc_entry = await append_entry(
-                            db, session_id, EntryKind.TOOL_CALL, tool_call_data
-                        )
-                    await push_to_client(session_id, entry_to_wire(tc_entry))
-
-                module = TOOL_REGISTRY.get(tc.tool_name)
-                if module:
-                    result = await module.run(**tc.arguments)
+                if tc.tool_name in TOOL_REGISTRY:
                     actions_taken.append(f"{tc.tool_name}: {json.dumps(result)}")
-                else:
-                    result = {"error": f"Unknown tool: {tc.tool_name}"}
-
-                if session_id:
-                    tool_result_data = {
-                        "call_id": tc.call_id,
-                        "result": result,
-                    }
-                    async with get_db() as db:
-                        tr_entry = await append_entry(
-                            db, session_id, EntryKind.TOOL_RESULT, tool_result_data
-                        )
-                    await push_to_client(session_id, entry_to_wire(tr_entry))
 
                 messages.append({
                     "type": "function_call_output",
                     "call_id": tc.call_id,
-                    "output": json.dumps(result),
+                    "output": json.dumps(project_result(tc.tool_name, result)),
                 })
         else:
             summary = response.content or "Location task completed."
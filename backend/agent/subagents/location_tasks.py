@@ -0,0 +1,111 @@
+"""Parser for the mechanical task shapes the orchestrator hands the location agent.
+
+"Save this parking sign at: 20th st between illinois and georgia, San Francisco"
+and "Search for parking signs near: 20th and texas st, SF" don't need an LLM
+to plan; ``parse_task`` recognizes them so the agent can run the plan directly.
+Anything it doesn't recognize returns None and goes to the LLM loop.
+"""
+
+import re
+from dataclasses import dataclass
+
+DEFAULT_RADIUS_METERS = 1600
+
+# Only the "at:" form, anchored on the last one: free text before it ("on the
+# north side") may itself contain "at" or "on"
+_SAVE_RE = re.compile(
+    r"^\s*save\b.*\b(?:at|on)\s*:\s*(?P<loc>.+?)\s*\.?\s*$", re.IGNORECASE | re.DOTALL
+)
+_BETWEEN_RE = re.compile(
+    r"^(?P<street>.+?)\s+between\s+(?P<a>.+?)\s+(?:and|&)\s+(?P<b>[^,]+?)"
+    r"(?:\s*,\s*(?P<city>.+))?$",
+    re.IGNORECASE,
+)
+_SEARCH_RE = re.compile(
+    r"^\s*(?:search|find|look)\b.*?\bnear\s*:?\s*(?P<loc>.+?)\s*\.?\s*$",
+    re.IGNORECASE | re.DOTALL,
+)
+_RADIUS_RE = re.compile(
+    r"[,;]?\s*(?:with)?in\s+(?:a\s+)?(?P<n>\d+(?:\.\d+)?)\s*"
+    r"(?P<unit>m|meters?|metres?|km|kilometers?|mi|miles?)\b(?:\s+radius)?",
+    re.IGNORECASE,
+)
+_WINDOW_RE = re.compile(
+    r"[,;]?\s*legal\s+from\s+(?P<start>\d{4}-\d{2}-\d{2}T[\d:]+)\s+(?:to|until)\s+"
+    r"(?P<end>\d{4}-\d{2}-\d{2}T[\d:]+)",
+    re.IGNORECASE,
+)
+_UNIT_METERS = {"m": 1.0, "k": 1000.0, "mi": 1609.344}
+
+
+@dataclass
+class SaveTask:
+    street: str
+    cross_a: str
+    cross_b: str
+    city: str | None
+    description: str
+
+    def intersection_queries(self) -> tuple[str, str]:
+        suffix = f", {self.city}" if self.city else ""
+        return (
+            f"{self.street} & {self.cross_a}{suffix}",
+            f"{self.street} & {self.cross_b}{suffix}",
+        )
+
+
+@dataclass
+class SearchTask:
+    query: str
+    radius_meters: float = DEFAULT_RADIUS_METERS
+    start_time: str | None = None
+    end_time: str | None = None
+
+
+def _unit_meters(unit: str) -> float:
+    unit = unit.lower()
+    if unit.startswith("mi"):
+        return _UNIT_METERS["mi"]
+    if unit.startswith("k"):
+        return _UNIT_METERS["k"]
+    return _UNIT_METERS["m"]
+
+
+def parse_task(task_description: str) -> SaveTask | SearchTask | None:
+    match = _SAVE_RE.match(task_description)
+    if match:
+        loc = match.group("loc")
+        between = _BETWEEN_RE.match(loc)
+        if not between:
+            return None
+        return SaveTask(
+            street=between.group("street").strip(),
+            cross_a=between.group("a").strip(),
+            cross_b=between.group("b").strip(),
+            city=(between.group("city") or "").strip() or None,
+            description=loc,
+        )
+
+    match = _SEARCH_RE.match(task_description)
+    if match:
+        loc = match.group("loc")
+        start_time = end_time = None
+        window_match = _WINDOW_RE.search(loc)
+        if window_match:
+            start_time, end_time = window_match.group("start"), window_match.group("end")
+            loc = (loc[: window_match.start()] + loc[window_match.end():]).strip(" ,;")
+        radius = DEFAULT_RADIUS_METERS
+        radius_match = _RADIUS_RE.search(loc)
+        if radius_match:
+            radius = float(radius_match.group("n")) * _unit_meters(radius_match.group("unit"))
+            loc = (loc[: radius_match.start()] + loc[radius_match.end():]).strip(" ,;")
+        elif re.search(r"\b(expand|wider|larger|bigger)\b", loc, re.IGNORECASE):
+            # "expand the search" needs judgment about how far; leave it to the LLM
+            return None
+        if not loc:
+            return None
+        return SearchTask(
+            query=loc, radius_meters=radius, start_time=start_time, end_time=end_time
+        )
+
+    return None
@@ -2,16 +2,21 @@ import json
 import logging
 import uuid
 
-from agent.llm import call_llm
-from db.database import get_db
-from db.models import EntryKind
-from db.repository import append_entry, list_memories
-from interface.models import entry_to_wire
+from agent.memory_cache import get_memory_index
+from agent.memory_dedup import split_known
+from agent.subagents.streaming import stream_llm_turn
+from agent.subagents.tool_runner import run_tool_calls
+from agent.usage import record_usage
+from config import settings
+from observability import tracing
 from tools import TOOL_DEFINITIONS, TOOL_REGISTRY
-from worker.registry import push_to_client
+from tools._registry import project_result
 
 logger = logging.getLogger(__name__)
 
+# Process-wide counters for the duplicate short-circuit
+stats = {"runs": 0, "llm_runs": 0, "llm_calls": 0, "skipped_runs": 0, "skipped_messages": 0}
+
 MEMORY_MANAGER_TOOLS = [
     "memory_create",
     "memory_update",
@@ -40,14 +45,41 @@ def _get_tools() -> list[dict]:
     return [d for d in TOOL_DEFINITIONS if d["function"]["name"] in MEMORY_MANAGER_TOOLS]
 
 
-async def run_agent(relevant_messages: list[str], session_id: uuid.UUID | None = None) -> dict:
-    """Run the memory manager subagent with LLM reasoning loop."""
-    # Load existing memories
-    async with get_db() as db:
-        existing = await list_memories(db)
+def llm_calls_saved() -> int:
+    """Estimated LLM calls avoided by skipped runs, at the observed calls per run."""
+    calls_per_run = stats["llm_calls"] / stats["llm_runs"] if stats["llm_runs"] else 1.0
+    return round(stats["skipped_runs"] * max(calls_per_run, 1.0))
+
 
+@tracing.traced("agent.memory_manager")
+async def run_agent(relevant_messages: list[str], session_id: uuid.UUID | None = None) -> dict:
+    """Run the memory manager subagent with LLM reasoning loop.
+
+    Messages that restate an existing memory are dropped first; when none are
+    left the LLM is not called at all.
+    """
+    stats["runs"] += 1
+    index = await get_memory_index()
+    relevant_messages, known = split_known(relevant_messages, index.memories)
+    if known:
+        stats["skipped_messages"] += len(known)
+        logger.info("Memory manager: %d message(s) already known", len(known))
+    if not relevant_messages:
+        stats["skipped_runs"] += 1
+        logger.info(
+            "Memory manager skipped the LLM (%d runs skipped, ~%d LLM calls saved)",
+            stats["skipped_runs"], llm_calls_saved(),
+        )
+        return {"summary": "Already known; no changes made.", "actions": []}
+
+    stats["llm_runs"] += 1
+    # Only the memories related to the new messages are candidates for update;
+    # memory_list remains available if the model needs the full set.
+    relevant = index.select(
+        " ".join(relevant_messages), settings.MEMORY_PROMPT_TOKEN_BUDGET
+    )
     memories_text = "\n".join(
-        f"- [{m.id}] {m.content}" for m in existing
+        f"- [{m.id}] {m.content}" for m in relevant
     ) or "(no existing memories)"
 
     user_content = (
@@ -64,11 +96,15 @@ async def run_agent(relevant_messages: list[str], session_id: uuid.UUID | None =
     actions_taken = []
 
     for _turn in range(3):
-        response = await call_llm(messages, tools=tools)
+        response = await stream_llm_turn(messages, tools, session_id, "memory_manager")
+        stats["llm_calls"] += 1
+        await record_usage(session_id, "memory_manager", response.usage)
 
         if response.tool_calls:
-            # Append function_call items and execute each tool
-            for tc in response.tool_calls:
+            results = await run_tool_calls(
+                response.tool_calls, session_id, "memory_manager", record_calls=False
+            )
+            for tc, result in zip(response.tool_calls, results):
                 messages.append({
                     "type": "function_call",
                     "name": tc.tool_name,
@@ -76,39 +112,13 @@ async def run_agent(relevant_messages: list[str], session_id: uuid.UUID | None =
                     "call_id": tc.call_id,
                 })
 
-                # Write TOOL_CALL entry to DB
-                if session_id:
-                    tool_call_data = {
-                        "call_id": tc.call_id,
-                        "tool_name": tc.tool_name,
-                        "arguments": tc.arguments,
-                        "agent_name": "memory_manager",
-                    }
-                    async with get_db() as db:
-                        tc_entry = await append_entry(db, session_id, EntryKind.TOOL_CALL, tool_call_data)
-                    await push_to_client(session_id, entry_to_wire(tc_entry))
-
-                module = TOOL_REGISTRY.get(tc.tool_name)
-                if module:
-                    result = await module.run(**tc.arguments)
+                if tc.tool_name in TOOL_REGISTRY:
                     actions_taken.append(f"{tc.tool_name}: {json.dumps(result)}")
-                else:
-                    result = {"error": f"Unknown tool: {tc.tool_name}"}
-
-                # Write TOOL_RESULT entry to DB
-                if session_id:
-                    tool_result_data = {
-                        "call_id": tc.call_id,
-                        "result": result,
-                    }
-                    async with get_db() as db:
-                        tr_entry = await append_entry(db, session_id, EntryKind.TOOL_RESULT, tool_result_data)
-                    await push_to_client(session_id, entry_to_wire(tr_entry))
 
                 messages.append({
                     "type": "function_call_output",
                     "call_id": tc.call_id,
-                    "output": json.dumps(result),
+                    "output": json.dumps(project_result(tc.tool_name, result)),
                 })
         else:
             # LLM responded with text — we're done
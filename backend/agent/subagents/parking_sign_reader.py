@@ -2,8 +2,10 @@ import uuid
 
 from db.database import get_db
 from db.models import EntryKind
-from db.repository import append_entry
-from interface.models import entry_to_wire
+from db.repository import append_entry, set_uploaded_file_sign_rules
+from interface.models import entry_frame
+from observability import tracing
+from rules.compiler import compile_sign_text
 from tools.ocr_parking_sign import run as ocr_run
 from worker.registry import push_to_client
 
@@ -12,11 +14,16 @@ PARKING_SIGN_READER_TOOLS = [
 ]
 
 
+@tracing.traced("agent.parking_sign_reader")
 async def run_agent(
     uploaded_file_id: uuid.UUID | None = None,
     session_id: uuid.UUID | None = None,
 ) -> dict:
-    """Run the parking sign OCR tool and return the extracted text."""
+    """Run the parking sign OCR tool and return the extracted text.
+
+    The text is also compiled into a rule schedule, stored on the uploaded
+    file for check_parking_rules.
+    """
     if uploaded_file_id is None:
         return {"text": "No file ID provided."}
 
@@ -33,16 +40,17 @@ async def run_agent(
         }
         async with get_db() as db:
             tc_entry = await append_entry(db, session_id, EntryKind.TOOL_CALL, tool_call_data)
-        await push_to_client(session_id, entry_to_wire(tc_entry))
+        await push_to_client(session_id, entry_frame(tc_entry))
 
-    result = await ocr_run(file_id=str(uploaded_file_id))
+    with tracing.span("tool.ocr_parking_sign"):
+        result = await ocr_run(file_id=str(uploaded_file_id))
 
     # Write TOOL_RESULT entry
     if session_id:
         tool_result_data = {"call_id": call_id, "result": result}
         async with get_db() as db:
             tr_entry = await append_entry(db, session_id, EntryKind.TOOL_RESULT, tool_result_data)
-        await push_to_client(session_id, entry_to_wire(tr_entry))
+        await push_to_client(session_id, entry_frame(tr_entry))
 
     if "error" in result:
         return {"text": f"Error reading sign: {result['error']}"}
@@ -51,4 +59,9 @@ async def run_agent(
     if not signs:
         return {"text": "No text detected on the parking sign."}
 
-    return {"text": "\n\n".join(signs)}
+    text = "\n\n".join(signs)
+    sign_rules = compile_sign_text(text)
+    async with get_db() as db:
+        await set_uploaded_file_sign_rules(db, uploaded_file_id, sign_rules)
+
+    return {"text": text, "rules": sign_rules["rules"], "ambiguous": sign_rules["ambiguous"]}
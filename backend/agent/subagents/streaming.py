@@ -0,0 +1,101 @@
+import json
+import uuid
+
+from agent.llm import (
+    ContentDelta,
+    LLMResponse,
+    ReasoningDelta,
+    StreamDone,
+    ToolCallDelta,
+    ToolCallDone,
+    ToolCallResult,
+    call_llm_streaming,
+)
+from db.database import get_db
+from db.models import EntryKind
+from db.repository import append_entry
+from interface.models import entry_frame
+from worker.registry import push_to_client
+
+
+async def stream_llm_turn(
+    messages: list[dict],
+    tools: list[dict] | None,
+    session_id: uuid.UUID | None,
+    agent_name: str,
+) -> LLMResponse:
+    """One sub-agent LLM call over the streaming path.
+
+    Reasoning and content deltas are pushed to the client tagged with
+    ``agent_name``, and each TOOL_CALL entry is written as soon as its
+    arguments are complete rather than after the whole response, so pass
+    ``record_calls=False`` to run_tool_calls for the returned calls.
+    Without a session nothing is pushed or written.
+    """
+    content_text = ""
+    # index -> {call_id, tool_name, arguments_json}
+    pending: dict[int, dict] = {}
+    done: dict[int, ToolCallResult] = {}
+    usage = None
+
+    async for event in call_llm_streaming(messages, tools=tools, agent_name=agent_name):
+        if isinstance(event, ReasoningDelta):
+            await _push(session_id, {"type": "reasoning_delta", "text": event.text, "agent_name": agent_name})
+
+        elif isinstance(event, ContentDelta):
+            content_text += event.text
+            await _push(session_id, {"type": "content_delta", "text": event.text, "agent_name": agent_name})
+
+        elif isinstance(event, ToolCallDelta):
+            tc = pending.setdefault(event.index, {"call_id": "", "tool_name": "", "arguments_json": ""})
+            if event.call_id:
+                tc["call_id"] = event.call_id
+            if event.tool_name:
+                tc["tool_name"] = event.tool_name
+            tc["arguments_json"] += event.arguments_chunk
+
+        elif isinstance(event, ToolCallDone):
+            done[event.index] = ToolCallResult(
+                call_id=event.call_id, tool_name=event.tool_name, arguments=event.arguments
+            )
+            await _record_call(session_id, done[event.index], agent_name)
+
+        elif isinstance(event, StreamDone):
+            usage = event.usage
+
+    # Streams recorded before ToolCallDone existed only carry the deltas
+    for idx in sorted(pending.keys() - done.keys()):
+        tc = pending[idx]
+        done[idx] = ToolCallResult(
+            call_id=tc["call_id"],
+            tool_name=tc["tool_name"],
+            arguments=json.loads(tc["arguments_json"] or "{}"),
+        )
+        await _record_call(session_id, done[idx], agent_name)
+
+    if done:
+        return LLMResponse(tool_calls=[done[idx] for idx in sorted(done)], usage=usage)
+    return LLMResponse(content=content_text, usage=usage)
+
+
+async def _push(session_id: uuid.UUID | None, message: dict) -> None:
+    if session_id:
+        await push_to_client(session_id, message)
+
+
+async def _record_call(session_id: uuid.UUID | None, tc: ToolCallResult, agent_name: str) -> None:
+    if not session_id:
+        return
+    async with get_db() as db:
+        entry = await append_entry(
+            db,
+            session_id,
+            EntryKind.TOOL_CALL,
+            {
+                "call_id": tc.call_id,
+                "tool_name": tc.tool_name,
+                "arguments": tc.arguments,
+                "agent_name": agent_name,
+            },
+        )
+    await push_to_client(session_id, entry_frame(entry))
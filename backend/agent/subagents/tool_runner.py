@@ -0,0 +1,81 @@
+import asyncio
+import logging
+import uuid
+
+from agent.llm import ToolCallResult
+from config import settings
+from db.database import get_db
+from db.models import EntryKind
+from db.repository import append_entry
+from interface.models import entry_frame
+from observability import tracing
+from tools import TOOL_REGISTRY
+from worker.registry import push_to_client
+
+logger = logging.getLogger(__name__)
+
+
+async def _run_one(tc: ToolCallResult, semaphore: asyncio.Semaphore) -> dict:
+    module = TOOL_REGISTRY.get(tc.tool_name)
+    if module is None:
+        return {"error": f"Unknown tool: {tc.tool_name}"}
+    async with semaphore:
+        try:
+            with tracing.span(f"tool.{tc.tool_name}"):
+                return await module.run(**tc.arguments)
+        except Exception:
+            logger.exception("Sub-agent tool %s failed", tc.tool_name)
+            return {"error": "Tool execution failed"}
+
+
+async def run_tool_calls(
+    tool_calls: list[ToolCallResult],
+    session_id: uuid.UUID | None,
+    agent_name: str,
+    record_calls: bool = True,
+) -> list[dict]:
+    """Execute one sub-agent turn's tool calls concurrently.
+
+    At most SUB_AGENT_TOOL_CONCURRENCY tools run at once. TOOL_CALL entries are
+    written in call order before anything runs (unless ``record_calls`` is
+    False because the stream already wrote them) and TOOL_RESULT entries in
+    call order once all have finished, so transcripts don't depend on which
+    tool happened to return first. Results are returned in call order.
+    """
+    if session_id and record_calls:
+        async with get_db() as db:
+            call_entries = [
+                await append_entry(
+                    db,
+                    session_id,
+                    EntryKind.TOOL_CALL,
+                    {
+                        "call_id": tc.call_id,
+                        "tool_name": tc.tool_name,
+                        "arguments": tc.arguments,
+                        "agent_name": agent_name,
+                    },
+                )
+                for tc in tool_calls
+            ]
+        for entry in call_entries:
+            await push_to_client(session_id, entry_frame(entry))
+
+    semaphore = asyncio.Semaphore(settings.SUB_AGENT_TOOL_CONCURRENCY)
+    results = list(await asyncio.gather(*(_run_one(tc, semaphore) for tc in tool_calls)))
+
+    if session_id:
+        async with get_db() as db:
+            result_entries = [
+                await append_entry(
+                    db,
+                    session_id,
+                    EntryKind.TOOL_RESULT,
+                    {"call_id": tc.call_id, "result": result},
+                )
+                for tc, result in zip(tool_calls, results)
+            ]
+        for entry in result_entries:
+            await push_to_client(session_id, entry_frame(entry))
+
+    return results
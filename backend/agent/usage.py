@@ -0,0 +1,56 @@
+"""Token usage accounting for LLM calls.
+
+Every orchestrator and sub-agent call's usage (from ``response.usage`` or the
+stream's ``response.completed`` event) is stored as an llm_usage row, linked
+to the session and, where the call produced entries, the first of them.
+Costs are estimated at read time from the configured per-token prices, so a
+price change applies to history too.
+"""
+
+import logging
+import uuid
+
+from config import settings
+from db.database import get_db
+from db.repository import USAGE_TOKEN_COLUMNS, create_llm_usage
+
+logger = logging.getLogger(__name__)
+
+
+async def record_usage(
+    session_id: uuid.UUID | None,
+    agent_name: str,
+    usage: dict | None,
+    entry_id: uuid.UUID | None = None,
+) -> None:
+    """Store one call's usage. Failures are logged, never raised to the agent."""
+    if usage is None:
+        return
+    try:
+        async with get_db() as db:
+            await create_llm_usage(db, session_id, agent_name, usage, entry_id=entry_id)
+    except Exception:
+        logger.exception("Failed to record LLM usage for %s", agent_name)
+
+
+def estimate_cost(row: dict) -> float:
+    """USD cost of a usage row or aggregate, at the configured prices."""
+    uncached = row["input_tokens"] - row["cached_input_tokens"]
+    cost = (
+        uncached * settings.LLM_INPUT_PRICE_PER_MTOK
+        + row["cached_input_tokens"] * settings.LLM_CACHED_INPUT_PRICE_PER_MTOK
+        + row["output_tokens"] * settings.LLM_OUTPUT_PRICE_PER_MTOK
+    )
+    return round(cost / 1_000_000, 6)
+
+
+def with_cost(row: dict) -> dict:
+    return {**row, "estimated_cost_usd": estimate_cost(row)}
+
+
+def total(rows: list[dict]) -> dict:
+    """Sum aggregate rows from summarize_llm_usage into one."""
+    return {
+        column: sum(row[column] for row in rows)
+        for column in ("calls", *USAGE_TOKEN_COLUMNS)
+    }
@@ -0,0 +1,37 @@
+"""add compiled sign rules to uploaded_files and parking_sign_locations
+
+Revision ID: a7b8c9d0e1f2
+Revises: f6a7b8c9d0e1
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7b8c9d0e1f2'
+down_revision: Union[str, Sequence[str], None] = 'f6a7b8c9d0e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'uploaded_files',
+        sa.Column('sign_rules', postgresql.JSONB(), nullable=True),
+    )
+    op.add_column(
+        'parking_sign_locations',
+        sa.Column('rules', postgresql.JSONB(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('parking_sign_locations', 'rules')
+    op.drop_column('uploaded_files', 'sign_rules')
@@ -0,0 +1,38 @@
+"""add availability bitmaps and lat/lon index to parking_sign_locations
+
+Revision ID: b8c9d0e1f2a3
+Revises: a7b8c9d0e1f2
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8c9d0e1f2a3'
+down_revision: Union[str, Sequence[str], None] = 'a7b8c9d0e1f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('parking_sign_locations', sa.Column('forbidden_mask', sa.Text(), nullable=True))
+    op.add_column('parking_sign_locations', sa.Column('limited_mask', sa.Text(), nullable=True))
+    op.add_column('parking_sign_locations', sa.Column('limit_minutes', sa.Integer(), nullable=True))
+    op.create_index(
+        'ix_parking_sign_locations_latitude_longitude',
+        'parking_sign_locations',
+        ['latitude', 'longitude'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_parking_sign_locations_latitude_longitude', table_name='parking_sign_locations')
+    op.drop_column('parking_sign_locations', 'limit_minutes')
+    op.drop_column('parking_sign_locations', 'limited_mask')
+    op.drop_column('parking_sign_locations', 'forbidden_mask')
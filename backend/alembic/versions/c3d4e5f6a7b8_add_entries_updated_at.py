@@ -0,0 +1,34 @@
+"""add entries.updated_at for websocket resume
+
+Revision ID: c3d4e5f6a7b8
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d4e5f6a7b8'
+down_revision: Union[str, Sequence[str], None] = 'a1b2c3d4e5f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('entries', sa.Column('updated_at', sa.DateTime(), nullable=True))
+    op.execute("UPDATE entries SET updated_at = created_at")
+    op.alter_column('entries', 'updated_at', nullable=False)
+    op.create_index(
+        'ix_entries_session_id_updated_at', 'entries', ['session_id', 'updated_at']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_entries_session_id_updated_at', table_name='entries')
+    op.drop_column('entries', 'updated_at')
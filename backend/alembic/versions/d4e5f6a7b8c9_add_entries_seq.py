@@ -0,0 +1,58 @@
+"""add per-session entry sequence numbers
+
+Revision ID: d4e5f6a7b8c9
+Revises: c3d4e5f6a7b8
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4e5f6a7b8c9'
+down_revision: Union[str, Sequence[str], None] = 'c3d4e5f6a7b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'sessions',
+        sa.Column('last_seq', sa.Integer(), nullable=False, server_default='0'),
+    )
+    op.add_column('entries', sa.Column('seq', sa.Integer(), nullable=True))
+    # Number existing transcripts in their current (created_at) order
+    op.execute(
+        """
+        UPDATE entries AS e SET seq = numbered.seq
+        FROM (
+            SELECT id, ROW_NUMBER() OVER (
+                PARTITION BY session_id ORDER BY created_at, id
+            ) AS seq
+            FROM entries
+        ) AS numbered
+        WHERE e.id = numbered.id
+        """
+    )
+    op.execute(
+        """
+        UPDATE sessions AS s SET last_seq = counts.max_seq
+        FROM (SELECT session_id, MAX(seq) AS max_seq FROM entries GROUP BY session_id) AS counts
+        WHERE s.id = counts.session_id
+        """
+    )
+    op.alter_column('entries', 'seq', nullable=False)
+    op.create_index(
+        'ux_entries_session_id_seq', 'entries', ['session_id', 'seq'], unique=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ux_entries_session_id_seq', table_name='entries')
+    op.drop_column('entries', 'seq')
+    op.drop_column('sessions', 'last_seq')
@@ -0,0 +1,69 @@
+"""add session_summaries projection
+
+Revision ID: e5f6a7b8c9d0
+Revises: d4e5f6a7b8c9
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5f6a7b8c9d0'
+down_revision: Union[str, Sequence[str], None] = 'd4e5f6a7b8c9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('session_summaries',
+    sa.Column('session_id', sa.UUID(), nullable=False),
+    sa.Column('started_at', sa.DateTime(), nullable=False),
+    sa.Column('last_activity_at', sa.DateTime(), nullable=False),
+    sa.Column('entry_count', sa.Integer(), nullable=False),
+    sa.Column('first_user_message', sa.Text(), nullable=True),
+    sa.Column('has_image', sa.Boolean(), nullable=False),
+    sa.ForeignKeyConstraint(['session_id'], ['sessions.id'], ),
+    sa.PrimaryKeyConstraint('session_id')
+    )
+    op.create_index(
+        'ix_session_summaries_last_activity_at_session_id',
+        'session_summaries',
+        ['last_activity_at', 'session_id'],
+    )
+    # Backfill from existing transcripts
+    op.execute(
+        """
+        INSERT INTO session_summaries (
+            session_id, started_at, last_activity_at, entry_count,
+            first_user_message, has_image
+        )
+        SELECT
+            s.id,
+            s.started_at,
+            COALESCE(MAX(e.created_at), s.started_at),
+            COUNT(e.id),
+            (
+                SELECT LEFT(fu.data->>'content', 120) FROM entries AS fu
+                WHERE fu.session_id = s.id AND fu.kind = 'user_message'
+                ORDER BY fu.seq LIMIT 1
+            ),
+            COALESCE(BOOL_OR(e.uploaded_file_id IS NOT NULL), false)
+        FROM sessions AS s
+        LEFT JOIN entries AS e ON e.session_id = s.id
+        GROUP BY s.id, s.started_at
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        'ix_session_summaries_last_activity_at_session_id',
+        table_name='session_summaries',
+    )
+    op.drop_table('session_summaries')
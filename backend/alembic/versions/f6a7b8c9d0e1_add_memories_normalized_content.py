@@ -0,0 +1,46 @@
+"""add unique memories.normalized_content
+
+Revision ID: f6a7b8c9d0e1
+Revises: e5f6a7b8c9d0
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6a7b8c9d0e1'
+down_revision: Union[str, Sequence[str], None] = 'e5f6a7b8c9d0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same as db.repository.normalize_memory_content
+NORMALIZE_SQL = "btrim(regexp_replace(lower(content), '[^a-z0-9]+', ' ', 'g'))"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('memories', sa.Column('normalized_content', sa.Text(), nullable=True))
+    op.execute(f"UPDATE memories SET normalized_content = {NORMALIZE_SQL}")
+    # Keep the oldest of any memories that only differ in case/punctuation
+    op.execute(
+        """
+        DELETE FROM memories AS m
+        USING memories AS keep
+        WHERE m.normalized_content = keep.normalized_content
+          AND (m.created_at, m.id) > (keep.created_at, keep.id)
+        """
+    )
+    op.alter_column('memories', 'normalized_content', nullable=False)
+    op.create_unique_constraint(
+        'memories_normalized_content_key', 'memories', ['normalized_content']
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('memories_normalized_content_key', 'memories', type_='unique')
+    op.drop_column('memories', 'normalized_content')
@@ -0,0 +1,224 @@
+"""Benchmark cases for the backend's hot paths.
+
+Each case is a zero-argument callable (sync or async) built by a setup
+function, so fixture construction is never timed. Cases in the same
+``group`` are the same operation at different ``size``s; the runner uses
+them to flag super-linear scaling.
+"""
+
+import json
+import math
+import random
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Callable
+
+import tools  # noqa: F401 — register tools
+from agent.llm import _tools_to_responses_format, build_llm_messages, build_responses_input
+from db.models import EntryKind, EntryStatus
+from interface import wire
+from interface.models import entry_frame, entry_to_wire
+from rules.compiler import compile_sign_text
+from tools import TOOL_DEFINITIONS, search_nearby_signs
+from worker.registry import mark_batch_done, register_batch, remove_slot
+
+SIGN_TEXT = (
+    "2 HOUR PARKING 8AM-6PM MON THRU SAT EXCEPT VEHICLES WITH AREA S PERMITS\n\n"
+    "NO PARKING 12AM-6AM TUESDAY STREET CLEANING"
+)
+CENTER = (37.7599, -122.4148)
+
+
+@dataclass
+class Case:
+    name: str
+    fn: Callable
+    group: str | None = None
+    size: int | None = None
+
+
+# --- Fixtures ---
+
+
+def _entry(seq: int, kind: EntryKind, data: dict, status=None) -> SimpleNamespace:
+    now = datetime(2026, 1, 1, tzinfo=timezone.utc) + timedelta(seconds=seq)
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        session_id=uuid.UUID(int=1),
+        seq=seq,
+        kind=kind,
+        data=data,
+        status=status,
+        uploaded_file_id=None,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def transcript(n_entries: int) -> list:
+    """A realistic mix: user turns, orchestrator tool calls with sub-agent work."""
+    entries: list = []
+    turn = 0
+    while len(entries) < n_entries:
+        turn += 1
+        seq = len(entries)
+        entries.append(_entry(seq, EntryKind.USER_MESSAGE, {"content": f"Can I park here at {turn}pm?"}))
+        call_id = f"call_{turn}"
+        entries.append(_entry(seq + 1, EntryKind.TOOL_CALL, {
+            "call_id": call_id, "tool_name": "task_location",
+            "arguments": {"task_description": "Search for parking signs near: 20th and texas"},
+            "agent_name": "orchestrator",
+        }, EntryStatus.DONE))
+        entries.append(_entry(seq + 2, EntryKind.SUB_AGENT_CALL, {"call_id": call_id, "agent_name": "location_agent"}))
+        inner = f"loc_{turn}"
+        entries.append(_entry(seq + 3, EntryKind.TOOL_CALL, {
+            "call_id": inner, "tool_name": "mapbox_geocode",
+            "arguments": {"query": "20th and texas"}, "agent_name": "location_agent",
+        }, EntryStatus.DONE))
+        entries.append(_entry(seq + 4, EntryKind.TOOL_RESULT, {
+            "call_id": inner, "result": {"lat": 37.76, "lon": -122.39, "full_address": "20th St", "name": "20th"},
+        }))
+        result = {"summary": "Found 3 signs nearby.", "actions": ["mapbox_geocode: {...}"] * 2}
+        entries.append(_entry(seq + 5, EntryKind.SUB_AGENT_RESULT, {"call_id": call_id, "result": result}))
+        entries.append(_entry(seq + 6, EntryKind.TOOL_RESULT, {"call_id": call_id, "result": result}))
+        entries.append(_entry(seq + 7, EntryKind.ASSISTANT_MESSAGE, {"content": "Yes, for up to 2 hours."}))
+    return entries[:n_entries]
+
+
+def signs(n: int, spread_meters: float = 20_000, seed: int = 42) -> list:
+    """n saved signs scattered uniformly around CENTER."""
+    from db.repository import apply_parking_sign_rules
+
+    rng = random.Random(seed)
+    rules = compile_sign_text(SIGN_TEXT)
+    lat0, lon0 = CENTER
+    rows = []
+    for _ in range(n):
+        dlat = rng.uniform(-spread_meters, spread_meters) / 111_320
+        dlon = rng.uniform(-spread_meters, spread_meters) / (111_320 * math.cos(math.radians(lat0)))
+        row = SimpleNamespace(
+            id=uuid.uuid4(),
+            uploaded_file_id=uuid.uuid4(),
+            latitude=lat0 + dlat,
+            longitude=lon0 + dlon,
+            description="somewhere",
+            sign_text=SIGN_TEXT,
+        )
+        apply_parking_sign_rules(row, rules)
+        rows.append(row)
+    return rows
+
+
+def _patch_sign_store(rows: list) -> None:
+    """Serve search_nearby_signs from memory.
+
+    The bbox query's result is computed once per box, standing in for the
+    indexed database lookup, so the timings cover the tool's own work.
+    """
+    from contextlib import asynccontextmanager
+
+    import db.database
+    import db.repository
+
+    boxes: dict[tuple, list] = {}
+
+    @asynccontextmanager
+    async def fake_db():
+        yield None
+
+    async def in_bbox(_db, min_lat, max_lat, min_lon, max_lon):
+        box = (min_lat, max_lat, min_lon, max_lon)
+        if box not in boxes:
+            boxes[box] = [
+                r for r in rows
+                if min_lat <= r.latitude <= max_lat and min_lon <= r.longitude <= max_lon
+            ]
+        return boxes[box]
+
+    async def uploaded_file(_db, file_id):
+        return SimpleNamespace(storage_key=f"{file_id}.jpg")
+
+    db.database.get_db = fake_db
+    db.repository.list_parking_sign_locations_in_bbox = in_bbox
+    db.repository.get_uploaded_file = uploaded_file
+
+
+_active_store: list | None = None
+
+
+def _use_sign_store(rows: list) -> None:
+    global _active_store
+    if _active_store is not rows:
+        _patch_sign_store(rows)
+        _active_store = rows
+
+
+# --- Cases ---
+
+
+def build_cases() -> list[Case]:
+    cases: list[Case] = []
+
+    for n in (10, 100, 1000):
+        entries = transcript(n)
+        cases.append(Case(
+            f"build_responses_input[{n}]",
+            lambda entries=entries: build_responses_input(entries, "system"),
+            group="build_responses_input", size=n,
+        ))
+        cases.append(Case(
+            f"build_llm_messages[{n}]",
+            lambda entries=entries: build_llm_messages(entries, "system"),
+            group="build_llm_messages", size=n,
+        ))
+
+    wire_entry = transcript(8)[6]
+    cases.append(Case("entry_to_wire", lambda: entry_to_wire(wire_entry)))
+    # Encoding a pushed entry: stdlib, orjson, and the cached frame sent on repeat
+    cases.append(Case(
+        "encode_entry_stdlib", lambda: json.dumps(entry_to_wire(wire_entry)).encode()
+    ))
+    cases.append(Case("encode_entry_orjson", lambda: wire.dumps(entry_to_wire(wire_entry))))
+    cases.append(Case("entry_frame_cached", lambda: entry_frame(wire_entry)))
+    # JSONB bind serialization of a transcript's worth of entry data
+    jsonb_rows = [e.data for e in transcript(100)]
+    cases.append(Case("jsonb_serialize_stdlib[100]", lambda: json.dumps(jsonb_rows)))
+    cases.append(Case("jsonb_serialize_orjson[100]", lambda: wire.dumps_str(jsonb_rows)))
+    cases.append(Case(
+        "tools_to_responses_format", lambda: _tools_to_responses_format(TOOL_DEFINITIONS)
+    ))
+
+    lat, lon = CENTER
+    cases.append(Case(
+        "haversine", lambda: search_nearby_signs._haversine(lat, lon, lat + 0.01, lon + 0.01)
+    ))
+
+    for n in (1_000, 100_000):
+        rows = signs(n)
+
+        async def search(rows=rows):
+            _use_sign_store(rows)
+            return await search_nearby_signs.run(latitude=lat, longitude=lon, radius_meters=1600)
+
+        async def search_window(rows=rows):
+            _use_sign_store(rows)
+            return await search_nearby_signs.run(
+                latitude=lat, longitude=lon, radius_meters=1600,
+                start_time="2026-10-19T10:00", end_time="2026-10-19T11:30",
+            )
+
+        cases.append(Case(f"search_nearby_signs[{n}]", search))
+        cases.append(Case(f"search_nearby_signs_window[{n}]", search_window))
+
+    def tool_batch():
+        session_id = uuid.UUID(int=7)
+        call_ids = [f"call_{i}" for i in range(10)]
+        register_batch(session_id, call_ids)
+        for call_id in call_ids:
+            mark_batch_done(session_id, call_id)
+        remove_slot(session_id)
+
+    cases.append(Case("tool_batch[10]", tool_batch))
+    return cases
@@ -0,0 +1,133 @@
+"""Run the micro-benchmarks and compare them against tracked baselines.
+
+Each case is timed with timeit's autorange (enough loops for ~0.2s) repeated
+REPEATS times; the best per-call time is kept, since anything slower is noise
+from the machine rather than the code. Async cases run on one event loop.
+
+Two checks can fail a run:
+
+* ``--compare``: a case is more than ``--tolerance`` slower than its entry in
+  baselines.json. Baselines are machine-specific; refresh them with
+  ``--update`` on the machine that runs the comparison.
+* Scaling: within a group (the same operation at several sizes) the per-item
+  cost may not grow more than SCALING_LIMIT times from the smallest to the
+  largest size. This catches accidentally quadratic code on any machine.
+
+Usage:
+    python -m benchmarks.run                  # print timings
+    python -m benchmarks.run --compare        # fail on regressions
+    python -m benchmarks.run --update         # rewrite baselines.json
+    python -m benchmarks.run -k search        # only cases containing "search"
+"""
+
+import argparse
+import asyncio
+import inspect
+import json
+import platform
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.cases import Case, build_cases  # noqa: E402
+
+BASELINES = Path(__file__).parent / "baselines.json"
+REPEATS = 5
+DEFAULT_TOLERANCE = 0.25
+SCALING_LIMIT = 4.0
+
+
+def _callable(case: Case, loop: asyncio.AbstractEventLoop):
+    if inspect.iscoroutinefunction(case.fn):
+        return lambda: loop.run_until_complete(case.fn())
+    return case.fn
+
+
+def time_case(case: Case, loop: asyncio.AbstractEventLoop) -> float:
+    """Best seconds per call."""
+    fn = _callable(case, loop)
+    fn()  # warm caches and lazy imports
+    timer = timeit.Timer(fn)
+    loops, _ = timer.autorange()
+    return min(timer.repeat(repeat=REPEATS, number=loops)) / loops
+
+
+def check_scaling(cases: list[Case], results: dict[str, float]) -> list[str]:
+    failures = []
+    groups: dict[str, list[Case]] = {}
+    for case in cases:
+        if case.group and case.name in results:
+            groups.setdefault(case.group, []).append(case)
+    for group, members in groups.items():
+        if len(members) < 2:
+            continue
+        members.sort(key=lambda c: c.size)
+        small, large = members[0], members[-1]
+        ratio = (results[large.name] / large.size) / (results[small.name] / small.size)
+        if ratio > SCALING_LIMIT:
+            failures.append(
+                f"{group}: per-item cost grew {ratio:.1f}x from size {small.size} to {large.size}"
+            )
+    return failures
+
+
+def check_baselines(results: dict[str, float], baselines: dict[str, float], tolerance: float) -> list[str]:
+    failures = []
+    for name, seconds in results.items():
+        baseline = baselines.get(name)
+        if baseline and seconds > baseline * (1 + tolerance):
+            failures.append(f"{name}: {_fmt(seconds)} vs baseline {_fmt(baseline)} (+{seconds / baseline - 1:.0%})")
+    return failures
+
+
+def _fmt(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f}{unit}"
+    return f"{seconds / 1e-9:.0f}ns"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", dest="pattern", help="only run cases whose name contains this")
+    parser.add_argument("--compare", action="store_true", help="fail if slower than baselines.json")
+    parser.add_argument("--update", action="store_true", help="write the results to baselines.json")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args()
+
+    cases = [c for c in build_cases() if not args.pattern or args.pattern in c.name]
+    baselines = json.loads(BASELINES.read_text())["cases"] if BASELINES.exists() else {}
+
+    loop = asyncio.new_event_loop()
+    results: dict[str, float] = {}
+    try:
+        for case in cases:
+            results[case.name] = time_case(case, loop)
+            baseline = baselines.get(case.name)
+            delta = f"  ({results[case.name] / baseline - 1:+.0%})" if baseline else ""
+            print(f"{case.name:<40} {_fmt(results[case.name]):>10}{delta}")
+    finally:
+        loop.close()
+
+    failures = check_scaling(cases, results)
+    if args.compare:
+        failures += check_baselines(results, baselines, args.tolerance)
+
+    if args.update:
+        merged = {**baselines, **results}
+        BASELINES.write_text(json.dumps({
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cases": {name: float(f"{merged[name]:.4g}") for name in sorted(merged)},
+        }, indent=2) + "\n")
+        print(f"\nWrote {len(results)} baselines to {BASELINES.name}")
+
+    for failure in failures:
+        print(f"FAIL {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
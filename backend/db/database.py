@@ -3,19 +3,28 @@ from contextlib import asynccontextmanager
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from config import settings
+from interface import wire
+from observability import tracing
 
-engine = create_async_engine(settings.DATABASE_URL, echo=False)
+engine = create_async_engine(
+    settings.DATABASE_URL,
+    echo=False,
+    json_serializer=wire.dumps_str,
+    json_deserializer=wire.loads,
+)
 async_session_factory = async_sessionmaker(engine, expire_on_commit=False)
 
 
 @asynccontextmanager
 async def get_db():
     session: AsyncSession = async_session_factory()
-    try:
-        yield session
-        await session.commit()
-    except Exception:
-        await session.rollback()
-        raise
-    finally:
-        await session.close()
+    with tracing.span("db.transaction"):
+        try:
+            yield session
+            with tracing.span("db.commit"):
+                await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
@@ -2,7 +2,7 @@ import enum
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import BigInteger, Float, ForeignKey, String, Text
+from sqlalchemy import BigInteger, Boolean, Float, ForeignKey, Index, Integer, String, Text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
@@ -19,6 +19,7 @@ class EntryKind(str, enum.Enum):
     REASONING = "reasoning"
     SUB_AGENT_CALL = "sub_agent_call"
     SUB_AGENT_RESULT = "sub_agent_result"
+    CONTEXT_SUMMARY = "context_summary"
 
 
 class EntryStatus(str, enum.Enum):
@@ -43,6 +44,32 @@ class SessionModel(Base):
     started_at: Mapped[datetime] = mapped_column(
         default=lambda: datetime.now(timezone.utc).replace(tzinfo=None)
     )
+    # Highest EntryModel.seq handed out in this session
+    last_seq: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class SessionSummaryModel(Base):
+    """Sidebar projection of a session, maintained as entries are appended."""
+
+    __tablename__ = "session_summaries"
+
+    session_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("sessions.id"), primary_key=True
+    )
+    started_at: Mapped[datetime] = mapped_column(nullable=False)
+    last_activity_at: Mapped[datetime] = mapped_column(nullable=False)
+    entry_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    first_user_message: Mapped[str | None] = mapped_column(Text, nullable=True)
+    has_image: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+
+    # Keyset pagination for the sidebar: newest activity first
+    __table_args__ = (
+        Index(
+            "ix_session_summaries_last_activity_at_session_id",
+            "last_activity_at",
+            "session_id",
+        ),
+    )
 
 
 class UploadedFileModel(Base):
@@ -57,6 +84,8 @@ class UploadedFileModel(Base):
     original_filename: Mapped[str] = mapped_column(String(255), nullable=False)
     mime_type: Mapped[str] = mapped_column(String(100), nullable=False)
     size_bytes: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    # Schedule compiled from the OCR'd sign text (see rules.compiler)
+    sign_rules: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         default=lambda: datetime.now(timezone.utc).replace(tzinfo=None)
     )
@@ -69,6 +98,8 @@ class MemoryModel(Base):
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
     )
     content: Mapped[str] = mapped_column(Text, nullable=False)
+    # Lowercased alphanumerics only; unique so the same fact is stored once
+    normalized_content: Mapped[str] = mapped_column(Text, nullable=False, unique=True)
     created_at: Mapped[datetime] = mapped_column(
         default=lambda: datetime.now(timezone.utc).replace(tzinfo=None)
     )
@@ -91,10 +122,20 @@ class ParkingSignLocationModel(Base):
     longitude: Mapped[float] = mapped_column(Float, nullable=False)
     description: Mapped[str] = mapped_column(Text, nullable=False)
     sign_text: Mapped[str] = mapped_column(Text, nullable=False)
+    rules: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
+    # Weekly 15-minute availability bitmaps (hex) derived from rules; NULL when
+    # the rules are ambiguous or missing (see rules.availability)
+    forbidden_mask: Mapped[str | None] = mapped_column(Text, nullable=True)
+    limited_mask: Mapped[str | None] = mapped_column(Text, nullable=True)
+    limit_minutes: Mapped[int | None] = mapped_column(Integer, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         default=lambda: datetime.now(timezone.utc).replace(tzinfo=None)
     )
 
+    __table_args__ = (
+        Index("ix_parking_sign_locations_latitude_longitude", "latitude", "longitude"),
+    )
+
 
 class EntryModel(Base):
     __tablename__ = "entries"
@@ -108,9 +149,56 @@ class EntryModel(Base):
     uploaded_file_id: Mapped[uuid.UUID | None] = mapped_column(
         UUID(as_uuid=True), ForeignKey("uploaded_files.id"), nullable=True
     )
+    # Monotonic per-session position; the stable order of a transcript
+    seq: Mapped[int] = mapped_column(Integer, nullable=False)
     kind: Mapped[EntryKind] = mapped_column(String(50), nullable=False)
     data: Mapped[dict] = mapped_column(JSONB, nullable=False)
     status: Mapped[EntryStatus | None] = mapped_column(String(50), nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         default=lambda: datetime.now(timezone.utc).replace(tzinfo=None)
     )
+    updated_at: Mapped[datetime] = mapped_column(
+        default=lambda: datetime.now(timezone.utc).replace(tzinfo=None),
+        onupdate=lambda: datetime.now(timezone.utc).replace(tzinfo=None),
+    )
+
+    # Resume cursor lookups: "everything in this session touched since T"
+    __table_args__ = (
+        Index("ux_entries_session_id_seq", "session_id", "seq", unique=True),
+        Index("ix_entries_session_id_updated_at", "session_id", "updated_at"),
+    )
+
+
+class LLMUsageModel(Base):
+    """Token usage of one LLM call, for cost accounting."""
+
+    __tablename__ = "llm_usage"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
+    )
+    session_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("sessions.id"), nullable=True
+    )
+    # First entry written from the response, when the call produced entries
+    entry_id: Mapped[uuid.UUID | None] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("entries.id"), nullable=True
+    )
+    agent_name: Mapped[str] = mapped_column(String(50), nullable=False)
+    model: Mapped[str] = mapped_column(String(100), nullable=False)
+    # Reasoning effort the call ran at, when the response reports it
+    effort: Mapped[str | None] = mapped_column(String(20), nullable=True)
+    input_tokens: Mapped[int] = mapped_column(Integer, nullable=False)
+    # Part of input_tokens served from the prompt cache
+    cached_input_tokens: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    output_tokens: Mapped[int] = mapped_column(Integer, nullable=False)
+    # Part of output_tokens spent on reasoning
+    reasoning_tokens: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    created_at: Mapped[datetime] = mapped_column(
+        default=lambda: datetime.now(timezone.utc).replace(tzinfo=None)
+    )
+
+    __table_args__ = (
+        Index("ix_llm_usage_session_id", "session_id"),
+        Index("ix_llm_usage_created_at", "created_at"),
+    )
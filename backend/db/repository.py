@@ -1,6 +1,9 @@
+import re
 import uuid
+from collections.abc import AsyncIterator
+from datetime import datetime
 
-from sqlalchemy import select
+from sqlalchemy import func, literal_column, select, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from db.models import (
@@ -8,22 +11,40 @@ from db.models import (
     EntryKind,
     EntryModel,
     EntryStatus,
+    LLMUsageModel,
     MemoryModel,
     ParkingSignLocationModel,
     SessionModel,
+    SessionSummaryModel,
     UploadedFileModel,
 )
+from observability import tracing
+from rules.availability import schedule_masks, to_hex
 
+SUMMARY_SNIPPET_CHARS = 120
 
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+
+
+@tracing.traced("db.create_session")
 async def create_session(
     db: AsyncSession, parent_id: uuid.UUID | None = None
 ) -> SessionModel:
     session = SessionModel(parent_id=parent_id)
     db.add(session)
     await db.flush()
+    db.add(
+        SessionSummaryModel(
+            session_id=session.id,
+            started_at=session.started_at,
+            last_activity_at=session.started_at,
+        )
+    )
+    await db.flush()
     return session
 
 
+@tracing.traced("db.list_sessions")
 async def list_sessions(db: AsyncSession) -> list[SessionModel]:
     result = await db.execute(
         select(SessionModel).order_by(SessionModel.started_at.desc())
@@ -31,10 +52,33 @@ async def list_sessions(db: AsyncSession) -> list[SessionModel]:
     return list(result.scalars().all())
 
 
+@tracing.traced("db.list_session_summaries")
+async def list_session_summaries(
+    db: AsyncSession,
+    limit: int = 50,
+    before: tuple[datetime, uuid.UUID] | None = None,
+) -> list[SessionSummaryModel]:
+    """Sessions by most recent activity; ``before`` is the last row of the previous page."""
+    stmt = select(SessionSummaryModel)
+    if before is not None:
+        stmt = stmt.where(
+            tuple_(SessionSummaryModel.last_activity_at, SessionSummaryModel.session_id)
+            < tuple_(*before)
+        )
+    stmt = stmt.order_by(
+        SessionSummaryModel.last_activity_at.desc(),
+        SessionSummaryModel.session_id.desc(),
+    ).limit(limit)
+    result = await db.execute(stmt)
+    return list(result.scalars().all())
+
+
+@tracing.traced("db.get_session")
 async def get_session(db: AsyncSession, session_id: uuid.UUID) -> SessionModel | None:
     return await db.get(SessionModel, session_id)
 
 
+@tracing.traced("db.append_entry")
 async def append_entry(
     db: AsyncSession,
     session_id: uuid.UUID,
@@ -43,8 +87,19 @@ async def append_entry(
     uploaded_file_id: uuid.UUID | None = None,
 ) -> EntryModel:
     status = EntryStatus.PENDING if kind in EXECUTABLE_KINDS else None
+    # Claim the next sequence number; the row lock on the session serializes
+    # concurrent appends to the same transcript until this transaction ends.
+    seq = (
+        await db.execute(
+            update(SessionModel)
+            .where(SessionModel.id == session_id)
+            .values(last_seq=SessionModel.last_seq + 1)
+            .returning(SessionModel.last_seq)
+        )
+    ).scalar_one()
     entry = EntryModel(
         session_id=session_id,
+        seq=seq,
         kind=kind,
         data=data,
         status=status,
@@ -52,9 +107,31 @@ async def append_entry(
     )
     db.add(entry)
     await db.flush()
+    await _update_session_summary(db, entry)
     return entry
 
 
+async def _update_session_summary(db: AsyncSession, entry: EntryModel) -> None:
+    """Fold one appended entry into the session's sidebar projection."""
+    summary = SessionSummaryModel
+    values: dict = {
+        "entry_count": summary.entry_count + 1,
+        "last_activity_at": entry.created_at,
+    }
+    if entry.kind == EntryKind.USER_MESSAGE:
+        snippet = (entry.data.get("content") or "")[:SUMMARY_SNIPPET_CHARS]
+        values["first_user_message"] = func.coalesce(summary.first_user_message, snippet)
+    if entry.uploaded_file_id is not None:
+        values["has_image"] = True
+    await db.execute(
+        update(SessionSummaryModel)
+        .where(SessionSummaryModel.session_id == entry.session_id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+
+
+@tracing.traced("db.mark_entry_status")
 async def mark_entry_status(
     db: AsyncSession, entry_id: uuid.UUID, status: EntryStatus
 ) -> None:
@@ -64,21 +141,105 @@ async def mark_entry_status(
         await db.flush()
 
 
+@tracing.traced("db.get_session_entries")
 async def get_session_entries(
+    db: AsyncSession,
+    session_id: uuid.UUID,
+    after_seq: int = 0,
+    limit: int | None = None,
+) -> list[EntryModel]:
+    """Entries in transcript order, optionally one keyset page at a time."""
+    stmt = (
+        select(EntryModel)
+        .where(EntryModel.session_id == session_id, EntryModel.seq > after_seq)
+        .order_by(EntryModel.seq)
+    )
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    result = await db.execute(stmt)
+    return list(result.scalars().all())
+
+
+@tracing.traced("db.get_session_entries_watermark")
+async def get_session_entries_watermark(
     db: AsyncSession, session_id: uuid.UUID
+) -> tuple[int, datetime | None]:
+    """Highest seq and latest updated_at in a session, for cache validation."""
+    result = await db.execute(
+        select(func.max(EntryModel.seq), func.max(EntryModel.updated_at)).where(
+            EntryModel.session_id == session_id
+        )
+    )
+    last_seq, last_updated_at = result.one()
+    return last_seq or 0, last_updated_at
+
+
+@tracing.traced("db.get_session_entries_since")
+async def get_session_entries_since(
+    db: AsyncSession, session_id: uuid.UUID, since: datetime
 ) -> list[EntryModel]:
+    """Entries created or updated at/after ``since`` (a resume cursor).
+
+    Status changes bump ``updated_at``, so one query covers both new entries
+    and status transitions of older ones. The bound is inclusive: replaying an
+    entry the client already has is harmless, missing one is not.
+    """
     result = await db.execute(
         select(EntryModel)
-        .where(EntryModel.session_id == session_id)
-        .order_by(EntryModel.created_at)
+        .where(EntryModel.session_id == session_id, EntryModel.updated_at >= since)
+        .order_by(EntryModel.seq)
     )
     return list(result.scalars().all())
 
 
+async def stream_entries(
+    db: AsyncSession,
+    session_ids: list[uuid.UUID] | None = None,
+    kinds: list[EntryKind] | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+    batch_size: int = 500,
+) -> AsyncIterator[tuple[EntryModel, SessionModel]]:
+    """Entries with their session, by session then seq, off a server-side cursor.
+
+    Rows are fetched ``batch_size`` at a time, so memory stays flat however
+    many match. ``since``/``until`` bound the session's start, so sessions
+    are exported whole; ``kinds`` filters the entries within them.
+    """
+    stmt = (
+        select(EntryModel, SessionModel)
+        .join(SessionModel, SessionModel.id == EntryModel.session_id)
+        .order_by(EntryModel.session_id, EntryModel.seq)
+        .execution_options(yield_per=batch_size)
+    )
+    if session_ids:
+        stmt = stmt.where(EntryModel.session_id.in_(session_ids))
+    if kinds:
+        stmt = stmt.where(EntryModel.kind.in_(kinds))
+    if since is not None:
+        stmt = stmt.where(SessionModel.started_at >= since)
+    if until is not None:
+        stmt = stmt.where(SessionModel.started_at < until)
+
+    # Not made current: the generator is consumed from the caller's context
+    span = tracing.start_span("db.stream_entries")
+    rows = 0
+    try:
+        result = await db.stream(stmt)
+        async for entry, session in result:
+            rows += 1
+            yield entry, session
+    finally:
+        span.set(rows=rows)
+        span.finish()
+
+
+@tracing.traced("db.get_entry")
 async def get_entry(db: AsyncSession, entry_id: uuid.UUID) -> EntryModel | None:
     return await db.get(EntryModel, entry_id)
 
 
+@tracing.traced("db.create_uploaded_file")
 async def create_uploaded_file(
     db: AsyncSession,
     storage_key: str,
@@ -97,12 +258,25 @@ async def create_uploaded_file(
     return uploaded_file
 
 
+@tracing.traced("db.get_uploaded_file")
 async def get_uploaded_file(
     db: AsyncSession, file_id: uuid.UUID
 ) -> UploadedFileModel | None:
     return await db.get(UploadedFileModel, file_id)
 
 
+@tracing.traced("db.set_uploaded_file_sign_rules")
+async def set_uploaded_file_sign_rules(
+    db: AsyncSession, file_id: uuid.UUID, sign_rules: dict
+) -> None:
+    await db.execute(
+        update(UploadedFileModel)
+        .where(UploadedFileModel.id == file_id)
+        .values(sign_rules=sign_rules)
+    )
+
+
+@tracing.traced("db.get_uploaded_file_by_storage_key")
 async def get_uploaded_file_by_storage_key(
     db: AsyncSession, storage_key: str
 ) -> UploadedFileModel | None:
@@ -115,23 +289,63 @@ async def get_uploaded_file_by_storage_key(
 # --- Memories ---
 
 
+def normalize_memory_content(content: str) -> str:
+    """Case- and punctuation-insensitive form used for the uniqueness check.
+
+    Must stay in sync with the SQL backfill in migration f6a7b8c9d0e1.
+    """
+    return _NON_ALNUM_RE.sub(" ", content.lower()).strip()
+
+
+@tracing.traced("db.get_memory_by_normalized_content")
+async def get_memory_by_normalized_content(
+    db: AsyncSession, content: str
+) -> MemoryModel | None:
+    result = await db.execute(
+        select(MemoryModel).where(
+            MemoryModel.normalized_content == normalize_memory_content(content)
+        )
+    )
+    return result.scalar_one_or_none()
+
+
+@tracing.traced("db.create_memory")
 async def create_memory(db: AsyncSession, content: str) -> MemoryModel:
-    memory = MemoryModel(content=content)
+    """Create a memory, or return the existing one with the same normalized text."""
+    existing = await get_memory_by_normalized_content(db, content)
+    if existing:
+        return existing
+    memory = MemoryModel(
+        content=content, normalized_content=normalize_memory_content(content)
+    )
     db.add(memory)
     await db.flush()
     return memory
 
 
+@tracing.traced("db.update_memory")
 async def update_memory(
     db: AsyncSession, memory_id: uuid.UUID, content: str
 ) -> MemoryModel | None:
+    """Rewrite a memory; if another one already says the same, merge into it.
+
+    On a merge the updated row is deleted and the existing one returned.
+    """
     memory = await db.get(MemoryModel, memory_id)
-    if memory:
-        memory.content = content
+    if memory is None:
+        return None
+    existing = await get_memory_by_normalized_content(db, content)
+    if existing is not None and existing.id != memory.id:
+        await db.delete(memory)
         await db.flush()
+        return existing
+    memory.content = content
+    memory.normalized_content = normalize_memory_content(content)
+    await db.flush()
     return memory
 
 
+@tracing.traced("db.delete_memory")
 async def delete_memory(db: AsyncSession, memory_id: uuid.UUID) -> bool:
     memory = await db.get(MemoryModel, memory_id)
     if memory:
@@ -141,6 +355,7 @@ async def delete_memory(db: AsyncSession, memory_id: uuid.UUID) -> bool:
     return False
 
 
+@tracing.traced("db.list_memories")
 async def list_memories(db: AsyncSession) -> list[MemoryModel]:
     result = await db.execute(
         select(MemoryModel).order_by(MemoryModel.created_at)
@@ -151,6 +366,7 @@ async def list_memories(db: AsyncSession) -> list[MemoryModel]:
 # --- Parking Sign Locations ---
 
 
+@tracing.traced("db.create_parking_sign_location")
 async def create_parking_sign_location(
     db: AsyncSession,
     uploaded_file_id: uuid.UUID,
@@ -158,6 +374,7 @@ async def create_parking_sign_location(
     longitude: float,
     description: str,
     sign_text: str,
+    rules: dict | None = None,
 ) -> ParkingSignLocationModel:
     location = ParkingSignLocationModel(
         uploaded_file_id=uploaded_file_id,
@@ -166,11 +383,26 @@ async def create_parking_sign_location(
         description=description,
         sign_text=sign_text,
     )
+    if rules is not None:
+        apply_parking_sign_rules(location, rules)
     db.add(location)
     await db.flush()
     return location
 
 
+def apply_parking_sign_rules(location: ParkingSignLocationModel, rules: dict) -> None:
+    """Set a location's compiled rules and the availability bitmaps derived from them."""
+    location.rules = rules
+    masks = schedule_masks(rules)
+    if masks is None:
+        location.forbidden_mask = location.limited_mask = location.limit_minutes = None
+    else:
+        forbidden, limited, location.limit_minutes = masks
+        location.forbidden_mask = to_hex(forbidden)
+        location.limited_mask = to_hex(limited)
+
+
+@tracing.traced("db.list_parking_sign_locations")
 async def list_parking_sign_locations(
     db: AsyncSession,
 ) -> list[ParkingSignLocationModel]:
@@ -182,7 +414,86 @@ async def list_parking_sign_locations(
     return list(result.scalars().all())
 
 
+@tracing.traced("db.list_parking_sign_locations_in_bbox")
+async def list_parking_sign_locations_in_bbox(
+    db: AsyncSession,
+    min_lat: float,
+    max_lat: float,
+    min_lon: float,
+    max_lon: float,
+) -> list[ParkingSignLocationModel]:
+    """Locations inside a lat/lon box; the caller refines by exact distance."""
+    result = await db.execute(
+        select(ParkingSignLocationModel).where(
+            ParkingSignLocationModel.latitude.between(min_lat, max_lat),
+            ParkingSignLocationModel.longitude.between(min_lon, max_lon),
+        )
+    )
+    return list(result.scalars().all())
+
+
+@tracing.traced("db.get_parking_sign_location")
 async def get_parking_sign_location(
     db: AsyncSession, location_id: uuid.UUID
 ) -> ParkingSignLocationModel | None:
     return await db.get(ParkingSignLocationModel, location_id)
+
+
+# Columns summed by summarize_llm_usage
+USAGE_TOKEN_COLUMNS = ("input_tokens", "cached_input_tokens", "output_tokens", "reasoning_tokens")
+
+
+@tracing.traced("db.create_llm_usage")
+async def create_llm_usage(
+    db: AsyncSession,
+    session_id: uuid.UUID | None,
+    agent_name: str,
+    usage: dict,
+    entry_id: uuid.UUID | None = None,
+) -> LLMUsageModel:
+    row = LLMUsageModel(
+        session_id=session_id,
+        entry_id=entry_id,
+        agent_name=agent_name,
+        model=usage["model"],
+        effort=usage.get("effort"),
+        **{column: usage.get(column) or 0 for column in USAGE_TOKEN_COLUMNS},
+    )
+    db.add(row)
+    await db.flush()
+    return row
+
+
+@tracing.traced("db.summarize_llm_usage")
+async def summarize_llm_usage(
+    db: AsyncSession,
+    group_by: str,
+    session_id: uuid.UUID | None = None,
+    since: datetime | None = None,
+) -> list[dict]:
+    """Call count and token sums per agent, model, effort, session or day.
+
+    ``group_by`` is one of "agent", "model", "effort", "session" or "day". Days come
+    back in order; other groupings by input tokens, largest first.
+    """
+    keys = {
+        "agent": LLMUsageModel.agent_name,
+        "model": LLMUsageModel.model,
+        "effort": LLMUsageModel.effort,
+        "session": LLMUsageModel.session_id,
+        # Literal so SELECT and GROUP BY render the identical expression
+        "day": func.date_trunc(literal_column("'day'"), LLMUsageModel.created_at),
+    }
+    key = keys[group_by].label("key")
+    sums = [
+        func.coalesce(func.sum(getattr(LLMUsageModel, column)), 0).label(column)
+        for column in USAGE_TOKEN_COLUMNS
+    ]
+    stmt = select(key, func.count().label("calls"), *sums).group_by(key)
+    if session_id is not None:
+        stmt = stmt.where(LLMUsageModel.session_id == session_id)
+    if since is not None:
+        stmt = stmt.where(LLMUsageModel.created_at >= since)
+    stmt = stmt.order_by(key if group_by == "day" else sums[0].desc())
+    result = await db.execute(stmt)
+    return [dict(row._mapping) for row in result]
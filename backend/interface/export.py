@@ -0,0 +1,86 @@
+"""NDJSON export of sessions and their entries, for offline analysis.
+
+Each session is written as a ``{"type": "session", ...}`` line followed by
+its entries in the WebSocket wire format, one JSON object per line. Lines
+come straight off a server-side cursor and are written out in chunks, so an
+export of any size runs in constant memory. Output can be zstd-compressed
+when the optional ``zstandard`` package is installed.
+"""
+
+from collections.abc import AsyncIterator
+from datetime import datetime
+
+from db.models import EntryKind
+from db.repository import stream_entries
+from interface import wire
+from interface.models import entry_to_wire
+
+# Bytes of output gathered before a chunk is handed on
+CHUNK_BYTES = 64 * 1024
+
+
+class CompressionUnavailable(RuntimeError):
+    """zstd output was requested but the zstandard package is not installed."""
+
+
+def session_line(session) -> bytes:
+    return wire.dumps({
+        "type": "session",
+        "session": {
+            "id": str(session.id),
+            "parent_id": str(session.parent_id) if session.parent_id else None,
+            "started_at": session.started_at.isoformat(),
+        },
+    }) + b"\n"
+
+
+async def export_lines(
+    db,
+    session_ids: list | None = None,
+    kinds: list[EntryKind] | None = None,
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> AsyncIterator[bytes]:
+    """One encoded line per session and per entry, sessions in id order."""
+    current = None
+    async for entry, session in stream_entries(db, session_ids, kinds, since, until):
+        if session.id != current:
+            current = session.id
+            yield session_line(session)
+        # Not entry_frame: an export would flush the cache of live entries
+        yield wire.dumps(entry_to_wire(entry)) + b"\n"
+
+
+async def chunked(lines: AsyncIterator[bytes], size: int = CHUNK_BYTES) -> AsyncIterator[bytes]:
+    """Join lines into chunks of about ``size`` bytes."""
+    buffer: list[bytes] = []
+    buffered = 0
+    async for line in lines:
+        buffer.append(line)
+        buffered += len(line)
+        if buffered >= size:
+            yield b"".join(buffer)
+            buffer.clear()
+            buffered = 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+def zstd_compressor(level: int = 3):
+    """A streaming zstd compressor; raises CompressionUnavailable without zstandard."""
+    try:
+        import zstandard
+    except ImportError:
+        raise CompressionUnavailable(
+            "zstd compression needs the zstandard package (pip install zstandard)"
+        ) from None
+    return zstandard.ZstdCompressor(level=level).compressobj()
+
+
+async def compressed(chunks: AsyncIterator[bytes], compressor) -> AsyncIterator[bytes]:
+    """Compress a chunk stream into one zstd frame."""
+    async for chunk in chunks:
+        out = compressor.compress(chunk)
+        if out:
+            yield out
+    yield compressor.flush()
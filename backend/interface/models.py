@@ -1,6 +1,26 @@
+from collections import OrderedDict
+from datetime import datetime, timezone
+
 from pydantic import BaseModel
 
+from config import settings
 from db.models import EntryModel
+from interface import wire
+
+# (entry id, updated_at) -> encoded wire "entry" object, least recently used first.
+# Any change to an entry bumps updated_at, so a stale encoding is never reused.
+_encoded_entries: OrderedDict[tuple, bytes] = OrderedDict()
+
+
+def naive_utc(value: datetime) -> datetime:
+    """A client-supplied timestamp as naive UTC, the way the DB stores them.
+
+    Aware values are converted rather than having their offset dropped;
+    naive ones are taken as UTC already.
+    """
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
 
 
 class CreateSessionResponse(BaseModel):
@@ -24,9 +44,34 @@ def entry_to_wire(entry: EntryModel) -> dict:
         "entry": {
             "id": str(entry.id),
             "session_id": str(entry.session_id),
+            "seq": entry.seq,
             "kind": entry.kind.value if hasattr(entry.kind, "value") else entry.kind,
             "data": entry.data,
             "status": entry.status.value if hasattr(entry.status, "value") else entry.status,
             "created_at": entry.created_at.isoformat(),
+            "updated_at": entry.updated_at.isoformat(),
         },
     }
+
+
+def entry_json(entry: EntryModel) -> bytes:
+    """The encoded ``entry`` object of entry_to_wire, encoded once per change."""
+    key = (entry.id, entry.updated_at)
+    encoded = _encoded_entries.get(key)
+    if encoded is not None:
+        _encoded_entries.move_to_end(key)
+        return encoded
+    encoded = _encoded_entries[key] = wire.dumps(entry_to_wire(entry)["entry"])
+    if len(_encoded_entries) > settings.WIRE_ENTRY_CACHE_SIZE:
+        _encoded_entries.popitem(last=False)
+    return encoded
+
+
+def entry_frame(entry: EntryModel) -> bytes:
+    """The encoded WebSocket message for an entry, for push_to_client."""
+    return b'{"type":"entry","entry":' + entry_json(entry) + b"}"
+
+
+def entries_json(entries: list[EntryModel]) -> bytes:
+    """An encoded JSON array of wire entries, for REST responses."""
+    return b"[" + b",".join(entry_json(e) for e in entries) + b"]"
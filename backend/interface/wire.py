@@ -0,0 +1,41 @@
+"""JSON encoding for REST responses, WebSocket frames and JSONB columns.
+
+Everything goes through orjson, which is several times faster than the
+stdlib and writes compact UTF-8 directly to bytes. Frames are still sent
+as text, since the browser client reads them with ``JSON.parse``.
+"""
+
+from typing import Any
+
+import orjson
+from fastapi import WebSocket
+from fastapi.responses import JSONResponse
+
+_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+loads = orjson.loads
+
+
+def dumps(obj: Any) -> bytes:
+    return orjson.dumps(obj, option=_OPTIONS)
+
+
+def dumps_str(obj: Any) -> str:
+    """For APIs that need text, e.g. LLM input items and the DB driver."""
+    return orjson.dumps(obj, option=_OPTIONS).decode()
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson; pass bytes to send them as they are."""
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
+
+
+async def send(websocket: WebSocket, message: dict | bytes) -> None:
+    """Send one JSON text frame; ``message`` may already be encoded."""
+    if not isinstance(message, bytes):
+        message = dumps(message)
+    await websocket.send_text(message.decode())
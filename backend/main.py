@@ -2,43 +2,58 @@ import asyncio
 import logging
 import uuid
 from contextlib import asynccontextmanager
+from datetime import datetime
 from pathlib import Path
+from typing import Literal
 
-from fastapi import FastAPI, UploadFile, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, Query, Request, Response, UploadFile, WebSocket, WebSocketDisconnect
 from fastapi import HTTPException
 from pydantic import BaseModel
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from fastapi.staticfiles import StaticFiles
 
 
+from agent import memory_cache, usage
 from agent.orchestrator import start_session
-from worker.worker import run_worker
+from worker.worker import drain_background_tasks, run_worker
 from worker.registry import (
+    begin_replay,
+    finish_replay,
     get_or_create_slot,
     remove_slot,
     set_websocket,
 )
 from config import settings
 from db.database import get_db
+from db.models import EntryKind
 from db.repository import (
     create_session,
     create_uploaded_file,
     delete_memory,
     get_session,
     get_session_entries,
+    get_session_entries_since,
+    get_session_entries_watermark,
     get_uploaded_file,
     get_uploaded_file_by_storage_key,
     list_memories,
     list_parking_sign_locations,
-    list_sessions,
+    list_session_summaries,
+    summarize_llm_usage,
 )
+from observability import metrics, tracing
+from interface import export, wire
 from interface.models import (
     CreateSessionResponse,
     InboundWSMessage,
     UploadResponse,
-    entry_to_wire,
+    entries_json,
+    entry_frame,
+    naive_utc,
 )
 from storage.backend import LocalFileStorageBackend
+from tools import ocr_parking_sign
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -51,10 +66,16 @@ storage = LocalFileStorageBackend()
 async def lifespan(app: FastAPI):
     Path(settings.UPLOAD_DIR).mkdir(parents=True, exist_ok=True)
     logger.info("Uploads dir ready (run 'alembic upgrade head' to apply migrations)")
+    tracing.setup()
+    await memory_cache.start_listener()
     yield
+    # Let in-flight memory updates land before the process exits
+    await drain_background_tasks()
+    await memory_cache.stop_listener()
+    tracing.shutdown()
 
 
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(lifespan=lifespan, default_response_class=wire.ORJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -70,16 +91,38 @@ app.mount("/uploads", StaticFiles(directory=settings.UPLOAD_DIR), name="uploads"
 # --- REST endpoints ---
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint():
+    body, content_type = metrics.render()
+    return Response(content=body, media_type=content_type)
+
+
 @app.get("/api/sessions")
-async def list_sessions_endpoint():
+async def list_sessions_endpoint(
+    limit: int = Query(50, ge=1, le=200),
+    before_activity: datetime | None = None,
+    before_id: uuid.UUID | None = None,
+):
+    """Sessions by most recent activity, one keyset page at a time.
+
+    Pass the ``last_activity_at`` and ``id`` of the last row received as
+    ``before_activity``/``before_id`` to fetch the next page.
+    """
+    before = None
+    if before_activity is not None and before_id is not None:
+        before = (naive_utc(before_activity), before_id)
     async with get_db() as db:
-        sessions = await list_sessions(db)
+        summaries = await list_session_summaries(db, limit=limit, before=before)
     return [
         {
-            "id": str(s.id),
+            "id": str(s.session_id),
             "started_at": s.started_at.isoformat() + "Z",
+            "last_activity_at": s.last_activity_at.isoformat() + "Z",
+            "entry_count": s.entry_count,
+            "preview": s.first_user_message,
+            "has_image": s.has_image,
         }
-        for s in sessions
+        for s in summaries
     ]
 
 
@@ -103,7 +146,7 @@ async def upload_file(file: UploadFile):
     url = storage.url_for(storage_key)
 
     async with get_db() as db:
-        await create_uploaded_file(
+        uploaded = await create_uploaded_file(
             db,
             storage_key=storage_key,
             original_filename=file.filename or "upload.bin",
@@ -111,17 +154,133 @@ async def upload_file(file: UploadFile):
             size_bytes=len(data),
         )
 
+    # Nearly every upload is a sign photo that will be OCR'd next turn
+    if settings.SPECULATIVE_OCR and settings.ROBOFLOW_API_KEY:
+        ocr_parking_sign.prefetch(str(uploaded.id), data)
+
     return UploadResponse(file_id=storage_key, url=url)
 
 
 @app.get("/api/sessions/{session_id}/entries")
-async def get_entries(session_id: uuid.UUID):
+async def get_entries(
+    session_id: uuid.UUID,
+    request: Request,
+    after_seq: int = Query(0, ge=0),
+    limit: int | None = Query(None, ge=1, le=1000),
+):
+    """Transcript entries with seq > after_seq, at most ``limit`` of them.
+
+    The ETag is derived from the session's last seq and latest status change,
+    so a client revalidating an unchanged session gets a bodiless 304.
+    """
     async with get_db() as db:
         session = await get_session(db, session_id)
         if not session:
             raise HTTPException(status_code=404, detail="Session not found")
-        entries = await get_session_entries(db, session_id)
-    return [entry_to_wire(e)["entry"] for e in entries]
+        last_seq, last_updated_at = await get_session_entries_watermark(db, session_id)
+        updated_marker = last_updated_at.isoformat() if last_updated_at else "0"
+        etag = f'W/"{last_seq}-{updated_marker}"'
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        entries = await get_session_entries(
+            db, session_id, after_seq=after_seq, limit=limit
+        )
+    return wire.ORJSONResponse(entries_json(entries), headers={"ETag": etag})
+
+
+@app.get("/api/sessions/{session_id}/timeline")
+async def get_timeline(session_id: uuid.UUID):
+    """Traced turns of a session with the critical path of each.
+
+    Spans are buffered in memory, so only recent turns served by this
+    process are available.
+    """
+    async with get_db() as db:
+        session = await get_session(db, session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+    return {"session_id": str(session_id), "turns": tracing.timeline(session_id)}
+
+
+# --- Usage ---
+
+
+def _usage_key(key):
+    if isinstance(key, datetime):
+        return key.date().isoformat()
+    return str(key) if key is not None else None
+
+
+@app.get("/api/sessions/{session_id}/usage")
+async def get_session_usage(session_id: uuid.UUID):
+    """LLM calls, tokens and estimated cost of a session, in total and per agent."""
+    async with get_db() as db:
+        session = await get_session(db, session_id)
+        if not session:
+            raise HTTPException(status_code=404, detail="Session not found")
+        by_agent = await summarize_llm_usage(db, "agent", session_id=session_id)
+    return {
+        "session_id": str(session_id),
+        "total": usage.with_cost(usage.total(by_agent)),
+        "by_agent": [usage.with_cost({**row, "key": _usage_key(row["key"])}) for row in by_agent],
+    }
+
+
+@app.get("/api/usage")
+async def get_usage(
+    group_by: Literal["agent", "model", "effort", "session", "day"] = "agent",
+    since: datetime | None = None,
+):
+    """LLM calls, tokens and estimated cost across sessions, per ``group_by`` key."""
+    if since is not None:
+        since = naive_utc(since)
+    async with get_db() as db:
+        rows = await summarize_llm_usage(db, group_by, since=since)
+    return [usage.with_cost({**row, "key": _usage_key(row["key"])}) for row in rows]
+
+
+# --- Export ---
+
+
+@app.get("/api/export")
+async def export_entries(
+    session_id: list[uuid.UUID] | None = Query(None),
+    kind: list[EntryKind] | None = Query(None),
+    since: datetime | None = None,
+    until: datetime | None = None,
+    compress: Literal["zstd"] | None = None,
+):
+    """Sessions and their entries as a streamed NDJSON download.
+
+    ``session_id`` and ``kind`` may be repeated; ``since``/``until`` bound
+    the session start. Rows are streamed off a server-side cursor, so the
+    export runs in constant memory. ``compress=zstd`` needs zstandard.
+    """
+    compressor = None
+    if compress == "zstd":
+        try:
+            compressor = export.zstd_compressor()
+        except export.CompressionUnavailable as e:
+            raise HTTPException(status_code=501, detail=str(e))
+    if since is not None:
+        since = naive_utc(since)
+    if until is not None:
+        until = naive_utc(until)
+
+    async def body():
+        async with get_db() as db:
+            chunks = export.chunked(export.export_lines(db, session_id, kind, since, until))
+            if compressor is not None:
+                chunks = export.compressed(chunks, compressor)
+            async for chunk in chunks:
+                yield chunk
+
+    filename = "export.ndjson.zst" if compressor is not None else "export.ndjson"
+    return StreamingResponse(
+        body(),
+        media_type="application/zstd" if compressor is not None else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
 
 
 # --- Settings ---
@@ -151,6 +310,7 @@ async def delete_memory_endpoint(memory_id: uuid.UUID):
         deleted = await delete_memory(db, memory_id)
     if not deleted:
         raise HTTPException(status_code=404, detail="Memory not found")
+    await memory_cache.invalidate()
     return {"ok": True}
 
 
@@ -201,7 +361,24 @@ async def list_parking_signs():
 
 
 @app.websocket("/ws/{session_id}")
-async def websocket_endpoint(websocket: WebSocket, session_id: uuid.UUID):
+async def websocket_endpoint(
+    websocket: WebSocket, session_id: uuid.UUID, since: str | None = None
+):
+    """Chat socket for one session.
+
+    ``since`` is the ``updated_at`` of the newest entry the client already has.
+    When given, every entry created or updated from that point on is replayed
+    (followed by a ``resume_complete`` message) before live streaming starts,
+    so a reconnect costs only what was missed.
+    """
+    since_dt = None
+    if since is not None:
+        try:
+            since_dt = naive_utc(datetime.fromisoformat(since))
+        except ValueError:
+            await websocket.close(code=4400, reason="Invalid since cursor")
+            return
+
     async with get_db() as db:
         session = await get_session(db, session_id)
         if not session:
@@ -211,12 +388,22 @@ async def websocket_endpoint(websocket: WebSocket, session_id: uuid.UUID):
     await websocket.accept()
 
     slot = get_or_create_slot(session_id)
+    if since_dt is not None:
+        begin_replay(session_id)
     set_websocket(session_id, websocket)
     worker_task = asyncio.create_task(run_worker(session_id, slot.queue))
 
     try:
+        if since_dt is not None:
+            async with get_db() as db:
+                missed = await get_session_entries_since(db, session_id, since_dt)
+            for entry in missed:
+                await wire.send(websocket, entry_frame(entry))
+            await wire.send(websocket, {"type": "resume_complete", "replayed": len(missed)})
+            await finish_replay(session_id)
+
         while True:
-            raw = await websocket.receive_json()
+            raw = wire.loads(await websocket.receive_text())
             msg = InboundWSMessage(**raw)
 
             uploaded_file_id = None
@@ -233,5 +420,6 @@ async def websocket_endpoint(websocket: WebSocket, session_id: uuid.UUID):
         logger.info("WebSocket disconnected for session %s", session_id)
     finally:
         worker_task.cancel()
+        tracing.end_turn(session_id, disconnected=True)
         set_websocket(session_id, None)
         remove_slot(session_id)
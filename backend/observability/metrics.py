@@ -0,0 +1,128 @@
+"""Prometheus metrics, served at /metrics.
+
+Durations come from finished tracing spans, so instrumented code is timed
+once: tool runs (``tool.*``), LLM calls (``llm.call``/``llm.stream``, with
+time to first token) and DB transactions (``db.transaction``). Session slots,
+queue depths and the in-process counters of the memory cache, memory dedup
+and LLM cassettes are read at scrape time by a collector, so they cost
+nothing between scrapes.
+"""
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, REGISTRY
+
+from observability import tracing
+from observability.tracing import Span
+
+_FAST_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+_SLOW_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0, 120.0)
+
+TOOL_SECONDS = Histogram(
+    "towd_tool_duration_seconds", "Tool run time", ["tool_name", "status"], buckets=_SLOW_BUCKETS
+)
+LLM_SECONDS = Histogram(
+    "towd_llm_duration_seconds", "LLM call time, to the end of the stream",
+    ["agent", "mode", "effort"], buckets=_SLOW_BUCKETS,
+)
+LLM_TTFT_SECONDS = Histogram(
+    "towd_llm_time_to_first_token_seconds", "Time to the first streamed event",
+    ["agent"], buckets=_SLOW_BUCKETS,
+)
+DB_TRANSACTION_SECONDS = Histogram(
+    "towd_db_transaction_seconds", "get_db() block time including commit", buckets=_FAST_BUCKETS
+)
+WS_SEND_SECONDS = Histogram(
+    "towd_websocket_send_seconds", "Time to send one message to a client", buckets=_FAST_BUCKETS
+)
+LLM_QUEUE_WAIT_SECONDS = Histogram(
+    "towd_llm_queue_wait_seconds", "Time an LLM request waited for a scheduler slot",
+    ["lane"], buckets=_SLOW_BUCKETS,
+)
+LLM_RETRIES = Counter(
+    "towd_llm_retries_total", "LLM requests retried after a transient failure", ["agent", "error"]
+)
+FAILED_ENTRIES = Counter(
+    "towd_failed_entries_total", "Tool call entries that ended failed", ["tool_name"]
+)
+
+
+def _observe_span(span: Span) -> None:
+    name = span.name
+    duration = span.end - span.start
+    if name.startswith("tool."):
+        TOOL_SECONDS.labels(name[5:], "error" if span.error else "ok").observe(duration)
+    elif name in ("llm.call", "llm.stream"):
+        agent = span.attributes.get("agent", "orchestrator")
+        effort = span.attributes.get("effort") or "unknown"
+        LLM_SECONDS.labels(agent, name[4:], effort).observe(duration)
+        ttft_ms = span.attributes.get("ttft_ms")
+        if ttft_ms is not None:
+            LLM_TTFT_SECONDS.labels(agent).observe(ttft_ms / 1000)
+    elif name == "db.transaction":
+        DB_TRANSACTION_SECONDS.observe(duration)
+
+
+tracing.add_finish_hook(_observe_span)
+
+
+class _RuntimeCollector:
+    """Gauges and counters computed from process state at scrape time."""
+
+    def describe(self):
+        # Keeps register() from calling collect() while modules are still importing
+        return []
+
+    def collect(self):
+        from agent import cassette, memory_cache
+        from agent.llm_scheduler import scheduler
+        from agent.subagents import memory_manager
+        from worker import registry
+
+        slots = registry.active_slots()
+        yield GaugeMetricFamily("towd_session_slots", "Sessions with a live slot", value=len(slots))
+        depth = GaugeMetricFamily(
+            "towd_session_queue_depth", "Entries waiting for the session worker", labels=["session_id"]
+        )
+        total = 0
+        for session_id, slot in slots.items():
+            size = slot.queue.qsize()
+            total += size
+            # Idle slots are omitted to keep the series count small
+            if size:
+                depth.add_metric([str(session_id)], size)
+        yield depth
+        yield GaugeMetricFamily("towd_queued_entries", "Entries waiting across all sessions", value=total)
+
+        lanes = GaugeMetricFamily(
+            "towd_llm_queued_requests", "LLM requests waiting for a scheduler slot", labels=["lane"]
+        )
+        for lane, count in scheduler.queued().items():
+            lanes.add_metric([lane.name.lower()], count)
+        yield lanes
+        yield GaugeMetricFamily(
+            "towd_llm_in_flight_requests", "LLM requests holding a scheduler slot", value=scheduler.in_flight
+        )
+
+        yield _counters("towd_memory_cache", "Memory cache", memory_cache.stats)
+        yield _counters("towd_memory_manager", "Memory manager runs", memory_manager.stats)
+        yield CounterMetricFamily(
+            "towd_memory_manager_llm_calls_saved",
+            "LLM calls avoided by skipping already-known memories",
+            value=memory_manager.llm_calls_saved(),
+        )
+        yield _counters("towd_llm_cassette", "LLM cassette lookups", cassette.stats)
+
+
+def _counters(name: str, documentation: str, stats: dict) -> CounterMetricFamily:
+    family = CounterMetricFamily(name, documentation, labels=["event"])
+    for event, value in stats.items():
+        family.add_metric([event], value)
+    return family
+
+
+REGISTRY.register(_RuntimeCollector())
+
+
+def render() -> tuple[bytes, str]:
+    """The exposition body and its content type."""
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -0,0 +1,364 @@
+"""Spans for agent turns, kept per session and optionally exported over OTLP.
+
+A span is opened with ``span()`` (or the ``traced()`` decorator) and becomes
+the parent of spans opened inside it, including in tasks created from inside
+it, through a context variable. A turn is the root span from a user message
+to ``turn_complete``. Work that resumes in another task without a span in
+its context (the session worker, a continuation) attaches to its session's
+active turn, so one turn is one trace however many tasks it hops through.
+
+Turn spans are kept in a bounded in-memory buffer per session for
+/api/sessions/{id}/timeline. When OTEL_EXPORTER_OTLP_ENDPOINT is set and the
+OpenTelemetry SDK and OTLP/HTTP exporter are installed, every span is also
+exported to that collector.
+"""
+
+import functools
+import logging
+import secrets
+import time
+from collections import OrderedDict, deque
+from collections.abc import Callable
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+TURN = "turn"
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str
+    parent_id: str | None
+    session_id: str | None
+    start: float
+    end: float | None = None
+    attributes: dict = field(default_factory=dict)
+    error: bool = False
+    span_id: str = field(default_factory=lambda: secrets.token_hex(8))
+    otel: object = field(default=None, repr=False)
+
+    def set(self, **attributes) -> None:
+        self.attributes.update(attributes)
+        if self.otel is not None:
+            self.otel.set_attributes(_otel_attributes(attributes))
+
+    def finish(self, end: float | None = None, error: bool = False) -> None:
+        if self.end is not None:
+            return
+        self.end = time.time() if end is None else end
+        self.error = self.error or error
+        if self.otel is not None:
+            if self.error:
+                from opentelemetry.trace import Status, StatusCode
+
+                self.otel.set_status(Status(StatusCode.ERROR))
+            self.otel.end(end_time=int(self.end * 1e9))
+        for hook in _finish_hooks:
+            hook(self)
+
+
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+_current_session: ContextVar[str | None] = ContextVar("current_session", default=None)
+
+# session_id -> open turn span
+_active_turns: dict[str, Span] = {}
+# session_id -> spans of its recent turns, least recently used session first
+_buffers: OrderedDict[str, deque[Span]] = OrderedDict()
+# entry_id -> time it was queued for the session worker
+_enqueued: dict[str, float] = {}
+# Called with every finished span, e.g. to feed metrics
+_finish_hooks: list[Callable[[Span], None]] = []
+
+_otel_tracer = None
+_otel_provider = None
+
+
+# --- Recording ---
+
+
+def add_finish_hook(hook: Callable[[Span], None]) -> None:
+    _finish_hooks.append(hook)
+
+
+def current_span() -> Span | None:
+    return _current_span.get()
+
+
+def bind_session(session_id) -> None:
+    """Attach parentless spans in this context (and its tasks) to the session's turn."""
+    _current_session.set(str(session_id))
+
+
+def start_span(name: str, start: float | None = None, **attributes) -> Span:
+    """Open a span without making it current; the caller must ``finish()`` it."""
+    parent = _current_span.get()
+    session_id = parent.session_id if parent else _current_session.get()
+    if parent is None and session_id:
+        parent = _active_turns.get(session_id)
+    return _new_span(name, parent, session_id, start, attributes)
+
+
+def _new_span(
+    name: str, parent: Span | None, session_id: str | None, start: float | None, attributes: dict
+) -> Span:
+    span = Span(
+        name=name,
+        trace_id=parent.trace_id if parent else secrets.token_hex(16),
+        parent_id=parent.span_id if parent else None,
+        session_id=session_id,
+        start=time.time() if start is None else start,
+        attributes=attributes,
+    )
+    # Only spans that belong to a turn are kept for the timeline
+    if session_id and (parent is not None or name == TURN):
+        _buffer(session_id).append(span)
+    if _otel_tracer is not None:
+        span.otel = _start_otel(span, parent)
+    return span
+
+
+@contextmanager
+def span(name: str, **attributes):
+    s = start_span(name, **attributes)
+    token = _current_span.set(s)
+    try:
+        yield s
+    except BaseException:
+        s.finish(error=True)
+        raise
+    finally:
+        _current_span.reset(token)
+        s.finish()
+
+
+def traced(name: str):
+    """Decorator: run an async function inside a span."""
+
+    def decorator(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            with span(name):
+                return await fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def record(name: str, start: float, end: float | None = None, **attributes) -> Span:
+    """Record an already finished span, e.g. time spent waiting in a queue."""
+    s = start_span(name, start=start, **attributes)
+    s.finish(end)
+    return s
+
+
+def start_turn(session_id, **attributes) -> Span:
+    """Open the root span of a new turn for the session."""
+    key = str(session_id)
+    previous = _active_turns.pop(key, None)
+    if previous is not None:
+        previous.set(abandoned=True)
+        previous.finish()
+    bind_session(key)
+    turn = _new_span(TURN, None, key, None, attributes)
+    _active_turns[key] = turn
+    return turn
+
+
+def end_turn(session_id, **attributes) -> None:
+    turn = _active_turns.pop(str(session_id), None)
+    if turn is not None:
+        turn.set(**attributes)
+        turn.finish()
+
+
+def mark_enqueued(key) -> None:
+    _enqueued[str(key)] = time.time()
+
+
+def take_enqueued(key) -> float | None:
+    return _enqueued.pop(str(key), None)
+
+
+def _buffer(session_id: str) -> deque[Span]:
+    buffer = _buffers.get(session_id)
+    if buffer is None:
+        buffer = _buffers[session_id] = deque(maxlen=settings.TRACE_SPANS_PER_SESSION)
+        while len(_buffers) > settings.TRACE_SESSIONS:
+            _buffers.popitem(last=False)
+    else:
+        _buffers.move_to_end(session_id)
+    return buffer
+
+
+def session_spans(session_id) -> list[Span]:
+    return list(_buffers.get(str(session_id), ()))
+
+
+# --- Timeline ---
+
+
+def critical_path(spans: list[Span], root: Span, now: float | None = None) -> list[dict]:
+    """The chain of spans that determined when ``root`` finished.
+
+    Walks back from the root's end: at each level the child that finished
+    last before the cursor is on the path, and time not covered by any child
+    is the span's own. A span's children may outlive it (a continuation task
+    started from a worker span), so a span reaches as far as its latest
+    descendant. Returns segments in time order, offsets relative to the root.
+    """
+    now = time.time() if now is None else now
+    children: dict[str, list[Span]] = {}
+    for s in spans:
+        if s.parent_id:
+            children.setdefault(s.parent_id, []).append(s)
+
+    reach_cache: dict[str, float] = {}
+
+    def reach(s: Span) -> float:
+        if s.span_id not in reach_cache:
+            end = s.end if s.end is not None else now
+            reach_cache[s.span_id] = max([end, *(reach(c) for c in children.get(s.span_id, ()))])
+        return reach_cache[s.span_id]
+
+    # Collected latest-first
+    segments: list[tuple[Span, float, float]] = []
+
+    def walk(s: Span, limit: float) -> None:
+        cursor = min(reach(s), limit)
+        for child in sorted(children.get(s.span_id, ()), key=reach, reverse=True):
+            if cursor <= s.start:
+                break
+            if child.start >= cursor:
+                continue
+            child_end = min(reach(child), cursor)
+            if child_end < cursor:
+                segments.append((s, child_end, cursor))
+            walk(child, child_end)
+            cursor = child.start
+        if cursor > s.start:
+            segments.append((s, s.start, cursor))
+
+    walk(root, root.end if root.end is not None else now)
+
+    path: list[dict] = []
+    for s, start, end in reversed(segments):
+        if path and path[-1]["span_id"] == s.span_id:
+            path[-1]["duration_ms"] = round((end - root.start) * 1000, 1) - path[-1]["offset_ms"]
+            continue
+        path.append({
+            "name": s.name,
+            "span_id": s.span_id,
+            "offset_ms": round((start - root.start) * 1000, 1),
+            "duration_ms": round((end - start) * 1000, 1),
+            "attributes": s.attributes,
+        })
+    return [p for p in path if p["duration_ms"] > 0]
+
+
+def timeline(session_id) -> list[dict]:
+    """Buffered turns of a session, oldest first, each with its critical path."""
+    now = time.time()
+    by_trace: dict[str, list[Span]] = {}
+    for s in session_spans(session_id):
+        by_trace.setdefault(s.trace_id, []).append(s)
+
+    turns = []
+    for spans in by_trace.values():
+        root = next((s for s in spans if s.name == TURN and s.parent_id is None), None)
+        if root is None:
+            continue
+        path = critical_path(spans, root, now)
+        breakdown: dict[str, float] = {}
+        for segment in path:
+            breakdown[segment["name"]] = round(breakdown.get(segment["name"], 0) + segment["duration_ms"], 1)
+        turns.append({
+            "trace_id": root.trace_id,
+            "started_at": datetime.fromtimestamp(root.start, timezone.utc).isoformat(),
+            "duration_ms": round(((root.end or now) - root.start) * 1000, 1),
+            "complete": root.end is not None,
+            "attributes": root.attributes,
+            "critical_path": path,
+            "breakdown": dict(sorted(breakdown.items(), key=lambda kv: kv[1], reverse=True)),
+            "spans": [
+                {
+                    "name": s.name,
+                    "span_id": s.span_id,
+                    "parent_id": s.parent_id,
+                    "offset_ms": round((s.start - root.start) * 1000, 1),
+                    "duration_ms": round(((s.end or now) - s.start) * 1000, 1),
+                    "error": s.error,
+                    "attributes": s.attributes,
+                }
+                for s in sorted(spans, key=lambda s: s.start)
+            ],
+        })
+    return turns
+
+
+# --- OpenTelemetry export ---
+
+
+def setup() -> None:
+    """Start exporting spans if OTEL_EXPORTER_OTLP_ENDPOINT is configured."""
+    global _otel_tracer, _otel_provider
+    endpoint = settings.OTEL_EXPORTER_OTLP_ENDPOINT
+    if not endpoint:
+        return
+    try:
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    except ImportError:
+        logger.warning(
+            "OTEL_EXPORTER_OTLP_ENDPOINT is set but opentelemetry-sdk and "
+            "opentelemetry-exporter-otlp-proto-http are not installed; spans stay local"
+        )
+        return
+    _otel_provider = TracerProvider(resource=Resource.create({"service.name": settings.OTEL_SERVICE_NAME}))
+    _otel_provider.add_span_processor(
+        BatchSpanProcessor(OTLPSpanExporter(endpoint=f"{endpoint.rstrip('/')}/v1/traces"))
+    )
+    _otel_tracer = _otel_provider.get_tracer("towdyouso")
+    logger.info("Exporting traces to %s", endpoint)
+
+
+def shutdown() -> None:
+    """Flush exported spans."""
+    global _otel_tracer, _otel_provider
+    if _otel_provider is not None:
+        _otel_provider.shutdown()
+    _otel_tracer = _otel_provider = None
+
+
+def _start_otel(span: Span, parent: Span | None):
+    from opentelemetry import trace
+
+    context = None
+    if parent is not None and parent.otel is not None:
+        context = trace.set_span_in_context(parent.otel)
+    attributes = dict(span.attributes)
+    if span.session_id:
+        attributes["session.id"] = span.session_id
+    return _otel_tracer.start_span(
+        span.name,
+        context=context,
+        start_time=int(span.start * 1e9),
+        attributes=_otel_attributes(attributes),
+    )
+
+
+def _otel_attributes(attributes: dict) -> dict:
+    return {
+        key: value if isinstance(value, (str, bool, int, float)) else str(value)
+        for key, value in attributes.items()
+        if value is not None
+    }
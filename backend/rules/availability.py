@@ -0,0 +1,85 @@
+"""Weekly availability bitmaps for "where can I park from T1 to T2" searches.
+
+A week is cut into 672 fifteen-minute slots (Monday 00:00 is slot 0). Each
+sign gets two masks as Python ints: ``forbidden`` has a bit set for every
+slot touched by a no-parking / no-stopping / street-cleaning rule, and
+``limited`` for every slot under a time limit. A time window becomes a mask
+the same way, so checking a candidate is two ANDs and a popcount.
+
+The masks are deliberately conservative: partial slots count as restricted,
+nth-weekday street cleaning is treated as every week, and permit exemptions
+are ignored. Ambiguous schedules get no masks at all.
+"""
+
+from datetime import datetime
+
+from rules.compiler import MINUTES_PER_DAY, PROHIBITIVE_KINDS, TIME_LIMIT
+
+SLOT_MINUTES = 15
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+SLOTS_PER_WEEK = MINUTES_PER_WEEK // SLOT_MINUTES
+FULL_WEEK = (1 << SLOTS_PER_WEEK) - 1
+
+
+def _span_mask(start_minute: int, end_minute: int) -> int:
+    """Slots touched by [start_minute, end_minute) in minutes-of-week, wrapping."""
+    length = end_minute - start_minute
+    if length <= 0:
+        return 0
+    if length >= MINUTES_PER_WEEK:
+        return FULL_WEEK
+    first = start_minute // SLOT_MINUTES
+    count = -(-(start_minute + length) // SLOT_MINUTES) - first
+    bits = ((1 << count) - 1) << (first % SLOTS_PER_WEEK)
+    # Fold anything past Sunday midnight back onto Monday
+    return (bits | (bits >> SLOTS_PER_WEEK)) & FULL_WEEK
+
+
+def _rule_mask(rule: dict) -> int:
+    end = rule["end"] if rule["end"] > rule["start"] else rule["end"] + MINUTES_PER_DAY
+    mask = 0
+    for day in rule["days"]:
+        offset = day * MINUTES_PER_DAY
+        mask |= _span_mask(offset + rule["start"], offset + end)
+    return mask
+
+
+def schedule_masks(schedule: dict) -> tuple[int, int, int | None] | None:
+    """(forbidden, limited, shortest limit in minutes), or None if ambiguous."""
+    if schedule["ambiguous"]:
+        return None
+    forbidden = limited = 0
+    limit_minutes = None
+    for rule in schedule["rules"]:
+        if rule["kind"] in PROHIBITIVE_KINDS:
+            forbidden |= _rule_mask(rule)
+        elif rule["kind"] == TIME_LIMIT:
+            limited |= _rule_mask(rule)
+            if limit_minutes is None or rule["limit_minutes"] < limit_minutes:
+                limit_minutes = rule["limit_minutes"]
+    return forbidden, limited, limit_minutes
+
+
+def window_mask(start: datetime, end: datetime) -> int:
+    """Slots covered by a local-time window."""
+    start_minute = start.weekday() * MINUTES_PER_DAY + start.hour * 60 + start.minute
+    length = int((end - start).total_seconds() // 60)
+    return _span_mask(start_minute, start_minute + length)
+
+
+def is_available(forbidden: int, limited: int, limit_minutes: int | None, window: int) -> bool:
+    """Legal for the whole window: no forbidden slot, and limited time within the limit."""
+    if forbidden & window:
+        return False
+    overlap = limited & window
+    if not overlap:
+        return True
+    return limit_minutes is not None and overlap.bit_count() * SLOT_MINUTES <= limit_minutes
+
+
+def to_hex(mask: int) -> str:
+    return format(mask, "x")
+
+
+def from_hex(value: str) -> int:
+    return int(value, 16)
@@ -0,0 +1,299 @@
+"""Compile OCR'd parking sign text into a structured weekly schedule.
+
+The text is split into clauses, each starting at a restriction keyword
+("NO PARKING", "2 HOUR PARKING", "STREET CLEANING", ...). Each clause's time
+ranges and day specs become rules of the form::
+
+    {"kind": "no_parking", "days": [0, 1, 2, 3, 4], "weeks": None,
+     "start": 420, "end": 540, "limit_minutes": None, "tow_away": True,
+     "permit_exempt": [], "text": "NO PARKING 7AM-9AM MON-FRI TOW-AWAY"}
+
+``days`` use Python weekday numbers (Monday is 0), ``start``/``end`` are
+minutes after midnight, and an ``end`` at or before ``start`` runs past
+midnight. ``weeks`` restricts a rule to the nth weekday of the month
+("1ST & 3RD TUESDAY"). Anything the compiler can't pin down is listed in
+``unparsed`` and marks the whole schedule ``ambiguous``, in which case the
+sign text has to be read by the LLM.
+"""
+
+import re
+
+SCHEMA_VERSION = 1
+
+NO_PARKING = "no_parking"
+NO_STOPPING = "no_stopping"
+STREET_CLEANING = "street_cleaning"
+TIME_LIMIT = "time_limit"
+
+# Kinds during which a vehicle may not be left at all
+PROHIBITIVE_KINDS = frozenset({NO_PARKING, NO_STOPPING, STREET_CLEANING})
+
+ALL_DAYS = tuple(range(7))
+MINUTES_PER_DAY = 24 * 60
+
+_DAY = (
+    r"(?:mon(?:day)?|tue(?:s(?:day)?)?|wed(?:nesday)?|thu(?:r(?:s(?:day)?)?)?"
+    r"|fri(?:day)?|sat(?:urday)?|sun(?:day)?)s?\.?"
+)
+_DAY_INDEX = {"mon": 0, "tue": 1, "wed": 2, "thu": 3, "fri": 4, "sat": 5, "sun": 6}
+
+_TIME = r"(?:\d{1,2}(?::\d{2})?\s*(?:[ap]\.?\s?m\.?)?|noon|midnight)"
+_RANGE_SEP = r"\s*(?:-|–|—|to|thru|through|until)\s*"
+
+_TIME_RANGE_RE = re.compile(
+    rf"(?<![\d:])(?P<a>{_TIME}){_RANGE_SEP}(?P<b>{_TIME})(?![\d:])", re.IGNORECASE
+)
+_TIME_PART_RE = re.compile(
+    r"^(?:(?P<h>\d{1,2})(?::(?P<m>\d{2}))?\s*(?P<ampm>[ap])?\.?\s?m?\.?|(?P<word>noon|midnight))$",
+    re.IGNORECASE,
+)
+_DAY_SPEC_RE = re.compile(
+    rf"\b(?:(?P<ord>(?:[1-5](?:st|nd|rd|th)\s*(?:,|&|and)?\s*)+))?"
+    rf"(?P<a>{_DAY})(?:{_RANGE_SEP}(?P<b>{_DAY}))?(?![a-z])"
+    r"|\b(?P<word>daily|every\s?day|weekdays|weekends)\b",
+    re.IGNORECASE,
+)
+_ORDINAL_RE = re.compile(r"([1-5])(?:st|nd|rd|th)", re.IGNORECASE)
+_ANYTIME_RE = re.compile(r"\b(?:any\s?time|at\s+all\s+times|24\s*(?:hours|hrs))\b", re.IGNORECASE)
+_EXCEPT_RE = re.compile(r"\bexcept\b", re.IGNORECASE)
+_TOW_RE = re.compile(r"\btow(?:[- ]?away|ed)?\b", re.IGNORECASE)
+_PERMIT_RE = re.compile(r"\bpermits?\b", re.IGNORECASE)
+_PERMIT_AREA_RE = re.compile(r"\b(?:area|zone|district)\s+([a-z0-9]{1,3})\b", re.IGNORECASE)
+_UNSUPPORTED_RE = re.compile(
+    r"\b(?:loading|commercial|passenger|meter(?:ed)?|pay\s+at|bus\s+zone|taxi|"
+    r"permit\s+parking\s+only|disabled|handicap)\b",
+    re.IGNORECASE,
+)
+
+_WORD_NUMBERS = {"one": 1, "two": 2, "three": 3, "four": 4}
+_CLAUSE_RE = re.compile(
+    r"(?:tow[- ]?away\s+)?"
+    r"(?:(?P<street>street\s+(?:cleaning|sweeping))"
+    r"|(?P<stop>no\s+(?:stopping|standing))"
+    r"|(?P<park>no\s+parking)"
+    r"|(?P<limit>(?P<n>\d{1,3}|one|two|three|four)\s*[- ]?\s*"
+    r"(?P<unit>hours?|hrs?|minutes?|mins?)\b(?:\s+(?:parking|limit))?))",
+    re.IGNORECASE,
+)
+
+
+class _Clause:
+    def __init__(self, kind: str, text: str, limit_minutes: int | None):
+        self.kind = kind
+        self.text = text
+        self.limit_minutes = limit_minutes
+
+
+def _parse_time(text: str) -> tuple[int, str | None] | None:
+    match = _TIME_PART_RE.match(text.strip())
+    if not match:
+        return None
+    if match.group("word"):
+        return (12 * 60, "p") if match.group("word").lower() == "noon" else (0, "a")
+    hour = int(match.group("h"))
+    minute = int(match.group("m") or 0)
+    if hour > 12 or minute > 59:
+        return None
+    ampm = match.group("ampm").lower() if match.group("ampm") else None
+    return hour * 60 + minute, ampm
+
+
+def _to_minutes(base: int, ampm: str) -> int:
+    hour, minute = divmod(base, 60)
+    hour %= 12
+    if ampm == "p":
+        hour += 12
+    return hour * 60 + minute
+
+
+def _parse_range(a: str, b: str) -> tuple[int, int] | None:
+    """Minutes after midnight for "8AM"-"6PM"; a missing meridiem is inferred."""
+    start, end = _parse_time(a), _parse_time(b)
+    if start is None or end is None:
+        return None
+    (start_base, start_ampm), (end_base, end_ampm) = start, end
+    if a.strip().lower() == "midnight":
+        start_ampm = "a"
+    if end_ampm is None and start_ampm is None:
+        return None
+    if start_ampm is None:
+        # "7-9AM" is 7AM-9AM; "10-2PM" is 10AM-2PM
+        start_ampm = end_ampm
+        if _to_minutes(start_base, start_ampm) >= _to_minutes(end_base, end_ampm):
+            start_ampm = "a" if end_ampm == "p" else "p"
+    elif end_ampm is None:
+        end_ampm = start_ampm
+    start_min = _to_minutes(start_base, start_ampm)
+    end_min = _to_minutes(end_base, end_ampm)
+    if end_min == 0 or b.strip().lower() == "midnight":
+        end_min = MINUTES_PER_DAY
+    return start_min, end_min
+
+
+def _day_set(match: re.Match) -> tuple[tuple[int, ...], tuple[int, ...] | None]:
+    word = match.group("word")
+    if word:
+        word = word.lower().replace(" ", "")
+        if word == "weekdays":
+            return tuple(range(5)), None
+        if word == "weekends":
+            return (5, 6), None
+        return ALL_DAYS, None
+    first = _DAY_INDEX[match.group("a")[:3].lower()]
+    if match.group("b"):
+        last = _DAY_INDEX[match.group("b")[:3].lower()]
+        days = tuple((first + i) % 7 for i in range((last - first) % 7 + 1))
+    else:
+        days = (first,)
+    weeks = None
+    if match.group("ord"):
+        weeks = tuple(sorted({int(n) for n in _ORDINAL_RE.findall(match.group("ord"))}))
+    return days, weeks
+
+
+def _split_clauses(text: str) -> tuple[str, list[_Clause]]:
+    """Split on restriction keywords; returns (preamble, clauses)."""
+    matches = list(_CLAUSE_RE.finditer(text))
+    clauses = []
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        limit_minutes = None
+        if match.group("street"):
+            kind = STREET_CLEANING
+        elif match.group("stop"):
+            kind = NO_STOPPING
+        elif match.group("park"):
+            kind = NO_PARKING
+        else:
+            # "2 HOUR" on its own could be part of a range like "2 HOUR TOW ZONE";
+            # only treat it as a limit when the sign talks about parking
+            if not re.search(r"\b(?:parking|limit)\b", text, re.IGNORECASE):
+                continue
+            kind = TIME_LIMIT
+            n = match.group("n").lower()
+            amount = _WORD_NUMBERS.get(n) or int(n)
+            limit_minutes = amount * 60 if match.group("unit").lower().startswith("h") else amount
+        clauses.append(_Clause(kind, text[match.start():end].strip(), limit_minutes))
+
+    # "NO PARKING 12AM-6AM TUE STREET CLEANING" is one restriction, not two
+    merged: list[_Clause] = []
+    for clause in clauses:
+        previous = merged[-1] if merged else None
+        if previous and {previous.kind, clause.kind} == {NO_PARKING, STREET_CLEANING} and (
+            not _has_schedule(previous.text) or not _has_schedule(clause.text)
+        ):
+            previous.kind = STREET_CLEANING
+            previous.text = f"{previous.text} {clause.text}"
+        else:
+            merged.append(clause)
+
+    preamble = text[: matches[0].start()].strip() if matches else text.strip()
+    return preamble, merged
+
+
+def _has_schedule(text: str) -> bool:
+    return bool(_TIME_RANGE_RE.search(text) or _DAY_SPEC_RE.search(text))
+
+
+def _compile_clause(clause: _Clause, context: str) -> list[dict] | None:
+    """Rules for one clause, or None when its schedule can't be determined."""
+    body = context
+    except_at = _EXCEPT_RE.search(body)
+    included_text = body[: except_at.start()] if except_at else body
+    excluded_text = body[except_at.start():] if except_at else ""
+
+    # Time ranges and day specs in order of appearance, grouped into
+    # (times, days) schedules: "8AM-6PM MON-FRI 8AM-12PM SAT" is two groups.
+    items = [("t", m.start(), m) for m in _TIME_RANGE_RE.finditer(included_text)]
+    items += [("d", m.start(), m) for m in _DAY_SPEC_RE.finditer(included_text)]
+    items.sort(key=lambda item: item[1])
+
+    groups: list[dict] = []
+    for item_type, _pos, match in items:
+        group = groups[-1] if groups else None
+        if group is None or (group["times"] and group["days"] and group["first"] == item_type):
+            group = {"first": item_type, "times": [], "days": [], "weeks": None}
+            groups.append(group)
+        if item_type == "t":
+            span = _parse_range(match.group("a"), match.group("b"))
+            if span is None:
+                return None
+            group["times"].append(span)
+        else:
+            days, weeks = _day_set(match)
+            group["days"].extend(days)
+            if weeks:
+                group["weeks"] = weeks
+
+    excluded = set()
+    for match in _DAY_SPEC_RE.finditer(excluded_text):
+        excluded.update(_day_set(match)[0])
+
+    anytime = bool(_ANYTIME_RE.search(body))
+    if not groups:
+        if not anytime:
+            return None
+        groups = [{"times": [], "days": [], "weeks": None}]
+    if len(groups) > 1 and any(not g["days"] for g in groups):
+        return None
+
+    permit_exempt: list[str] = []
+    if except_at and _PERMIT_RE.search(excluded_text):
+        permit_exempt = sorted({a.upper() for a in _PERMIT_AREA_RE.findall(excluded_text)})
+        if not permit_exempt:
+            return None
+
+    tow_away = bool(_TOW_RE.search(body))
+    rules = []
+    for group in groups:
+        times = group["times"] or ([(0, MINUTES_PER_DAY)] if anytime else [])
+        if not times:
+            return None
+        days = sorted(set(group["days"] or ALL_DAYS) - excluded)
+        for start, end in times:
+            rules.append({
+                "kind": clause.kind,
+                "days": days,
+                "weeks": list(group["weeks"]) if group["weeks"] else None,
+                "start": start,
+                "end": end,
+                "limit_minutes": clause.limit_minutes,
+                "tow_away": tow_away,
+                "permit_exempt": permit_exempt,
+                "text": clause.text,
+            })
+    return rules
+
+
+def compile_sign_text(text: str) -> dict:
+    """Compile sign text (OCR parts separated by blank lines) to a schedule."""
+    flat = " ".join(text.split())
+    preamble, clauses = _split_clauses(flat)
+
+    unparsed: list[str] = []
+    if _UNSUPPORTED_RE.search(flat):
+        unparsed.append(flat)
+
+    contexts = [c.text for c in clauses]
+    if preamble and (_has_schedule(preamble) or _EXCEPT_RE.search(preamble)):
+        # OCR can return the schedule before the restriction it belongs to;
+        # that's only safe to reattach when there is a single restriction.
+        if len(clauses) == 1:
+            contexts = [flat]
+        elif not unparsed:
+            unparsed.append(preamble)
+
+    rules: list[dict] = []
+    for clause, context in zip(clauses, contexts):
+        compiled = _compile_clause(clause, context)
+        if compiled is None:
+            unparsed.append(clause.text)
+        else:
+            rules.extend(compiled)
+
+    return {
+        "version": SCHEMA_VERSION,
+        "rules": rules,
+        "ambiguous": bool(unparsed) or (not rules and bool(flat)),
+        "unparsed": unparsed,
+    }
@@ -0,0 +1,118 @@
+"""Evaluate a compiled sign schedule against a time or time window.
+
+Pure and allocation-light: a check walks the few rules on a sign over the
+days the window touches, so it runs in microseconds without any LLM call.
+Times are local wall-clock times at the sign.
+"""
+
+from datetime import date, datetime, time, timedelta
+
+from rules.compiler import MINUTES_PER_DAY, PROHIBITIVE_KINDS, TIME_LIMIT
+
+# How far ahead to look for the next restriction on a point query
+_LOOKAHEAD_DAYS = 7
+
+
+def _week_of_month(day: date) -> int:
+    return (day.day - 1) // 7 + 1
+
+
+def _occurrences(rule: dict, first_day: date, last_day: date):
+    """(start, end) datetimes of the rule on each day in [first_day, last_day]."""
+    day = first_day
+    while day <= last_day:
+        if day.weekday() in rule["days"] and (
+            not rule["weeks"] or _week_of_month(day) in rule["weeks"]
+        ):
+            start = datetime.combine(day, time()) + timedelta(minutes=rule["start"])
+            end_minutes = rule["end"]
+            if end_minutes <= rule["start"]:
+                end_minutes += MINUTES_PER_DAY
+            yield start, datetime.combine(day, time()) + timedelta(minutes=end_minutes)
+        day += timedelta(days=1)
+
+
+def _is_exempt(rule: dict, permits: set[str]) -> bool:
+    return bool(permits) and any(p in permits for p in rule["permit_exempt"])
+
+
+def _restriction(rule: dict, start: datetime, end: datetime) -> dict:
+    return {
+        "kind": rule["kind"],
+        "text": rule["text"],
+        "from": start.isoformat(),
+        "to": end.isoformat(),
+        "tow_away": rule["tow_away"],
+    }
+
+
+def evaluate(
+    schedule: dict,
+    start: datetime,
+    end: datetime | None = None,
+    permits: list[str] | tuple[str, ...] = (),
+) -> dict:
+    """Can a vehicle be parked from ``start`` until ``end``?
+
+    Without ``end`` this checks the single moment ``start`` and also reports
+    the next restriction coming up. Rules the given permit areas are exempt
+    from are ignored. ``can_park`` only reflects the parsed rules; when the
+    schedule is ``ambiguous`` the sign text must be checked as well.
+    """
+    start = start.replace(tzinfo=None)
+    point_query = end is None
+    end = start + timedelta(minutes=1) if point_query else end.replace(tzinfo=None)
+    permit_set = {p.upper() for p in permits}
+
+    blocking: list[dict] = []
+    limit_minutes = None
+    move_by = None
+    for rule in schedule["rules"]:
+        if _is_exempt(rule, permit_set):
+            continue
+        # A rule that starts the day before can run past midnight into the window
+        for occ_start, occ_end in _occurrences(
+            rule, start.date() - timedelta(days=1), end.date()
+        ):
+            if occ_start >= end or occ_end <= start:
+                continue
+            if rule["kind"] in PROHIBITIVE_KINDS:
+                blocking.append(_restriction(rule, occ_start, occ_end))
+            elif rule["kind"] == TIME_LIMIT:
+                limit = rule["limit_minutes"]
+                arrive = max(start, occ_start)
+                deadline = min(arrive + timedelta(minutes=limit), occ_end)
+                if not point_query and min(end, occ_end) > deadline:
+                    blocking.append(_restriction(rule, occ_start, occ_end))
+                if limit_minutes is None or limit < limit_minutes:
+                    limit_minutes = limit
+                if deadline < occ_end and (move_by is None or deadline < move_by):
+                    move_by = deadline
+
+    result = {
+        "can_park": not blocking,
+        "ambiguous": schedule["ambiguous"],
+        "restrictions": blocking,
+        "limit_minutes": limit_minutes,
+        "move_by": move_by.isoformat() if move_by else None,
+    }
+    if point_query and not blocking:
+        result["next_restriction"] = next_restriction(schedule, start, permit_set)
+    return result
+
+
+def next_restriction(schedule: dict, after: datetime, permits: set[str] = frozenset()) -> dict | None:
+    """The first no-parking period that starts after ``after``, within a week."""
+    best = None
+    for rule in schedule["rules"]:
+        if rule["kind"] not in PROHIBITIVE_KINDS or _is_exempt(rule, permits):
+            continue
+        for occ_start, occ_end in _occurrences(
+            rule, after.date(), after.date() + timedelta(days=_LOOKAHEAD_DAYS)
+        ):
+            if occ_start > after and (best is None or occ_start < best[0]):
+                best = (occ_start, occ_end, rule)
+                break
+    if best is None:
+        return None
+    return _restriction(best[2], best[0], best[1])
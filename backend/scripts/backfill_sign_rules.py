@@ -0,0 +1,33 @@
+"""Compile rules and availability bitmaps for saved signs that predate them.
+
+Usage: python scripts/backfill_sign_rules.py [--all]
+
+By default only locations without compiled rules are updated; --all
+recompiles every location (e.g. after improving the rules compiler).
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from db.database import get_db  # noqa: E402
+from db.repository import apply_parking_sign_rules, list_parking_sign_locations  # noqa: E402
+from rules.compiler import compile_sign_text  # noqa: E402
+
+
+async def main(recompile_all: bool) -> None:
+    updated = ambiguous = 0
+    async with get_db() as db:
+        for location in await list_parking_sign_locations(db):
+            if location.rules is not None and not recompile_all:
+                continue
+            apply_parking_sign_rules(location, compile_sign_text(location.sign_text))
+            updated += 1
+            ambiguous += location.forbidden_mask is None
+    print(f"Updated {updated} location(s); {ambiguous} ambiguous (no bitmaps).")
+
+
+if __name__ == "__main__":
+    asyncio.run(main("--all" in sys.argv[1:]))
@@ -0,0 +1,62 @@
+"""Export sessions and their entries as NDJSON.
+
+Usage: python scripts/export_entries.py [-o FILE] [--zstd] [--session ID ...]
+           [--kind KIND ...] [--since ISO] [--until ISO]
+
+Writes to stdout unless -o is given. Rows are streamed off a server-side
+cursor, so exports of any size run in constant memory. --zstd needs the
+zstandard package. --since/--until bound the session start time.
+"""
+
+import argparse
+import asyncio
+import sys
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from db.database import get_db  # noqa: E402
+from db.models import EntryKind  # noqa: E402
+from interface import export  # noqa: E402
+from interface.models import naive_utc  # noqa: E402
+
+
+def _naive(value: str) -> datetime:
+    return naive_utc(datetime.fromisoformat(value))
+
+
+async def main(args: argparse.Namespace) -> None:
+    compressor = export.zstd_compressor() if args.zstd else None
+    out = open(args.output, "wb") if args.output else sys.stdout.buffer
+    written = 0
+    try:
+        async with get_db() as db:
+            chunks = export.chunked(
+                export.export_lines(db, args.session, args.kind, args.since, args.until)
+            )
+            if compressor is not None:
+                chunks = export.compressed(chunks, compressor)
+            async for chunk in chunks:
+                out.write(chunk)
+                written += len(chunk)
+    finally:
+        if args.output:
+            out.close()
+    print(f"Wrote {written} bytes.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export sessions and entries as NDJSON.")
+    parser.add_argument("-o", "--output", help="output file (default: stdout)")
+    parser.add_argument("--zstd", action="store_true", help="zstd-compress the output")
+    parser.add_argument("--session", action="append", type=uuid.UUID, help="session id (repeatable)")
+    parser.add_argument("--kind", action="append", type=EntryKind, help="entry kind (repeatable)")
+    parser.add_argument("--since", type=_naive, help="sessions started at or after (ISO 8601)")
+    parser.add_argument("--until", type=_naive, help="sessions started before (ISO 8601)")
+    args = parser.parse_args()
+    try:
+        asyncio.run(main(args))
+    except export.CompressionUnavailable as e:
+        sys.exit(str(e))
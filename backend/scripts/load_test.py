@@ -0,0 +1,281 @@
+"""Concurrent-session load test against simulated OpenAI, Roboflow and Mapbox.
+
+Starts the simulators (scripts/simulators.py) in-process, launches the backend
+as a subprocess pointed at them, and runs N scripted WebSocket clients. Each
+client uploads a sign photo, asks whether it can park, saves the sign's
+location and searches nearby. Reports p50/p99 time to first token and turn
+latency per step, plus event-loop lag measured inside the backend.
+
+Requires a migrated database (DATABASE_URL as for the app) and the websockets
+package.
+
+Usage:
+    python scripts/load_test.py --sessions 50
+    python scripts/load_test.py --sessions 200 --openai-latency 600 --openai-token-ms 20 \\
+        --openai-errors 0.01 --roboflow-latency 1500 --mapbox-slow-rate 0.05
+    python scripts/load_test.py --backend http://localhost:8000   # already running backend
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+import httpx  # noqa: E402
+
+from simulators import Profile, Profiles, create_app  # noqa: E402
+
+# A tiny valid JPEG is enough: the simulated Roboflow ignores the pixels
+FAKE_JPEG = bytes.fromhex(
+    "ffd8ffe000104a46494600010100000100010000ffdb004300080606070605080707070909080a0c140d0c0b0b0c"
+    "1912130f141d1a1f1e1d1a1c1c20242e2720222c231c1c2837292c30313434341f27393d38323c2e333432ffc000"
+    "0b080001000101011100ffc4001f0000010501010101010100000000000000000102030405060708090a0bffda00"
+    "08010100003f00d2cf20ffd9"
+)
+
+STEPS = [
+    ("sign_question", "Can I park here right now?", True),
+    ("save_location", "Save it: 20th st between illinois and georgia, San Francisco", False),
+    ("nearby_search", "Where can I park near 20th and texas st, San Francisco?", False),
+]
+
+LAG_INTERVAL = 0.05
+
+
+def percentile(values: list[float], p: float) -> float:
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p * len(ordered)) - 1)]
+
+
+async def sample_loop_lag(samples: list[float], stop: asyncio.Event) -> None:
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        started = loop.time()
+        await asyncio.sleep(LAG_INTERVAL)
+        samples.append(loop.time() - started - LAG_INTERVAL)
+
+
+# --- Backend subprocess ---
+
+
+def serve_backend(port: int, lag_file: str) -> None:
+    """Entry point of the spawned backend: uvicorn plus an event-loop lag probe."""
+    import uvicorn
+
+    from main import app
+
+    async def run() -> None:
+        samples: list[float] = []
+        stop = asyncio.Event()
+        server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+        probe = asyncio.create_task(sample_loop_lag(samples, stop))
+        await server.serve()
+        stop.set()
+        await probe
+        Path(lag_file).write_text(json.dumps(samples))
+
+    asyncio.run(run())
+
+
+def spawn_backend(port: int, sim_url: str, lag_file: str, upload_dir: str) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "OPENAI_API_KEY": "sim",
+        "OPENAI_BASE_URL": f"{sim_url}/v1",
+        "ROBOFLOW_API_KEY": "sim",
+        "ROBOFLOW_WORKFLOW_URL": f"{sim_url}/roboflow",
+        "MAPBOX_ACCESS_TOKEN": "sim",
+        "MAPBOX_GEOCODE_URL": f"{sim_url}/mapbox/geocode",
+        "LLM_CASSETTE_MODE": "off",
+        "UPLOAD_DIR": upload_dir,
+    }
+    return subprocess.Popen(
+        [sys.executable, __file__, "--serve-backend", str(port), "--lag-file", lag_file],
+        cwd=Path(__file__).parent.parent,
+        env=env,
+    )
+
+
+async def wait_ready(base: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base, timeout=2) as client:
+        while time.monotonic() < deadline:
+            try:
+                (await client.get("/api/sessions", params={"limit": 1})).raise_for_status()
+                return
+            except httpx.HTTPError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError(f"Backend at {base} did not become ready")
+
+
+# --- Clients ---
+
+
+async def run_client(base: str, metrics: dict, errors: dict) -> None:
+    import websockets
+
+    async with httpx.AsyncClient(base_url=base, timeout=60) as client:
+        session_id = (await client.post("/api/sessions")).json()["session_id"]
+        upload = await client.post(
+            "/api/upload", files={"file": ("sign.jpg", FAKE_JPEG, "image/jpeg")}
+        )
+        upload.raise_for_status()
+        file_id = upload.json()["file_id"]
+
+    ws_url = base.replace("http", "ws", 1) + f"/ws/{session_id}"
+    async with websockets.connect(ws_url, max_size=None) as ws:
+        for step, content, with_image in STEPS:
+            message = {"content": content}
+            if with_image:
+                message["file_id"] = file_id
+            sent = time.perf_counter()
+            await ws.send(json.dumps(message))
+            first_token = None
+            while True:
+                data = json.loads(await asyncio.wait_for(ws.recv(), timeout=120))
+                # Sub-agent deltas carry an agent_name; only the answer counts
+                if data.get("type") == "content_delta" and "agent_name" not in data and first_token is None:
+                    first_token = time.perf_counter()
+                elif data.get("type") == "entry" and data["entry"].get("kind") == "assistant_message":
+                    if data["entry"]["data"].get("content", "").startswith("Sorry"):
+                        errors[step] += 1
+                elif data.get("type") == "turn_complete":
+                    break
+            done = time.perf_counter()
+            if first_token is not None:
+                metrics[step]["ttft"].append(first_token - sent)
+            metrics[step]["turn"].append(done - sent)
+
+
+async def run_clients(base: str, sessions: int, ramp_seconds: float) -> tuple[dict, dict, int, float]:
+    metrics: dict = defaultdict(lambda: {"ttft": [], "turn": []})
+    errors: dict = defaultdict(int)
+    failures = 0
+
+    async def one(i: int) -> None:
+        nonlocal failures
+        await asyncio.sleep(ramp_seconds * i / max(sessions, 1))
+        try:
+            await run_client(base, metrics, errors)
+        except Exception as e:
+            failures += 1
+            print(f"client {i} failed: {e!r}", file=sys.stderr)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(sessions)))
+    return metrics, errors, failures, time.perf_counter() - started
+
+
+def report(metrics: dict, errors: dict, failures: int, elapsed: float, sessions: int,
+           backend_lag: list[float] | None, harness_lag: list[float]) -> None:
+    ms = 1000
+    print(f"\n{sessions} sessions in {elapsed:.1f}s ({failures} failed)")
+    print(f"{'step':<15} {'n':>5} {'ttft p50':>9} {'ttft p99':>9} {'turn p50':>9} {'turn p99':>9} {'errors':>6}")
+    for step, _, _ in STEPS:
+        m = metrics.get(step, {"ttft": [], "turn": []})
+        print(
+            f"{step:<15} {len(m['turn']):>5} "
+            f"{percentile(m['ttft'], .5) * ms:>7.0f}ms {percentile(m['ttft'], .99) * ms:>7.0f}ms "
+            f"{percentile(m['turn'], .5) * ms:>7.0f}ms {percentile(m['turn'], .99) * ms:>7.0f}ms "
+            f"{errors.get(step, 0):>6}"
+        )
+    for name, lag in (("backend", backend_lag), ("harness", harness_lag)):
+        if lag:
+            print(
+                f"{name} event-loop lag: p50 {percentile(lag, .5) * ms:.1f}ms "
+                f"p99 {percentile(lag, .99) * ms:.1f}ms max {max(lag) * ms:.1f}ms"
+            )
+
+
+def _profile(args, name: str) -> Profile:
+    return Profile(
+        latency_ms=getattr(args, f"{name}_latency"),
+        jitter_ms=getattr(args, f"{name}_latency") * 0.3,
+        error_rate=getattr(args, f"{name}_errors"),
+        slow_rate=getattr(args, f"{name}_slow_rate"),
+        slow_ms=getattr(args, f"{name}_slow_ms"),
+        token_ms=args.openai_token_ms if name == "openai" else 0.0,
+        error_status=429 if name == "openai" else 500,
+    )
+
+
+async def main(args) -> None:
+    import uvicorn
+
+    profiles = Profiles(
+        openai=_profile(args, "openai"),
+        roboflow=_profile(args, "roboflow"),
+        mapbox=_profile(args, "mapbox"),
+    )
+    sim_url = f"http://127.0.0.1:{args.sim_port}"
+    sim = uvicorn.Server(
+        uvicorn.Config(create_app(profiles), host="127.0.0.1", port=args.sim_port, log_level="warning")
+    )
+    sim_task = asyncio.create_task(sim.serve())
+
+    harness_lag: list[float] = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(sample_loop_lag(harness_lag, stop))
+
+    backend = None
+    lag_file = tempfile.NamedTemporaryFile(suffix=".json", delete=False).name
+    base = args.backend
+    try:
+        if base is None:
+            upload_dir = tempfile.mkdtemp(prefix="loadtest-uploads-")
+            backend = spawn_backend(args.backend_port, sim_url, lag_file, upload_dir)
+            base = f"http://127.0.0.1:{args.backend_port}"
+        await wait_ready(base)
+        metrics, errors, failures, elapsed = await run_clients(base, args.sessions, args.ramp)
+    finally:
+        if backend is not None:
+            backend.send_signal(signal.SIGINT)
+            await asyncio.to_thread(backend.wait, 30)
+        stop.set()
+        await probe
+        sim.should_exit = True
+        await sim_task
+
+    backend_lag = None
+    if backend is not None and Path(lag_file).stat().st_size:
+        backend_lag = json.loads(Path(lag_file).read_text())
+    report(metrics, errors, failures, elapsed, args.sessions, backend_lag, harness_lag)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=20, help="concurrent client sessions")
+    parser.add_argument("--ramp", type=float, default=2.0, help="seconds over which clients start")
+    parser.add_argument("--backend", help="URL of a running backend instead of spawning one")
+    parser.add_argument("--backend-port", type=int, default=8010)
+    parser.add_argument("--sim-port", type=int, default=8100)
+    for name, latency in (("openai", 500.0), ("roboflow", 1200.0), ("mapbox", 150.0)):
+        parser.add_argument(f"--{name}-latency", type=float, default=latency, help="mean ms")
+        parser.add_argument(f"--{name}-errors", type=float, default=0.0, help="error rate 0-1")
+        parser.add_argument(f"--{name}-slow-rate", type=float, default=0.0, help="slow request rate 0-1")
+        parser.add_argument(f"--{name}-slow-ms", type=float, default=latency * 5)
+    parser.add_argument("--openai-token-ms", type=float, default=15.0, help="delay between streamed tokens")
+    parser.add_argument("--serve-backend", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--lag-file", help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.serve_backend:
+        serve_backend(args.serve_backend, args.lag_file)
+    else:
+        asyncio.run(main(args))
@@ -0,0 +1,49 @@
+"""Measure how much tool-result projection shrinks orchestrator LLM input.
+
+Replays recorded sessions from the database through build_responses_input with
+and without per-tool projections and prints estimated token counts.
+
+Usage: python scripts/measure_projection.py [max_sessions]
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import tools  # noqa: E402,F401 — register tools and their projections
+from agent.compaction import estimate_input_tokens  # noqa: E402
+from agent.llm import build_responses_input  # noqa: E402
+from db.database import get_db  # noqa: E402
+from db.repository import get_session_entries, list_session_summaries  # noqa: E402
+
+
+async def main(max_sessions: int) -> None:
+    async with get_db() as db:
+        summaries = await list_session_summaries(db, limit=max_sessions)
+        transcripts = [
+            (s.session_id, await get_session_entries(db, s.session_id)) for s in summaries
+        ]
+
+    total_full = total_projected = 0
+    print(f"{'session':<38} {'entries':>7} {'full':>8} {'projected':>9} {'saved':>6}")
+    for session_id, entries in transcripts:
+        if not entries:
+            continue
+        full = estimate_input_tokens(build_responses_input(entries, "", project=False))
+        projected = estimate_input_tokens(build_responses_input(entries, ""))
+        total_full += full
+        total_projected += projected
+        saved = 100 * (full - projected) / full if full else 0.0
+        print(f"{session_id!s:<38} {len(entries):>7} {full:>8} {projected:>9} {saved:>5.1f}%")
+
+    if total_full:
+        saved = 100 * (total_full - total_projected) / total_full
+        print(f"\nTotal: {total_full} -> {total_projected} estimated tokens ({saved:.1f}% saved)")
+    else:
+        print("No recorded sessions with entries.")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 50))
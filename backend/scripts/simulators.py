@@ -0,0 +1,246 @@
+"""In-process simulators of the OpenAI Responses API, Roboflow and Mapbox.
+
+Used by scripts/load_test.py. One FastAPI app serves all three:
+
+    POST /v1/responses          Responses API, streaming (SSE) and non-streaming
+    POST /roboflow              Roboflow parking-sign workflow
+    GET  /mapbox/geocode        Mapbox forward geocoding v6
+
+The Responses simulator scripts the orchestrator's side of the app's flows
+from the request input: an attached image gets task_read_parking_sign and
+get_current_time calls, "save ... between" gets a task_location save,
+"park near" gets a task_location search, and anything after tool output gets
+a streamed text answer. Each service has its own latency/error profile.
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import re
+import time
+import uuid
+from dataclasses import dataclass
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+SIGN_PARTS = [
+    "2 HOUR PARKING 8AM-6PM MON THRU SAT EXCEPT VEHICLES WITH AREA S PERMITS",
+    "NO PARKING 12AM-6AM TUESDAY STREET CLEANING",
+]
+ANSWER = (
+    "Yes, you can park here right now for up to 2 hours. The 2-hour limit applies "
+    "8AM-6PM Monday through Saturday unless you have an Area S permit, and street cleaning "
+    "means no parking from midnight to 6AM on Tuesdays. Would you like me to save this sign?"
+)
+
+_FILE_ID_RE = re.compile(r"file_id: ([0-9a-f-]{36})")
+
+
+@dataclass
+class Profile:
+    """Latency and failure behaviour of one simulated service."""
+
+    latency_ms: float = 100.0
+    jitter_ms: float = 30.0
+    error_rate: float = 0.0
+    # Fraction of requests that take slow_ms instead (tail latency)
+    slow_rate: float = 0.0
+    slow_ms: float = 2000.0
+    # Responses API only: delay between streamed tokens
+    token_ms: float = 0.0
+    error_status: int = 500
+
+    def delay(self) -> float:
+        if self.slow_rate and random.random() < self.slow_rate:
+            return self.slow_ms / 1000
+        return max(0.0, random.gauss(self.latency_ms, self.jitter_ms)) / 1000
+
+    def fails(self) -> bool:
+        return random.random() < self.error_rate
+
+
+@dataclass
+class Profiles:
+    openai: Profile
+    roboflow: Profile
+    mapbox: Profile
+
+
+def _error(profile: Profile) -> JSONResponse:
+    return JSONResponse(
+        {"error": {"message": "simulated failure", "type": "server_error"}},
+        status_code=profile.error_status,
+    )
+
+
+# --- Responses API ---
+
+
+def _last_user_text(items: list[dict]) -> str:
+    for item in reversed(items):
+        if item.get("role") == "user":
+            return item.get("content") or ""
+    return ""
+
+
+def _plan(body: dict) -> list[tuple[str, dict]] | str:
+    """Tool calls to make, or the text to answer with."""
+    items = body.get("input", [])
+    tools = {t.get("name") for t in body.get("tools", [])}
+    if "task_read_parking_sign" not in tools:
+        # Sub-agent or compaction call: answer in text
+        return "Done."
+    if items and items[-1].get("type") == "function_call_output":
+        return ANSWER
+
+    text = _last_user_text(items)
+    file_ids = [m for item in items for m in _FILE_ID_RE.findall(item.get("content") or "")]
+    lowered = text.lower()
+    if "attached an image" in lowered and file_ids:
+        return [
+            ("task_read_parking_sign", {"file_id": file_ids[-1]}),
+            ("get_current_time", {}),
+        ]
+    if "save" in lowered and "between" in lowered:
+        location = text.split(":", 1)[-1].strip()
+        args = {"task_description": f"Save this parking sign at: {location}"}
+        if file_ids:
+            args["uploaded_file_id"] = file_ids[-1]
+            args["sign_text"] = "\n\n".join(SIGN_PARTS)
+        return [("task_location", args)]
+    if "park near" in lowered:
+        location = lowered.split("park near", 1)[1].strip(" ?.")
+        return [("task_location", {"task_description": f"Search for parking signs near: {location}"})]
+    return ANSWER
+
+
+def _sse(event: dict) -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+
+def _response_object(body: dict, output: list[dict]) -> dict:
+    return {
+        "id": f"resp_{uuid.uuid4().hex}",
+        "object": "response",
+        "created_at": int(time.time()),
+        "model": body.get("model", "sim"),
+        "status": "completed",
+        "output": output,
+        "parallel_tool_calls": True,
+        "tool_choice": "auto",
+        "tools": [],
+        "reasoning": body.get("reasoning"),
+        "usage": {
+            "input_tokens": 1000,
+            "output_tokens": 120,
+            "total_tokens": 1120,
+            "input_tokens_details": {"cached_tokens": 0},
+            "output_tokens_details": {"reasoning_tokens": 64},
+        },
+    }
+
+
+def _output_items(plan) -> list[dict]:
+    if isinstance(plan, str):
+        return [{
+            "type": "message",
+            "id": f"msg_{uuid.uuid4().hex[:12]}",
+            "role": "assistant",
+            "status": "completed",
+            "content": [{"type": "output_text", "text": plan, "annotations": []}],
+        }]
+    return [
+        {
+            "type": "function_call",
+            "id": f"fc_{uuid.uuid4().hex[:12]}",
+            "call_id": f"call_{uuid.uuid4().hex[:12]}",
+            "name": name,
+            "arguments": json.dumps(args),
+            "status": "completed",
+        }
+        for name, args in plan
+    ]
+
+
+async def _stream(profile: Profile, body: dict, output: list[dict]):
+    seq = 0
+
+    def event(payload: dict) -> str:
+        nonlocal seq
+        seq += 1
+        return _sse({**payload, "sequence_number": seq})
+
+    await asyncio.sleep(profile.delay())
+    for index, item in enumerate(output):
+        if item["type"] == "function_call":
+            yield event({
+                "type": "response.output_item.added",
+                "output_index": index,
+                "item": {**item, "arguments": "", "status": "in_progress"},
+            })
+            yield event({
+                "type": "response.function_call_arguments.delta",
+                "output_index": index,
+                "item_id": item["id"],
+                "delta": item["arguments"],
+            })
+            yield event({"type": "response.output_item.done", "output_index": index, "item": item})
+            continue
+        text = item["content"][0]["text"]
+        for token in re.findall(r"\S+\s*", text):
+            if profile.token_ms:
+                await asyncio.sleep(profile.token_ms / 1000)
+            yield event({
+                "type": "response.output_text.delta",
+                "output_index": index,
+                "item_id": item["id"],
+                "content_index": 0,
+                "delta": token,
+            })
+    yield event({"type": "response.completed", "response": _response_object(body, output)})
+
+
+def create_app(profiles: Profiles) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/v1/responses")
+    async def responses(request: Request):
+        body = await request.json()
+        if profiles.openai.fails():
+            await asyncio.sleep(profiles.openai.delay())
+            return _error(profiles.openai)
+        output = _output_items(_plan(body))
+        if body.get("stream"):
+            return StreamingResponse(
+                _stream(profiles.openai, body, output), media_type="text/event-stream"
+            )
+        await asyncio.sleep(profiles.openai.delay())
+        return _response_object(body, output)
+
+    @app.post("/roboflow")
+    async def roboflow(request: Request):
+        await request.body()
+        await asyncio.sleep(profiles.roboflow.delay())
+        if profiles.roboflow.fails():
+            return _error(profiles.roboflow)
+        return {"outputs": [{"open_ai": SIGN_PARTS}]}
+
+    @app.get("/mapbox/geocode")
+    async def mapbox(q: str):
+        await asyncio.sleep(profiles.mapbox.delay())
+        if profiles.mapbox.fails():
+            return _error(profiles.mapbox)
+        # Deterministic point within ~1 km of the Mission, per query
+        digest = hashlib.sha256(q.lower().encode()).digest()
+        lat = 37.76 + (digest[0] - 128) / 12800
+        lon = -122.41 + (digest[1] - 128) / 12800
+        return {
+            "features": [{
+                "geometry": {"type": "Point", "coordinates": [lon, lat]},
+                "properties": {"full_address": f"{q} (simulated)", "name": q},
+            }]
+        }
+
+    return app
@@ -1,8 +1,13 @@
-"""End-to-end test: create session, upload image, send message, get OCR result."""
+"""End-to-end test: create session, upload image, send message, get OCR result.
+
+Prints the answer latency measured from the upload and from the message send;
+compare runs with SPECULATIVE_OCR=true and false on the server.
+"""
 
 import asyncio
 import json
 import sys
+import time
 from glob import glob
 from pathlib import Path
 
@@ -30,6 +35,7 @@ async def main():
         print(f"Session: {session_id}")
 
         # 2. Upload image
+        upload_started = time.perf_counter()
         with open(image_path, "rb") as f:
             resp = await client.post(
                 "/api/upload",
@@ -50,6 +56,8 @@ async def main():
         msg = {"content": "Can I park here right now?", "file_id": file_id}
         print(f"Sending: {json.dumps(msg)}")
         await ws.send(json.dumps(msg))
+        sent_at = time.perf_counter()
+        first_token_at = None
 
         # Collect responses until turn_complete or timeout
         full_content = ""
@@ -74,8 +82,12 @@ async def main():
                         if content:
                             full_content = content
                             print(f"    content: {content[:300]}")
+                elif msg_type == "content_delta" and data.get("agent_name"):
+                    pass  # skip sub-agent output
                 elif msg_type == "content_delta":
                     text = data.get("text", "")
+                    if first_token_at is None:
+                        first_token_at = time.perf_counter()
                     sys.stdout.write(text)
                     sys.stdout.flush()
                     full_content += text
@@ -91,7 +103,13 @@ async def main():
         except asyncio.TimeoutError:
             print("\n--- TIMEOUT (120s) ---")
 
+    done_at = time.perf_counter()
     print(f"\n=== FINAL ANSWER ===\n{full_content}")
+    print("\n=== LATENCY ===")
+    if first_token_at is not None:
+        print(f"First answer token: {first_token_at - sent_at:.2f}s after send")
+    print(f"Answer complete:    {done_at - sent_at:.2f}s after send")
+    print(f"Upload to answer:   {done_at - upload_started:.2f}s")
 
 
 asyncio.run(main())
@@ -52,10 +52,16 @@ async def override_get_db(db_session: AsyncSession, monkeypatch):
     import db.database
     import main
     import agent.orchestrator
+    import agent.subagents.streaming
+    import agent.subagents.tool_runner
+    import agent.usage
     import worker.worker
 
     # Patch get_db on every module that imports it directly
     monkeypatch.setattr(db.database, "get_db", _fake_get_db)
     monkeypatch.setattr(main, "get_db", _fake_get_db)
     monkeypatch.setattr(agent.orchestrator, "get_db", _fake_get_db)
+    monkeypatch.setattr(agent.subagents.streaming, "get_db", _fake_get_db)
+    monkeypatch.setattr(agent.subagents.tool_runner, "get_db", _fake_get_db)
+    monkeypatch.setattr(agent.usage, "get_db", _fake_get_db)
     monkeypatch.setattr(worker.worker, "get_db", _fake_get_db)
@@ -59,3 +59,18 @@ async def test_get_entries_nonexistent_session():
     async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
         resp = await client.get(f"/api/sessions/{uuid.uuid4()}/entries")
     assert resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_get_entries_etag_not_modified():
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.post("/api/sessions")
+        session_id = resp.json()["session_id"]
+
+        resp = await client.get(f"/api/sessions/{session_id}/entries")
+        etag = resp.headers["etag"]
+
+        resp = await client.get(
+            f"/api/sessions/{session_id}/entries", headers={"If-None-Match": etag}
+        )
+    assert resp.status_code == 304
@@ -0,0 +1,58 @@
+from datetime import datetime
+
+from rules.availability import (
+    SLOT_MINUTES,
+    from_hex,
+    is_available,
+    schedule_masks,
+    to_hex,
+    window_mask,
+)
+from rules.compiler import compile_sign_text
+
+
+def _masks(text):
+    return schedule_masks(compile_sign_text(text))
+
+
+def _legal(text, start, end):
+    forbidden, limited, limit = _masks(text)
+    return is_available(forbidden, limited, limit, window_mask(start, end))
+
+
+# Monday 2026-10-19
+def test_window_mask_covers_partial_slots():
+    mask = window_mask(datetime(2026, 10, 19, 8, 10), datetime(2026, 10, 19, 8, 50))
+    # 08:00-09:00 on Monday: four 15-minute slots starting at slot 32
+    assert mask == 0b1111 << (8 * 60 // SLOT_MINUTES)
+
+
+def test_window_wraps_from_sunday_into_monday():
+    mask = window_mask(datetime(2026, 10, 25, 23, 0), datetime(2026, 10, 26, 1, 0))
+    assert mask & 1  # Monday 00:00 slot
+    assert mask.bit_length() == 7 * 24 * 60 // SLOT_MINUTES
+
+
+def test_prohibited_window_is_rejected():
+    sign = "NO PARKING 7AM-9AM MON-FRI"
+    assert not _legal(sign, datetime(2026, 10, 19, 8), datetime(2026, 10, 19, 10))
+    assert _legal(sign, datetime(2026, 10, 19, 9), datetime(2026, 10, 19, 12))
+    # Saturday morning is fine
+    assert _legal(sign, datetime(2026, 10, 24, 7), datetime(2026, 10, 24, 9))
+
+
+def test_time_limit_allows_short_stays_only():
+    sign = "2 HOUR PARKING 8AM-6PM MON-SAT"
+    assert _legal(sign, datetime(2026, 10, 19, 10), datetime(2026, 10, 19, 12))
+    assert not _legal(sign, datetime(2026, 10, 19, 10), datetime(2026, 10, 19, 15))
+    # Evening stays only overlap the limited period by an hour
+    assert _legal(sign, datetime(2026, 10, 19, 17), datetime(2026, 10, 19, 23))
+
+
+def test_ambiguous_sign_has_no_masks():
+    assert _masks("COMMERCIAL LOADING ZONE 7AM-6PM") is None
+
+
+def test_hex_round_trip():
+    forbidden, _, _ = _masks("NO PARKING 10PM-6AM EXCEPT SUNDAYS")
+    assert from_hex(to_hex(forbidden)) == forbidden
@@ -0,0 +1,77 @@
+import pytest
+
+from agent import cassette, llm
+from agent.llm import ContentDelta, LLMResponse, StreamDone, ToolCallResult
+from config import settings
+
+MESSAGES = [{"role": "user", "content": "Can I park here?"}]
+
+
+@pytest.fixture
+def cassette_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "LLM_CASSETTE_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "LLM_CASSETTE_LATENCY_SCALE", 0.0)
+    return tmp_path
+
+
+def test_request_key_is_canonical():
+    a = cassette.request_key("call", {"model": "m", "input": [{"role": "user", "content": "x"}]})
+    b = cassette.request_key("call", {"input": [{"content": "x", "role": "user"}], "model": "m"})
+    assert a == b
+    assert a != cassette.request_key(
+        "stream", {"model": "m", "input": [{"role": "user", "content": "x"}]}
+    )
+
+
+@pytest.mark.asyncio
+async def test_call_round_trips_through_cassette(cassette_dir, monkeypatch):
+    live = LLMResponse(tool_calls=[ToolCallResult("c1", "get_current_time", {})])
+
+    async def fake_create(request):
+        return live
+
+    monkeypatch.setattr(llm, "_create_response", fake_create)
+    monkeypatch.setattr(settings, "LLM_CASSETTE_MODE", "record")
+    assert await llm.call_llm(MESSAGES) == live
+
+    async def offline(request):
+        raise AssertionError("replay must not call OpenAI")
+
+    monkeypatch.setattr(llm, "_create_response", offline)
+    monkeypatch.setattr(settings, "LLM_CASSETTE_MODE", "replay")
+    assert await llm.call_llm(MESSAGES) == live
+
+    with pytest.raises(cassette.CassetteMiss):
+        await llm.call_llm([{"role": "user", "content": "something else"}])
+
+
+@pytest.mark.asyncio
+async def test_stream_replays_recorded_events(cassette_dir, monkeypatch):
+    events = [ContentDelta("You "), ContentDelta("can."), StreamDone("stop")]
+
+    async def fake_stream(request):
+        for event in events:
+            yield event
+
+    monkeypatch.setattr(llm, "_stream_responses", fake_stream)
+    monkeypatch.setattr(settings, "LLM_CASSETTE_MODE", "record")
+    assert [e async for e in llm.call_llm_streaming(MESSAGES)] == events
+
+    monkeypatch.setattr(settings, "LLM_CASSETTE_MODE", "replay")
+    monkeypatch.setattr(llm, "_stream_responses", None)
+    assert [e async for e in llm.call_llm_streaming(MESSAGES)] == events
+
+
+@pytest.mark.asyncio
+async def test_cache_mode_only_calls_once(cassette_dir, monkeypatch):
+    calls = []
+
+    async def fake_create(request):
+        calls.append(request)
+        return LLMResponse(content="done")
+
+    monkeypatch.setattr(llm, "_create_response", fake_create)
+    monkeypatch.setattr(settings, "LLM_CASSETTE_MODE", "cache")
+    await llm.call_llm(MESSAGES)
+    await llm.call_llm(MESSAGES)
+    assert len(calls) == 1
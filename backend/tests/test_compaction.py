@@ -0,0 +1,83 @@
+import uuid
+from types import SimpleNamespace
+
+from agent.compaction import _render_transcript, select_compactable
+from agent.llm import build_responses_input
+from db.models import EntryKind
+
+
+def _entry(seq, kind, data, uploaded_file_id=None):
+    return SimpleNamespace(
+        id=uuid.uuid4(), seq=seq, kind=kind, data=data, uploaded_file_id=uploaded_file_id
+    )
+
+
+def _turn(start_seq, text, call_id):
+    return [
+        _entry(start_seq, EntryKind.USER_MESSAGE, {"content": text}),
+        _entry(
+            start_seq + 1,
+            EntryKind.TOOL_CALL,
+            {"call_id": call_id, "tool_name": "get_current_time", "arguments": {}},
+        ),
+        _entry(start_seq + 2, EntryKind.TOOL_RESULT, {"call_id": call_id, "result": {}}),
+        _entry(start_seq + 3, EntryKind.ASSISTANT_MESSAGE, {"content": f"re: {text}"}),
+    ]
+
+
+def _transcript(turns):
+    entries = []
+    for i in range(turns):
+        entries += _turn(i * 4 + 1, f"q{i}", f"c{i}")
+    return entries
+
+
+def test_select_compactable_keeps_recent_turns():
+    entries = _transcript(5)
+    old = select_compactable(entries, recent_turns=2)
+    assert [e.seq for e in old] == list(range(1, 13))
+
+
+def test_select_compactable_nothing_when_few_turns():
+    assert select_compactable(_transcript(2), recent_turns=2) == []
+
+
+def test_select_compactable_refuses_to_split_tool_pairs():
+    entries = _transcript(3)
+    # A user message arrived while c0 was still running; its result lands later
+    result = next(e for e in entries if e.data.get("call_id") == "c0" and e.kind == EntryKind.TOOL_RESULT)
+    entries.remove(result)
+    entries.append(_entry(99, EntryKind.TOOL_RESULT, {"call_id": "c0", "result": {}}))
+    assert select_compactable(entries, recent_turns=1) == []
+
+
+def test_select_compactable_summarizes_orphan_calls():
+    entries = _transcript(3)
+    # c0 never got a result, e.g. the worker crashed mid-tool
+    result = next(e for e in entries if e.data.get("call_id") == "c0" and e.kind == EntryKind.TOOL_RESULT)
+    entries.remove(result)
+    old = select_compactable(entries, recent_turns=1)
+    assert [e.seq for e in old] == [1, 2, 4, 5, 6, 7, 8]
+    assert "get_current_time({}) (interrupted, no result)" in _render_transcript(old)
+
+
+def test_select_compactable_continues_after_previous_summary():
+    entries = _transcript(4)
+    entries.append(_entry(17, EntryKind.CONTEXT_SUMMARY, {"content": "s", "through_seq": 8}))
+    old = select_compactable(entries, recent_turns=1)
+    assert [e.seq for e in old] == [9, 10, 11, 12]
+
+
+def test_build_responses_input_replaces_summarized_entries():
+    entries = _transcript(3)
+    entries.append(
+        _entry(13, EntryKind.CONTEXT_SUMMARY, {"content": "User asked q0, q1.", "through_seq": 8})
+    )
+    items = build_responses_input(entries, "sys")
+
+    assert items[0] == {"role": "system", "content": "sys"}
+    assert "User asked q0, q1." in items[1]["content"]
+    assert items[2] == {"role": "user", "content": "q2"}
+    call_ids = [i["call_id"] for i in items if i.get("type") == "function_call"]
+    output_ids = [i["call_id"] for i in items if i.get("type") == "function_call_output"]
+    assert call_ids == output_ids == ["c2"]
@@ -0,0 +1,72 @@
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from db.models import EntryKind
+from interface import export, wire
+
+
+def _session():
+    return SimpleNamespace(id=uuid.uuid4(), parent_id=None, started_at=datetime(2026, 1, 5, 9, 30))
+
+
+def _entry(session, seq):
+    return SimpleNamespace(
+        id=uuid.uuid4(),
+        session_id=session.id,
+        seq=seq,
+        kind=EntryKind.USER_MESSAGE,
+        data={"content": f"message {seq}"},
+        status=None,
+        created_at=datetime(2026, 1, 5, 9, 30, seq),
+        updated_at=datetime(2026, 1, 5, 9, 30, seq),
+    )
+
+
+@pytest.fixture
+def rows(monkeypatch):
+    first, second = _session(), _session()
+    rows = [(_entry(first, 1), first), (_entry(first, 2), first), (_entry(second, 1), second)]
+
+    async def fake_stream_entries(db, session_ids, kinds, since, until):
+        for row in rows:
+            yield row
+
+    monkeypatch.setattr(export, "stream_entries", fake_stream_entries)
+    return rows
+
+
+async def _collect(chunks) -> bytes:
+    return b"".join([chunk async for chunk in chunks])
+
+
+@pytest.mark.asyncio
+async def test_export_lines_writes_a_session_line_before_its_entries(rows):
+    body = await _collect(export.chunked(export.export_lines(None), size=1))
+    lines = [wire.loads(line) for line in body.splitlines()]
+
+    assert [line["type"] for line in lines] == ["session", "entry", "entry", "session", "entry"]
+    assert lines[0]["session"]["id"] == str(rows[0][1].id)
+    assert lines[3]["session"]["id"] == str(rows[2][1].id)
+    assert lines[2]["entry"]["data"] == {"content": "message 2"}
+
+
+@pytest.mark.asyncio
+async def test_chunked_joins_lines_up_to_size():
+    async def lines():
+        for _ in range(5):
+            yield b"x" * 10
+
+    chunks = [chunk async for chunk in export.chunked(lines(), size=25)]
+    assert [len(chunk) for chunk in chunks] == [30, 20]
+
+
+@pytest.mark.asyncio
+async def test_zstd_export_round_trips(rows):
+    zstandard = pytest.importorskip("zstandard")
+    plain = await _collect(export.chunked(export.export_lines(None)))
+    packed = await _collect(export.compressed(export.chunked(export.export_lines(None)), export.zstd_compressor()))
+
+    assert zstandard.ZstdDecompressor().decompressobj().decompress(packed) == plain
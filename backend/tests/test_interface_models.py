@@ -1,9 +1,11 @@
+import json
 import uuid
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from types import SimpleNamespace
 
 from db.models import EntryKind, EntryStatus
-from interface.models import entry_to_wire
+from interface import models
+from interface.models import entries_json, entry_frame, entry_to_wire, naive_utc
 
 
 def _make_entry(
@@ -14,10 +16,12 @@ def _make_entry(
     return SimpleNamespace(
         id=uuid.uuid4(),
         session_id=uuid.uuid4(),
+        seq=1,
         kind=kind,
         data=data or {"content": "hello"},
         status=status,
         created_at=datetime(2025, 1, 1, tzinfo=timezone.utc),
+        updated_at=datetime(2025, 1, 1, 0, 5, tzinfo=timezone.utc),
     )
 
 
@@ -29,9 +33,11 @@ def test_entry_to_wire_structure():
     inner = wire["entry"]
     assert inner["id"] == str(entry.id)
     assert inner["session_id"] == str(entry.session_id)
+    assert inner["seq"] == 1
     assert inner["kind"] == "user_message"
     assert inner["data"] == {"content": "hello"}
     assert inner["created_at"] == "2025-01-01T00:00:00+00:00"
+    assert inner["updated_at"] == "2025-01-01T00:05:00+00:00"
 
 
 def test_entry_to_wire_nullable_status():
@@ -44,3 +50,33 @@ def test_entry_to_wire_with_status():
     entry = _make_entry(kind=EntryKind.TOOL_CALL, status=EntryStatus.PENDING)
     wire = entry_to_wire(entry)
     assert wire["entry"]["status"] == "pending"
+
+
+def test_entry_frame_matches_entry_to_wire():
+    entry = _make_entry(data={"content": "caf\u00e9", "nested": {"n": [1, 2.5, None]}})
+    assert json.loads(entry_frame(entry)) == json.loads(json.dumps(entry_to_wire(entry)))
+    assert json.loads(entries_json([entry, entry])) == [entry_to_wire(entry)["entry"]] * 2
+
+
+def test_entry_is_encoded_once_per_change():
+    entry = _make_entry()
+    first = models.entry_json(entry)
+    entry.data = {"content": "changed"}
+    # Same updated_at: the cached encoding is reused
+    assert models.entry_json(entry) is first
+    entry.updated_at = datetime(2025, 1, 1, 0, 6, tzinfo=timezone.utc)
+    assert json.loads(models.entry_json(entry))["data"] == {"content": "changed"}
+
+
+def test_entry_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(models.settings, "WIRE_ENTRY_CACHE_SIZE", 2)
+    monkeypatch.setattr(models, "_encoded_entries", models.OrderedDict())
+    for _ in range(3):
+        models.entry_json(_make_entry())
+    assert len(models._encoded_entries) == 2
+
+
+def test_naive_utc_converts_offsets():
+    local = datetime(2026, 10, 19, tzinfo=timezone(timedelta(hours=-7)))
+    assert naive_utc(local) == datetime(2026, 10, 19, 7, 0)
+    assert naive_utc(datetime(2026, 10, 19)) == datetime(2026, 10, 19)
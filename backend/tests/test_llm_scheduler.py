@@ -0,0 +1,103 @@
+import asyncio
+
+import httpx
+import openai
+import pytest
+
+from agent.llm_scheduler import Lane, LLMScheduler, TokenBucket
+from config import settings
+
+REQUEST = {"model": "m", "input": [{"role": "user", "content": "hi"}]}
+
+
+def _rate_limited(retry_after: str = "0") -> openai.RateLimitError:
+    response = httpx.Response(
+        429,
+        headers={"retry-after": retry_after},
+        request=httpx.Request("POST", "https://api.openai.com/v1/responses"),
+    )
+    return openai.RateLimitError("rate limited", response=response, body=None)
+
+
+@pytest.fixture(autouse=True)
+def fast_retries(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_RETRY_BASE_SECONDS", 0.0)
+
+
+def test_token_bucket_waits_for_refill():
+    bucket = TokenBucket(per_minute=60)
+    bucket.take(60, now=bucket.updated)
+    assert bucket.wait_time(1, now=bucket.updated) == pytest.approx(1.0)
+    assert bucket.wait_time(1, now=bucket.updated + 1.0) == 0.0
+    assert TokenBucket(per_minute=0).wait_time(10**9, now=0.0) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_interactive_lane_is_served_before_background():
+    scheduler = LLMScheduler(max_concurrency=1, requests_per_minute=0, tokens_per_minute=0)
+    await scheduler.acquire(Lane.AGENT, 0)
+    order = []
+
+    async def waiter(lane):
+        await scheduler.acquire(lane, 0)
+        order.append(lane)
+        scheduler.release()
+
+    background = asyncio.create_task(waiter(Lane.BACKGROUND))
+    await asyncio.sleep(0)
+    interactive = asyncio.create_task(waiter(Lane.INTERACTIVE))
+    await asyncio.sleep(0)
+    assert scheduler.queued()[Lane.BACKGROUND] == 1
+
+    scheduler.release()
+    await asyncio.gather(background, interactive)
+    assert order == [Lane.INTERACTIVE, Lane.BACKGROUND]
+    assert scheduler.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_call_retries_rate_limits():
+    scheduler = LLMScheduler(max_concurrency=2, requests_per_minute=0, tokens_per_minute=0)
+    attempts = []
+
+    async def send():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise _rate_limited()
+        return "ok"
+
+    assert await scheduler.call("orchestrator", REQUEST, send) == "ok"
+    assert len(attempts) == 3
+    assert scheduler.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_call_gives_up_after_max_retries(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_MAX_RETRIES", 1)
+    scheduler = LLMScheduler(max_concurrency=2, requests_per_minute=0, tokens_per_minute=0)
+
+    async def send():
+        raise _rate_limited()
+
+    with pytest.raises(openai.RateLimitError):
+        await scheduler.call("memory_manager", REQUEST, send)
+    assert scheduler.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_stream_is_not_retried_once_it_has_yielded():
+    scheduler = LLMScheduler(max_concurrency=2, requests_per_minute=0, tokens_per_minute=0)
+    opened = []
+
+    async def open_stream():
+        opened.append(1)
+        yield "first"
+        raise _rate_limited()
+
+    received = []
+    with pytest.raises(openai.RateLimitError):
+        async for event in scheduler.stream("orchestrator", REQUEST, open_stream):
+            received.append(event)
+    assert received == ["first"]
+    assert len(opened) == 1
+    assert scheduler.in_flight == 0
@@ -0,0 +1,93 @@
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from agent.subagents.location_tasks import SaveTask, SearchTask, parse_task
+
+
+def test_parse_save_between_with_city():
+    task = parse_task(
+        "Save this parking sign at: 20th st between illinois and georgia, San Francisco"
+    )
+    assert task == SaveTask(
+        street="20th st",
+        cross_a="illinois",
+        cross_b="georgia",
+        city="San Francisco",
+        description="20th st between illinois and georgia, San Francisco",
+    )
+    assert task.intersection_queries() == (
+        "20th st & illinois, San Francisco",
+        "20th st & georgia, San Francisco",
+    )
+
+
+def test_parse_save_anchors_on_the_last_at():
+    task = parse_task(
+        "Save this parking sign on the north side at: 20th st between illinois and georgia, San Francisco"
+    )
+    assert task.street == "20th st"
+    assert task.cross_a == "illinois"
+    # Without the colon the location can't be told apart from the free text
+    assert parse_task("Save this parking sign on the north side at 20th st between a and b") is None
+
+
+def test_parse_save_without_cross_streets_falls_back():
+    assert parse_task("Save this parking sign at: the corner by my office") is None
+
+
+def test_parse_search_default_radius():
+    task = parse_task("Search for parking signs near: 20th and texas st, San Francisco")
+    assert task == SearchTask(query="20th and texas st, San Francisco", radius_meters=1600)
+
+
+def test_parse_search_explicit_radius():
+    task = parse_task("Search for parking signs near Dolores Park within 2 miles")
+    assert task.query == "Dolores Park"
+    assert task.radius_meters == pytest.approx(3218.688)
+
+
+def test_parse_search_time_window():
+    task = parse_task(
+        "Search for parking signs near: Dolores Park, legal from 2026-10-24T18:00 "
+        "to 2026-10-24T23:00"
+    )
+    assert task == SearchTask(
+        query="Dolores Park",
+        start_time="2026-10-24T18:00",
+        end_time="2026-10-24T23:00",
+    )
+
+
+def test_parse_search_expand_without_number_falls_back():
+    assert parse_task("Search for parking signs near: Mission & 16th, expand the search") is None
+
+
+def test_parse_unrelated_task():
+    assert parse_task("How far is the ferry building from here?") is None
+
+
+@pytest.mark.asyncio
+async def test_save_fast_path_skips_llm():
+    from agent.subagents import location_agent
+
+    geocodes = [
+        {"lat": 37.0, "lon": -122.0, "full_address": "A", "name": "A"},
+        {"lat": 37.2, "lon": -122.2, "full_address": "B", "name": "B"},
+    ]
+    saved = {"id": "x", "latitude": 37.1, "longitude": -122.1, "description": "d"}
+    with (
+        patch("tools.mapbox_geocode.run", new_callable=AsyncMock, side_effect=geocodes),
+        patch("tools.save_parking_sign_location.run", new_callable=AsyncMock, return_value=saved) as save,
+        patch.object(location_agent, "stream_llm_turn", new_callable=AsyncMock) as llm,
+    ):
+        result = await location_agent.run_agent(
+            "Save this parking sign at: 20th st between illinois and georgia, SF",
+            uploaded_file_id="f1",
+            sign_text="NO PARKING",
+        )
+    llm.assert_not_called()
+    kwargs = save.call_args.kwargs
+    assert kwargs["latitude"] == pytest.approx(37.1)
+    assert kwargs["longitude"] == pytest.approx(-122.1)
+    assert "Saved the parking sign" in result["summary"]
@@ -0,0 +1,103 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+
+from agent import memory_cache
+from db.repository import create_memory
+
+
+@pytest.fixture(autouse=True)
+def reset_cache():
+    memory_cache._bump()
+    yield
+    memory_cache._bump()
+
+
+@pytest.mark.asyncio
+async def test_index_is_reused_until_invalidated(db_session):
+    await create_memory(db_session, "User lives in San Francisco")
+
+    hits = memory_cache.stats["hits"]
+    first = await memory_cache.get_memory_index()
+    second = await memory_cache.get_memory_index()
+    assert second is first
+    assert memory_cache.stats["hits"] == hits + 1
+
+    await create_memory(db_session, "User drives a van")
+    await memory_cache.invalidate()
+    third = await memory_cache.get_memory_index()
+    assert third is not first
+    assert len(third.memories) == 2
+
+
+@pytest.mark.asyncio
+async def test_prompt_fragment(db_session):
+    assert await memory_cache.memories_prompt_fragment("hi", 100) == "User memories: (none yet)"
+
+    await create_memory(db_session, "User has a zone Y permit")
+    await memory_cache.invalidate()
+    fragment = await memory_cache.memories_prompt_fragment("hi", 100)
+    assert fragment == "User memories:\n- User has a zone Y permit"
+
+
+def test_notification_from_other_process_bumps_version():
+    version = memory_cache.current_version()
+    memory_cache._on_notification(None, 1, memory_cache.NOTIFY_CHANNEL, memory_cache._instance_id)
+    assert memory_cache.current_version() == version
+    memory_cache._on_notification(None, 1, memory_cache.NOTIFY_CHANNEL, "other-process")
+    assert memory_cache.current_version() == version + 1
+
+
+@pytest.mark.asyncio
+async def test_listener_reconnects_and_invalidates(monkeypatch):
+    dropped, reconnected = object(), object()
+    monkeypatch.setattr(memory_cache, "_RECONNECT_MIN_SECONDS", 0.0)
+    attempts = []
+
+    async def fake_connect():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ConnectionRefusedError
+        memory_cache._listener_conn = reconnected
+        memory_cache._bump()
+
+    monkeypatch.setattr(memory_cache, "_connect", fake_connect)
+    monkeypatch.setattr(memory_cache, "_listener_conn", dropped)
+    version = memory_cache.current_version()
+
+    memory_cache._on_terminated(dropped)
+    await asyncio.wait_for(memory_cache._reconnect_task, 1)
+
+    assert len(attempts) == 2
+    assert memory_cache._listener_conn is reconnected
+    assert memory_cache.current_version() == version + 1
+    # A connection closed by stop_listener is not reopened
+    memory_cache._on_terminated(dropped)
+    assert memory_cache._reconnect_task is None
+
+
+@pytest.mark.asyncio
+async def test_failed_start_retries_and_expires_cache(monkeypatch):
+    async def refuse():
+        raise ConnectionRefusedError
+
+    monkeypatch.setattr(memory_cache, "_connect", refuse)
+    monkeypatch.setattr(memory_cache, "_RECONNECT_MIN_SECONDS", 60.0)
+    await memory_cache.start_listener()
+    assert memory_cache._reconnect_task is not None
+    await memory_cache.stop_listener()
+
+    @asynccontextmanager
+    async def fake_get_db():
+        yield None
+
+    async def fake_list_memories(db):
+        return []
+
+    monkeypatch.setattr("db.database.get_db", fake_get_db)
+    monkeypatch.setattr("db.repository.list_memories", fake_list_memories)
+    monkeypatch.setattr(memory_cache, "_UNLISTENED_TTL_SECONDS", 0.0)
+    first = await memory_cache.get_memory_index()
+    # Without a listener the index can't be trusted past the TTL
+    assert await memory_cache.get_memory_index() is not first
@@ -0,0 +1,73 @@
+from types import SimpleNamespace
+
+import pytest
+
+from agent import memory_dedup
+from agent.subagents import memory_manager
+
+
+def _memory(content):
+    return SimpleNamespace(content=content)
+
+
+MEMORIES = [
+    _memory("User lives in San Francisco"),
+    _memory("User has a residential parking permit for zone S"),
+]
+
+
+def test_restated_fact_is_known():
+    assert memory_dedup.find_known("I live in San Francisco", MEMORIES) is MEMORIES[0]
+    assert memory_dedup.find_known(
+        "I have a residential parking permit for zone S", MEMORIES
+    ) is MEMORIES[1]
+
+
+def test_new_fact_is_not_known():
+    assert memory_dedup.find_known("I live in Oakland", MEMORIES) is None
+    assert memory_dedup.find_known("I drive a motorcycle", MEMORIES) is None
+
+
+def test_changes_and_negations_are_never_known():
+    assert memory_dedup.find_known("I don't live in San Francisco", MEMORIES) is None
+    assert memory_dedup.find_known("I no longer live in San Francisco", MEMORIES) is None
+    assert memory_dedup.find_known("Actually I live in San Francisco now", MEMORIES) is None
+
+
+@pytest.mark.parametrize(
+    "message, memory",
+    [
+        ("I have a residential parking permit", "User does not have a residential parking permit"),
+        ("I work weekends", "User no longer works weekends"),
+        ("I drive a motorcycle", "User used to drive a motorcycle"),
+    ],
+)
+def test_negated_or_past_memories_are_never_matched(message, memory):
+    assert memory_dedup.find_known(message, [_memory(memory)]) is None
+
+
+def test_split_known_partitions_messages():
+    new, known = memory_dedup.split_known(
+        ["I live in San Francisco", "I work nights"], MEMORIES
+    )
+    assert new == ["I work nights"]
+    assert known == ["I live in San Francisco"]
+
+
+@pytest.mark.asyncio
+async def test_run_agent_skips_llm_when_everything_is_known(monkeypatch):
+    async def fake_index():
+        return SimpleNamespace(memories=MEMORIES)
+
+    async def fail_llm(*args, **kwargs):
+        raise AssertionError("LLM should not be called")
+
+    monkeypatch.setattr(memory_manager, "get_memory_index", fake_index)
+    monkeypatch.setattr(memory_manager, "stream_llm_turn", fail_llm)
+    monkeypatch.setattr(memory_manager, "stats", dict.fromkeys(memory_manager.stats, 0))
+
+    result = await memory_manager.run_agent(["I live in San Francisco"])
+
+    assert result["actions"] == []
+    assert memory_manager.stats["skipped_runs"] == 1
+    assert memory_manager.llm_calls_saved() == 1
@@ -0,0 +1,46 @@
+from types import SimpleNamespace
+
+from agent.memory_retrieval import MemoryIndex, estimate_tokens, is_pinned, tokenize
+
+
+def _mem(content):
+    return SimpleNamespace(content=content)
+
+
+def test_tokenize_drops_stopwords_and_punctuation():
+    assert tokenize("User drives a Honda Civic!") == ["drives", "honda", "civic"]
+
+
+def test_pinned_memories():
+    assert is_pinned("User lives in San Francisco")
+    assert is_pinned("User has a zone Y residential permit")
+    assert not is_pinned("User drives a motorcycle")
+
+
+def test_select_ranks_relevant_memories_first_within_budget():
+    memories = [
+        _mem("User works night shifts at the hospital"),
+        _mem("User drives a large pickup truck"),
+        _mem("User lives in Oakland"),
+        _mem("User prefers garages over street parking on rainy days"),
+    ]
+    index = MemoryIndex(memories)
+    budget = estimate_tokens(memories[2].content) + estimate_tokens(memories[1].content)
+
+    selected = index.select("Will my truck fit in this spot?", budget)
+
+    # Pinned city memory plus the best match for "truck"; original order kept
+    assert [m.content for m in selected] == [
+        "User drives a large pickup truck",
+        "User lives in Oakland",
+    ]
+
+
+def test_select_includes_everything_when_budget_allows():
+    memories = [_mem("User drives a Honda"), _mem("User has a bike rack")]
+    selected = MemoryIndex(memories).select("unrelated question", 1000)
+    assert selected == memories
+
+
+def test_select_empty():
+    assert MemoryIndex([]).select("anything", 100) == []
@@ -0,0 +1,40 @@
+import uuid
+
+from prometheus_client import REGISTRY
+
+from observability import metrics, tracing
+from worker import registry
+
+
+def _sample(name: str, labels: dict | None = None) -> float:
+    return REGISTRY.get_sample_value(name, labels or {}) or 0.0
+
+
+def test_finished_spans_feed_histograms():
+    before = _sample("towd_tool_duration_seconds_count", {"tool_name": "geo_distance", "status": "ok"})
+    ttft_before = _sample("towd_llm_time_to_first_token_seconds_count", {"agent": "location_agent"})
+
+    with tracing.span("tool.geo_distance"):
+        pass
+    span = tracing.start_span("llm.stream", agent="location_agent")
+    span.set(ttft_ms=120)
+    span.finish()
+
+    assert _sample(
+        "towd_tool_duration_seconds_count", {"tool_name": "geo_distance", "status": "ok"}
+    ) == before + 1
+    assert _sample(
+        "towd_llm_time_to_first_token_seconds_count", {"agent": "location_agent"}
+    ) == ttft_before + 1
+
+
+def test_queue_depth_is_read_at_scrape_time():
+    session_id = uuid.uuid4()
+    registry.enqueue_entry(session_id, uuid.uuid4())
+    registry.enqueue_entry(session_id, uuid.uuid4())
+    try:
+        body, _ = metrics.render()
+        assert f'towd_session_queue_depth{{session_id="{session_id}"}} 2.0' in body.decode()
+        assert _sample("towd_session_slots") >= 1
+    finally:
+        registry.remove_slot(session_id)
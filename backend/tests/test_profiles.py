@@ -0,0 +1,78 @@
+import uuid
+from types import SimpleNamespace
+
+from agent import profiles
+from config import settings
+from db.models import EntryKind
+
+
+def _entry(kind, **data):
+    return SimpleNamespace(id=uuid.uuid4(), kind=kind, data=data)
+
+
+def _turn(*results):
+    """A user message followed by orchestrator tool calls and their results."""
+    entries = [_entry(EntryKind.USER_MESSAGE, content="can I park here?")]
+    for i, (tool_name, result) in enumerate(results):
+        call_id = f"call_{i}"
+        entries.append(_entry(
+            EntryKind.TOOL_CALL, call_id=call_id, tool_name=tool_name,
+            arguments={}, agent_name="orchestrator",
+        ))
+        entries.append(_entry(EntryKind.TOOL_RESULT, call_id=call_id, result=result))
+    return entries
+
+
+def test_request_options_follow_the_agent_profile(monkeypatch):
+    monkeypatch.setattr(settings, "OPENAI_MODEL", "gpt-5.2")
+    assert profiles.request_options("orchestrator") == {
+        "model": "gpt-5.2", "reasoning": {"effort": "medium", "summary": "auto"},
+    }
+    assert profiles.request_options("memory_manager") == {
+        "model": "gpt-5.2", "reasoning": {"effort": "low"}, "max_output_tokens": 1000,
+    }
+    assert profiles.request_options("orchestrator", "low")["reasoning"]["effort"] == "low"
+
+
+def test_settings_override_profile_fields(monkeypatch):
+    monkeypatch.setattr(
+        settings, "LLM_PROFILES", {"location_agent": {"model": "gpt-5-mini", "effort": "medium"}}
+    )
+    options = profiles.request_options("location_agent")
+    assert options["model"] == "gpt-5-mini"
+    assert options["reasoning"] == {"effort": "medium"}
+    assert options["max_output_tokens"] == 2000
+
+
+def test_fact_results_lower_orchestrator_effort():
+    entries = _turn(
+        ("task_read_parking_sign", {"text": "2 HR PARKING", "rules": [], "ambiguous": False}),
+        ("get_current_time", {"datetime": "2026-10-19T10:00", "day_of_week": "Monday"}),
+    )
+    assert profiles.orchestrator_effort(entries) == profiles.SIMPLE_EFFORT
+    entries += _turn(("check_parking_rules", {"can_park": True, "ambiguous": False}))
+    assert profiles.orchestrator_effort(entries) == profiles.SIMPLE_EFFORT
+
+
+def test_other_turns_keep_profile_effort(monkeypatch):
+    # First call of a turn: nothing to answer from yet
+    assert profiles.orchestrator_effort(_turn()) is None
+    # Ambiguous signs, unparsed signs, errors and sub-agent searches need full reasoning
+    assert profiles.orchestrator_effort(
+        _turn(("check_parking_rules", {"can_park": True, "ambiguous": True}))
+    ) is None
+    assert profiles.orchestrator_effort(
+        _turn(("task_read_parking_sign", {"text": "No text detected on the parking sign."}))
+    ) is None
+    assert profiles.orchestrator_effort(
+        _turn(("get_current_time", {"datetime": "2026-10-19T10:00"}),
+              ("task_location", {"signs": []}))
+    ) is None
+    assert profiles.orchestrator_effort(
+        _turn(("check_parking_rules", {"error": "File not found: x"}))
+    ) is None
+
+    monkeypatch.setattr(settings, "LLM_ADAPTIVE_EFFORT", False)
+    assert profiles.orchestrator_effort(
+        _turn(("get_current_time", {"datetime": "2026-10-19T10:00"}))
+    ) is None
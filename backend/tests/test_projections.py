@@ -0,0 +1,74 @@
+import uuid
+from types import SimpleNamespace
+
+import tools  # noqa: F401 — register tools
+from agent.llm import build_responses_input
+from db.models import EntryKind
+from tools._registry import project_result
+
+
+def _entry(kind, data):
+    return SimpleNamespace(id=uuid.uuid4(), kind=kind, data=data, uploaded_file_id=None)
+
+
+SEARCH_RESULT = {
+    "results": [
+        {
+            "id": str(uuid.uuid4()),
+            "latitude": 37.76,
+            "longitude": -122.39,
+            "description": "20th st between illinois and georgia",
+            "sign_text": "2 HOUR PARKING 8AM-6PM",
+            "distance_meters": 120.5,
+            "distance_miles": 0.075,
+            "image_url": "http://localhost:8000/uploads/x.jpg",
+        }
+    ],
+    "page": 1,
+    "total_pages": 1,
+    "total_results": 1,
+}
+
+
+def test_search_projection_keeps_what_the_model_needs():
+    projected = project_result("search_nearby_signs", SEARCH_RESULT)
+    assert projected["results"] == [
+        {
+            "description": "20th st between illinois and georgia",
+            "sign_text": "2 HOUR PARKING 8AM-6PM",
+            "distance_meters": 120.5,
+        }
+    ]
+    assert projected["total_results"] == 1
+
+
+def test_sub_agent_projection_drops_actions():
+    result = {"summary": "Saved.", "actions": ["mapbox_geocode: {...}"] * 3}
+    assert project_result("task_location", result) == {"summary": "Saved."}
+
+
+def test_sign_reader_projection_drops_compiled_rules():
+    result = {"text": "NO PARKING ANYTIME", "rules": [{"kind": "no_parking"}], "ambiguous": False}
+    assert project_result("task_read_parking_sign", result) == {
+        "text": "NO PARKING ANYTIME", "ambiguous": False,
+    }
+
+
+def test_errors_and_unprojected_tools_pass_through():
+    assert project_result("search_nearby_signs", {"error": "boom"}) == {"error": "boom"}
+    assert project_result("get_current_time", {"datetime": "x"}) == {"datetime": "x"}
+
+
+def test_build_responses_input_projects_only_when_asked():
+    entries = [
+        _entry(
+            EntryKind.TOOL_CALL,
+            {"call_id": "c1", "tool_name": "search_nearby_signs", "arguments": {}},
+        ),
+        _entry(EntryKind.TOOL_RESULT, {"call_id": "c1", "result": SEARCH_RESULT}),
+    ]
+    lean = build_responses_input(entries, "sys")[-1]["output"]
+    full = build_responses_input(entries, "sys", project=False)[-1]["output"]
+    assert "image_url" not in lean
+    assert "image_url" in full
+    assert len(lean) < len(full)
@@ -1,10 +1,14 @@
 import asyncio
+import json
 import uuid
 
 import pytest
 
+from observability import tracing
 from worker.registry import (
     SessionSlot,
+    begin_replay,
+    finish_replay,
     ToolBatch,
     _slots,
     enqueue_entry,
@@ -62,6 +66,39 @@ async def test_push_to_client_no_websocket():
     await push_to_client(sid, {"test": True})
 
 
+class _RecordingWebSocket:
+    def __init__(self):
+        self.sent: list[dict] = []
+
+    async def send_json(self, data):
+        self.sent.append(data)
+
+    async def send_text(self, text):
+        self.sent.append(json.loads(text))
+
+
+@pytest.mark.asyncio
+async def test_push_during_replay_is_buffered_until_finished():
+    sid = uuid.uuid4()
+    ws = _RecordingWebSocket()
+    begin_replay(sid)
+    set_websocket(sid, ws)
+
+    await push_to_client(sid, {"type": "status", "n": 1})
+    assert ws.sent == []
+
+    await ws.send_json({"type": "resume_complete", "replayed": 0})
+    await finish_replay(sid)
+    assert ws.sent == [
+        {"type": "resume_complete", "replayed": 0},
+        {"type": "status", "n": 1},
+    ]
+
+    await push_to_client(sid, {"type": "status", "n": 2})
+    assert ws.sent[-1] == {"type": "status", "n": 2}
+    assert get_or_create_slot(sid).replay_buffer is None
+
+
 def test_remove_slot():
     sid = uuid.uuid4()
     get_or_create_slot(sid)
@@ -70,6 +107,13 @@ def test_remove_slot():
     assert sid not in _slots
 
 
+def test_remove_slot_forgets_queued_entries():
+    sid, entry_id = uuid.uuid4(), uuid.uuid4()
+    enqueue_entry(sid, entry_id)
+    remove_slot(sid)
+    assert tracing.take_enqueued(entry_id) is None
+
+
 # --- ToolBatch tests ---
 
 
@@ -2,14 +2,23 @@ import uuid
 
 import pytest
 
-from db.models import EntryKind, EntryStatus, SessionModel
+from db.models import EntryKind, EntryStatus, MemoryModel, SessionModel, SessionSummaryModel
 from db.repository import (
     append_entry,
+    create_llm_usage,
+    create_memory,
     create_session,
     get_entry,
     get_session,
     get_session_entries,
+    get_session_entries_since,
+    get_session_entries_watermark,
+    list_session_summaries,
     mark_entry_status,
+    normalize_memory_content,
+    stream_entries,
+    summarize_llm_usage,
+    update_memory,
 )
 
 
@@ -97,3 +106,197 @@ async def test_get_entry(db_session, test_session_id):
     assert fetched is not None
     assert fetched.id == entry.id
     assert fetched.kind == EntryKind.USER_MESSAGE
+
+
+@pytest.mark.asyncio
+async def test_get_session_entries_since_includes_status_changes(db_session, test_session_id):
+    call = await append_entry(
+        db_session,
+        test_session_id,
+        EntryKind.TOOL_CALL,
+        {"call_id": "c1", "tool_name": "t", "arguments": {}},
+    )
+    cursor = call.updated_at
+    await append_entry(
+        db_session, test_session_id, EntryKind.USER_MESSAGE, {"content": "old"}
+    )
+    # Status change on an entry the client already has must be replayed too
+    await mark_entry_status(db_session, call.id, EntryStatus.DONE)
+    newer = await append_entry(
+        db_session, test_session_id, EntryKind.ASSISTANT_MESSAGE, {"content": "new"}
+    )
+
+    missed = await get_session_entries_since(db_session, test_session_id, cursor)
+    ids = [e.id for e in missed]
+    assert call.id in ids
+    assert newer.id in ids
+
+    later = await get_session_entries_since(db_session, test_session_id, newer.updated_at)
+    assert [e.id for e in later] == [newer.id]
+
+
+@pytest.mark.asyncio
+async def test_append_entry_assigns_monotonic_seq(db_session, test_session_id):
+    first = await append_entry(
+        db_session, test_session_id, EntryKind.USER_MESSAGE, {"content": "a"}
+    )
+    second = await append_entry(
+        db_session, test_session_id, EntryKind.ASSISTANT_MESSAGE, {"content": "b"}
+    )
+    assert (first.seq, second.seq) == (1, 2)
+
+    other = await create_session(db_session)
+    other_entry = await append_entry(
+        db_session, other.id, EntryKind.USER_MESSAGE, {"content": "c"}
+    )
+    assert other_entry.seq == 1
+
+
+@pytest.mark.asyncio
+async def test_get_session_entries_keyset_pages(db_session, test_session_id):
+    for i in range(5):
+        await append_entry(
+            db_session, test_session_id, EntryKind.USER_MESSAGE, {"content": str(i)}
+        )
+    page1 = await get_session_entries(db_session, test_session_id, limit=2)
+    page2 = await get_session_entries(
+        db_session, test_session_id, after_seq=page1[-1].seq, limit=2
+    )
+    page3 = await get_session_entries(
+        db_session, test_session_id, after_seq=page2[-1].seq, limit=2
+    )
+    assert [e.data["content"] for e in page1 + page2 + page3] == ["0", "1", "2", "3", "4"]
+
+
+@pytest.mark.asyncio
+async def test_get_session_entries_watermark(db_session, test_session_id):
+    assert await get_session_entries_watermark(db_session, test_session_id) == (0, None)
+    entry = await append_entry(
+        db_session, test_session_id, EntryKind.USER_MESSAGE, {"content": "hi"}
+    )
+    last_seq, last_updated_at = await get_session_entries_watermark(
+        db_session, test_session_id
+    )
+    assert last_seq == entry.seq
+    assert last_updated_at == entry.updated_at
+
+
+@pytest.mark.asyncio
+async def test_session_summary_tracks_appends(db_session):
+    session = await create_session(db_session)
+    await append_entry(
+        db_session, session.id, EntryKind.USER_MESSAGE, {"content": "Can I park here?"}
+    )
+    await append_entry(
+        db_session, session.id, EntryKind.USER_MESSAGE, {"content": "And tomorrow?"}
+    )
+    last = await append_entry(
+        db_session, session.id, EntryKind.ASSISTANT_MESSAGE, {"content": "Yes"}
+    )
+
+    summary = await db_session.get(SessionSummaryModel, session.id)
+    await db_session.refresh(summary)
+    assert summary.entry_count == 3
+    assert summary.first_user_message == "Can I park here?"
+    assert summary.last_activity_at == last.created_at
+    assert summary.has_image is False
+
+
+@pytest.mark.asyncio
+async def test_list_session_summaries_keyset(db_session):
+    sessions = [await create_session(db_session) for _ in range(3)]
+    # Touch the oldest session last so it sorts first
+    await append_entry(
+        db_session, sessions[0].id, EntryKind.USER_MESSAGE, {"content": "hi"}
+    )
+
+    page1 = await list_session_summaries(db_session, limit=2)
+    assert page1[0].session_id == sessions[0].id
+    cursor = (page1[-1].last_activity_at, page1[-1].session_id)
+    page2 = await list_session_summaries(db_session, limit=2, before=cursor)
+
+    seen = [s.session_id for s in page1 + page2]
+    assert sorted(seen) == sorted(s.id for s in sessions)
+
+
+@pytest.mark.asyncio
+async def test_stream_entries_filters(db_session):
+    kept, other = await create_session(db_session), await create_session(db_session)
+    for session in (kept, other):
+        await append_entry(db_session, session.id, EntryKind.USER_MESSAGE, {"content": "hi"})
+        await append_entry(db_session, session.id, EntryKind.ASSISTANT_MESSAGE, {"content": "hey"})
+
+    rows = [
+        (entry.data["content"], session.id)
+        async for entry, session in stream_entries(
+            db_session, session_ids=[kept.id], kinds=[EntryKind.ASSISTANT_MESSAGE], batch_size=1
+        )
+    ]
+    assert rows == [("hey", kept.id)]
+
+    later = [row async for row in stream_entries(db_session, [kept.id], since=kept.started_at.replace(year=2999))]
+    assert later == []
+
+
+def test_normalize_memory_content():
+    assert normalize_memory_content("  User lives in San-Francisco!! ") == "user lives in san francisco"
+
+
+@pytest.mark.asyncio
+async def test_create_memory_returns_existing_duplicate(db_session):
+    first = await create_memory(db_session, "User has an RPP permit for zone A.")
+    again = await create_memory(db_session, "user has an rpp permit for zone a")
+    assert again.id == first.id
+    assert again.content == "User has an RPP permit for zone A."
+
+
+@pytest.mark.asyncio
+async def test_update_memory_merges_into_duplicate(db_session):
+    kept = await create_memory(db_session, "User has an RPP permit for zone A.")
+    other = await create_memory(db_session, "User drives a van")
+    merged = await update_memory(db_session, other.id, "user has an rpp permit for zone a")
+    assert merged.id == kept.id
+    assert await db_session.get(MemoryModel, other.id) is None
+
+    same = await update_memory(db_session, kept.id, "User has an RPP permit for zone A")
+    assert same.id == kept.id
+    assert same.content == "User has an RPP permit for zone A"
+
+
+@pytest.mark.asyncio
+async def test_summarize_llm_usage_by_agent(db_session, test_session_id):
+    def tokens(input_tokens, cached=0):
+        return {
+            "model": "gpt-5.2", "input_tokens": input_tokens, "cached_input_tokens": cached,
+            "output_tokens": 10, "reasoning_tokens": 4,
+        }
+
+    await create_llm_usage(db_session, test_session_id, "orchestrator", tokens(1000, 512))
+    await create_llm_usage(db_session, test_session_id, "orchestrator", tokens(1500, 1024))
+    await create_llm_usage(db_session, test_session_id, "location_agent", tokens(300))
+    await create_llm_usage(db_session, None, "memory_manager", tokens(200))
+
+    rows = await summarize_llm_usage(db_session, "agent", session_id=test_session_id)
+    assert [(r["key"], r["calls"], r["input_tokens"], r["cached_input_tokens"]) for r in rows] == [
+        ("orchestrator", 2, 2500, 1536),
+        ("location_agent", 1, 300, 0),
+    ]
+    (day,) = await summarize_llm_usage(db_session, "day")
+    assert day["calls"] == 4
+
+
+@pytest.mark.asyncio
+async def test_summarize_llm_usage_by_effort(db_session, test_session_id):
+    def tokens(effort, output_tokens):
+        return {
+            "model": "gpt-5.2", "effort": effort, "input_tokens": 1000,
+            "output_tokens": output_tokens, "reasoning_tokens": output_tokens // 2,
+        }
+
+    await create_llm_usage(db_session, test_session_id, "orchestrator", tokens("medium", 800))
+    await create_llm_usage(db_session, test_session_id, "orchestrator", tokens("low", 200))
+    await create_llm_usage(db_session, test_session_id, "location_agent", tokens("low", 100))
+
+    rows = await summarize_llm_usage(db_session, "effort", session_id=test_session_id)
+    by_effort = {r["key"]: (r["calls"], r["output_tokens"]) for r in rows}
+    assert by_effort == {"medium": (1, 800), "low": (2, 300)}
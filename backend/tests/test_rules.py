@@ -0,0 +1,89 @@
+from datetime import datetime
+
+from rules.compiler import compile_sign_text
+from rules.evaluator import evaluate
+
+# Monday 2026-10-19
+MONDAY = datetime(2026, 10, 19)
+
+
+def _at(day_offset: int, hour: int, minute: int = 0) -> datetime:
+    return MONDAY.replace(day=MONDAY.day + day_offset, hour=hour, minute=minute)
+
+
+def test_compiles_time_limit_with_permit_exemption():
+    schedule = compile_sign_text(
+        "2 HOUR PARKING 8AM-6PM MON THRU SAT EXCEPT VEHICLES WITH AREA S PERMITS"
+    )
+    assert schedule["ambiguous"] is False
+    [rule] = schedule["rules"]
+    assert rule["kind"] == "time_limit"
+    assert rule["days"] == [0, 1, 2, 3, 4, 5]
+    assert (rule["start"], rule["end"]) == (8 * 60, 18 * 60)
+    assert rule["limit_minutes"] == 120
+    assert rule["permit_exempt"] == ["S"]
+
+
+def test_compiles_multiple_sign_parts():
+    schedule = compile_sign_text(
+        "TOW-AWAY NO STOPPING 7-9AM MON-FRI\n\nNO PARKING 12AM-6AM TUESDAY STREET CLEANING"
+    )
+    stopping, cleaning = schedule["rules"]
+    assert stopping["kind"] == "no_stopping"
+    assert stopping["tow_away"] is True
+    assert (stopping["start"], stopping["end"]) == (7 * 60, 9 * 60)
+    assert cleaning["kind"] == "street_cleaning"
+    assert cleaning["days"] == [1]
+
+
+def test_schedule_before_restriction_is_reattached():
+    schedule = compile_sign_text("8AM-6PM MON-SAT\n\n1 HR PARKING")
+    [rule] = schedule["rules"]
+    assert rule["limit_minutes"] == 60
+    assert rule["days"] == [0, 1, 2, 3, 4, 5]
+
+
+def test_nth_weekday_and_excepted_days():
+    cleaning = compile_sign_text("STREET CLEANING 1ST & 3RD MONDAY 8AM-10AM")["rules"][0]
+    assert cleaning["weeks"] == [1, 3]
+    overnight = compile_sign_text("NO PARKING 10PM-6AM EXCEPT SUNDAYS")["rules"][0]
+    assert overnight["days"] == [0, 1, 2, 3, 4, 5]
+    assert (overnight["start"], overnight["end"]) == (22 * 60, 6 * 60)
+
+
+def test_unrecognized_signs_are_ambiguous():
+    assert compile_sign_text("COMMERCIAL LOADING ZONE 7AM-6PM")["ambiguous"] is True
+    assert compile_sign_text("NO PARKING")["ambiguous"] is True
+
+
+def test_evaluate_point_in_time():
+    schedule = compile_sign_text(
+        "2 HOUR PARKING 8AM-6PM MON-SAT\n\nNO PARKING 12AM-6AM TUESDAY STREET CLEANING"
+    )
+    result = evaluate(schedule, _at(0, 14))
+    assert result["can_park"] is True
+    assert result["limit_minutes"] == 120
+    assert result["move_by"] == "2026-10-19T16:00:00"
+    assert result["next_restriction"]["from"] == "2026-10-20T00:00:00"
+
+    assert evaluate(schedule, _at(1, 3))["can_park"] is False
+
+
+def test_evaluate_window_and_permits():
+    schedule = compile_sign_text(
+        "2 HOUR PARKING 8AM-6PM MON-SAT EXCEPT AREA S PERMITS\n\n"
+        "NO PARKING 12AM-6AM TUESDAY STREET CLEANING"
+    )
+    assert evaluate(schedule, _at(0, 14), _at(0, 15))["can_park"] is True
+    assert evaluate(schedule, _at(0, 14), _at(0, 17))["can_park"] is False
+    assert evaluate(schedule, _at(0, 14), _at(0, 17), ["s"])["can_park"] is True
+    # Overnight into Tuesday hits street cleaning even with a permit
+    overnight = evaluate(schedule, _at(0, 23), _at(1, 7), ["S"])
+    assert overnight["can_park"] is False
+    assert overnight["restrictions"][0]["kind"] == "street_cleaning"
+
+
+def test_evaluate_skips_other_weeks_of_the_month():
+    schedule = compile_sign_text("STREET CLEANING 1ST & 3RD MONDAY 8AM-10AM")
+    assert evaluate(schedule, datetime(2026, 10, 5, 9))["can_park"] is False
+    assert evaluate(schedule, datetime(2026, 10, 12, 9))["can_park"] is True
@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+from agent.llm import ContentDelta, ReasoningDelta, StreamDone, ToolCallDelta, ToolCallDone
+from agent.subagents import streaming
+from db.models import EntryKind
+from db.repository import get_session_entries
+
+
+def _fake_stream(events, log=None):
+    async def call_llm_streaming(messages, tools=None, agent_name="orchestrator", effort=None):
+        for event in events:
+            yield event
+            if log is not None:
+                log.append(("yielded", type(event).__name__))
+
+    return call_llm_streaming
+
+
+@pytest.mark.asyncio
+async def test_deltas_are_tagged_and_calls_written_when_complete(
+    db_session, test_session_id, monkeypatch
+):
+    log = []
+
+    async def fake_push(session_id, message):
+        if isinstance(message, bytes):
+            message = json.loads(message)
+        log.append(("push", message["type"], message.get("agent_name")))
+
+    events = [
+        ReasoningDelta(text="Geocoding first"),
+        ToolCallDelta(index=0, call_id="c1", tool_name="mapbox_geocode"),
+        ToolCallDelta(index=0, arguments_chunk='{"query": "20th st"}'),
+        ToolCallDone(index=0, call_id="c1", tool_name="mapbox_geocode", arguments={"query": "20th st"}),
+        ToolCallDelta(index=1, call_id="c2", tool_name="mapbox_geocode"),
+        StreamDone(finish_reason="stop", usage={"model": "m", "input_tokens": 1, "output_tokens": 1}),
+    ]
+    monkeypatch.setattr(streaming, "call_llm_streaming", _fake_stream(events, log))
+    monkeypatch.setattr(streaming, "push_to_client", fake_push)
+
+    response = await streaming.stream_llm_turn([], None, test_session_id, "location_agent")
+
+    assert log[0] == ("push", "reasoning_delta", "location_agent")
+    # The first call reached the client before the stream went on
+    assert log.index(("push", "entry", None)) < log.index(("yielded", "ToolCallDone"))
+    # A call without ToolCallDone is still recorded once the stream ends
+    assert [tc.call_id for tc in response.tool_calls] == ["c1", "c2"]
+    assert response.tool_calls[1].arguments == {}
+    assert response.usage["input_tokens"] == 1
+
+    entries = await get_session_entries(db_session, test_session_id)
+    assert [(e.kind, e.data["call_id"], e.data["agent_name"]) for e in entries] == [
+        (EntryKind.TOOL_CALL, "c1", "location_agent"),
+        (EntryKind.TOOL_CALL, "c2", "location_agent"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_text_response_without_session(monkeypatch):
+    async def fail_push(session_id, message):
+        raise AssertionError("nothing is pushed without a session")
+
+    events = [ContentDelta(text="No "), ContentDelta(text="changes."), StreamDone(finish_reason="stop")]
+    monkeypatch.setattr(streaming, "call_llm_streaming", _fake_stream(events))
+    monkeypatch.setattr(streaming, "push_to_client", fail_push)
+
+    response = await streaming.stream_llm_turn([], None, None, "memory_manager")
+
+    assert response.content == "No changes."
+    assert response.tool_calls is None
@@ -0,0 +1,84 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from agent.llm import ToolCallResult
+from agent.subagents import tool_runner
+from db.models import EntryKind
+from db.repository import get_session_entries
+
+
+def _fake_tool(delay, log):
+    async def run(*, value, **kwargs):
+        log.append(("start", value))
+        await asyncio.sleep(delay)
+        log.append(("end", value))
+        return {"value": value}
+
+    return SimpleNamespace(run=run)
+
+
+@pytest.mark.asyncio
+async def test_runs_concurrently_and_records_in_call_order(
+    db_session, test_session_id, monkeypatch
+):
+    log = []
+    monkeypatch.setitem(tool_runner.TOOL_REGISTRY, "slow", _fake_tool(0.05, log))
+    monkeypatch.setitem(tool_runner.TOOL_REGISTRY, "fast", _fake_tool(0.0, log))
+    calls = [
+        ToolCallResult(call_id="c1", tool_name="slow", arguments={"value": 1}),
+        ToolCallResult(call_id="c2", tool_name="fast", arguments={"value": 2}),
+    ]
+
+    results = await tool_runner.run_tool_calls(calls, test_session_id, "memory_manager")
+
+    assert results == [{"value": 1}, {"value": 2}]
+    # Both started before either finished
+    assert log[:2] == [("start", 1), ("start", 2)]
+
+    entries = await get_session_entries(db_session, test_session_id)
+    assert [(e.kind, e.data["call_id"]) for e in entries] == [
+        (EntryKind.TOOL_CALL, "c1"),
+        (EntryKind.TOOL_CALL, "c2"),
+        (EntryKind.TOOL_RESULT, "c1"),
+        (EntryKind.TOOL_RESULT, "c2"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded(monkeypatch):
+    running = 0
+    peak = 0
+
+    async def run(**kwargs):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return {}
+
+    monkeypatch.setitem(tool_runner.TOOL_REGISTRY, "t", SimpleNamespace(run=run))
+    monkeypatch.setattr(tool_runner.settings, "SUB_AGENT_TOOL_CONCURRENCY", 2)
+    calls = [ToolCallResult(call_id=f"c{i}", tool_name="t", arguments={}) for i in range(5)]
+
+    await tool_runner.run_tool_calls(calls, None, "location_agent")
+    assert peak == 2
+
+
+@pytest.mark.asyncio
+async def test_failing_and_unknown_tools_become_error_results(monkeypatch):
+    async def boom(**kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(tool_runner.TOOL_REGISTRY, "boom", SimpleNamespace(run=boom))
+    calls = [
+        ToolCallResult(call_id="c1", tool_name="boom", arguments={}),
+        ToolCallResult(call_id="c2", tool_name="missing", arguments={}),
+    ]
+    results = await tool_runner.run_tool_calls(calls, None, "location_agent")
+    assert results == [
+        {"error": "Tool execution failed"},
+        {"error": "Unknown tool: missing"},
+    ]
@@ -1,9 +1,20 @@
 import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, patch
 
 import pytest
 
-from tools import read_parking_sign, time_utils
+from config import settings
+from rules.compiler import compile_sign_text
+from tools import (
+    check_parking_rules,
+    ocr_parking_sign,
+    read_parking_sign,
+    search_nearby_signs,
+    time_utils,
+)
 
 
 @pytest.mark.asyncio
@@ -26,3 +37,69 @@ async def test_time_utils():
     result = await time_utils.run()
     assert "datetime" in result
     assert "day_of_week" in result
+
+
+@pytest.mark.asyncio
+async def test_check_parking_rules_uses_override_wall_clock():
+    time_utils.set_override(datetime(2026, 10, 24, 14, 30, tzinfo=timezone.utc))
+    try:
+        now = check_parking_rules._local_now()
+        current = await time_utils.run()
+    finally:
+        time_utils.clear_override()
+    assert now == datetime(2026, 10, 24, 14, 30)
+    assert current["datetime"].startswith(now.isoformat())
+
+
+@pytest.mark.asyncio
+async def test_check_parking_rules_converts_utc_times_to_local(monkeypatch):
+    monkeypatch.setattr(settings, "PARKING_TIMEZONE", "America/Los_Angeles")
+    uploaded = SimpleNamespace(sign_rules=compile_sign_text("NO PARKING 12AM-6AM TUESDAY"))
+
+    @asynccontextmanager
+    async def fake_get_db():
+        yield None
+
+    async def fake_get_uploaded_file(db, file_id):
+        return uploaded
+
+    monkeypatch.setattr("db.database.get_db", fake_get_db)
+    monkeypatch.setattr("db.repository.get_uploaded_file", fake_get_uploaded_file)
+
+    # 10:00 UTC on Tuesday is 03:00 in San Francisco, inside the restriction
+    for at in ("2026-10-20T10:00Z", "2026-10-20T10:00+00:00"):
+        result = await check_parking_rules.run(file_id=str(uuid.uuid4()), at=at)
+        assert result["checked_at"] == "2026-10-20T03:00:00"
+        assert result["can_park"] is False
+
+
+@pytest.mark.asyncio
+async def test_search_window_compares_mixed_offsets_in_local_time(monkeypatch):
+    monkeypatch.setattr(settings, "PARKING_TIMEZONE", "America/Los_Angeles")
+    # 18:00Z is 11:00 in San Francisco, after the naive (local) end
+    result = await search_nearby_signs.run(
+        latitude=37.76,
+        longitude=-122.39,
+        start_time="2026-10-24T18:00Z",
+        end_time="2026-10-24T10:00",
+    )
+    assert result == {"error": "end_time must be after start_time"}
+
+
+@pytest.mark.asyncio
+async def test_ocr_reuses_prefetched_result(monkeypatch):
+    calls = []
+
+    async def fake_ocr(image_bytes):
+        calls.append(image_bytes)
+        return {"signs": ["2 HR PARKING"]}
+
+    monkeypatch.setattr(ocr_parking_sign, "_ocr_image", fake_ocr)
+    file_id = str(uuid.uuid4())
+    ocr_parking_sign.prefetch(file_id, b"image")
+
+    # No DB lookup or disk read: the upload-time result is returned as is
+    result = await ocr_parking_sign.run(file_id=file_id)
+
+    assert result == {"signs": ["2 HR PARKING"]}
+    assert calls == [b"image"]
@@ -0,0 +1,77 @@
+import asyncio
+import uuid
+
+import pytest
+
+from observability import tracing
+from observability.tracing import Span, critical_path
+
+
+def _span(name, start, end, parent=None, span_id=None):
+    return Span(
+        name=name,
+        trace_id="t",
+        parent_id=parent.span_id if parent else None,
+        session_id="s",
+        start=start,
+        end=end,
+        span_id=span_id or name,
+    )
+
+
+def test_critical_path_follows_the_last_finishing_child():
+    root = _span("turn", 0.0, 10.0)
+    spans = [
+        root,
+        _span("llm.stream", 0.5, 3.0, root),
+        # Parallel tools: only the slower one is on the critical path
+        _span("tool.geo_distance", 3.0, 3.2, root),
+        _span("tool.ocr_parking_sign", 3.0, 6.0, root),
+        _span("db.append_entry", 6.0, 6.1, root),
+        _span("llm.stream#2", 6.5, 10.0, root, span_id="llm2"),
+    ]
+    names = [s["name"] for s in critical_path(spans, root)]
+    assert names == [
+        "turn", "llm.stream", "tool.ocr_parking_sign", "db.append_entry", "turn", "llm.stream#2",
+    ]
+
+
+def test_critical_path_follows_children_that_outlive_their_parent():
+    root = _span("turn", 0.0, 10.0)
+    worker = _span("worker.process_entry", 1.0, 4.0, root)
+    continuation = _span("orchestrator.continue_session", 3.5, 10.0, worker)
+    path = critical_path([root, worker, continuation], root)
+    assert [s["name"] for s in path] == ["turn", "worker.process_entry", "orchestrator.continue_session"]
+    assert path[-1]["duration_ms"] == 6500.0
+
+
+@pytest.mark.asyncio
+async def test_spans_follow_tasks_and_attach_to_the_active_turn():
+    session_id = uuid.uuid4()
+    tracing.start_turn(session_id)
+
+    async def worker():
+        # A fresh task with no span in its context, like the session worker
+        tracing.bind_session(session_id)
+        with tracing.span("worker.process_entry"):
+            await asyncio.create_task(tool())
+
+    async def tool():
+        with tracing.span("tool.mapbox_geocode"):
+            await asyncio.sleep(0)
+
+    await asyncio.create_task(worker())
+    tracing.end_turn(session_id)
+
+    (turn,) = tracing.timeline(session_id)
+    assert turn["complete"]
+    spans = {s["name"]: s for s in turn["spans"]}
+    assert spans["worker.process_entry"]["parent_id"] == spans["turn"]["span_id"]
+    assert spans["tool.mapbox_geocode"]["parent_id"] == spans["worker.process_entry"]["span_id"]
+
+
+def test_spans_outside_a_turn_are_not_buffered():
+    session_id = uuid.uuid4()
+    with tracing.span("db.get_session"):
+        pass
+    assert tracing.session_spans(session_id) == []
@@ -0,0 +1,48 @@
+from types import SimpleNamespace
+
+from agent import usage
+from agent.llm import _usage
+from config import settings
+
+
+def test_usage_is_read_from_responses_api_usage():
+    response = SimpleNamespace(
+        model="gpt-5.2",
+        reasoning=SimpleNamespace(effort="low"),
+        usage=SimpleNamespace(
+            input_tokens=1200,
+            input_tokens_details=SimpleNamespace(cached_tokens=1024),
+            output_tokens=300,
+            output_tokens_details=SimpleNamespace(reasoning_tokens=200),
+        ),
+    )
+    assert _usage(response) == {
+        "model": "gpt-5.2",
+        "effort": "low",
+        "input_tokens": 1200,
+        "cached_input_tokens": 1024,
+        "output_tokens": 300,
+        "reasoning_tokens": 200,
+    }
+    assert _usage(SimpleNamespace(model="gpt-5.2", usage=None)) is None
+
+
+def test_cached_input_is_priced_separately(monkeypatch):
+    monkeypatch.setattr(settings, "LLM_INPUT_PRICE_PER_MTOK", 2.0)
+    monkeypatch.setattr(settings, "LLM_CACHED_INPUT_PRICE_PER_MTOK", 0.5)
+    monkeypatch.setattr(settings, "LLM_OUTPUT_PRICE_PER_MTOK", 10.0)
+    row = {"input_tokens": 1_000_000, "cached_input_tokens": 400_000, "output_tokens": 100_000}
+    assert usage.estimate_cost(row) == 1.2 + 0.2 + 1.0
+
+
+def test_total_sums_aggregate_rows():
+    rows = [
+        {"key": "orchestrator", "calls": 3, "input_tokens": 30, "cached_input_tokens": 10,
+         "output_tokens": 6, "reasoning_tokens": 2},
+        {"key": "location_agent", "calls": 1, "input_tokens": 5, "cached_input_tokens": 0,
+         "output_tokens": 1, "reasoning_tokens": 0},
+    ]
+    assert usage.total(rows) == {
+        "calls": 4, "input_tokens": 35, "cached_input_tokens": 10,
+        "output_tokens": 7, "reasoning_tokens": 2,
+    }
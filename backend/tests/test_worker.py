@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+
+from db.models import EntryKind, EntryStatus
+from db.repository import append_entry, get_entry, get_session_entries
+from tools._registry import ACCEPTED_RESULT
+from worker import worker
+from worker.registry import register_batch, remove_slot
+
+
+@pytest.mark.asyncio
+async def test_background_tool_accepts_before_finishing(
+    db_session, test_session_id, monkeypatch
+):
+    release = asyncio.Event()
+    continued = []
+
+    async def slow_tool(tool_name, arguments):
+        await release.wait()
+        return {"summary": "Stored", "actions": []}
+
+    async def fake_continue(session_id):
+        continued.append(session_id)
+
+    monkeypatch.setattr(worker, "execute_tool", slow_tool)
+    monkeypatch.setattr(worker, "continue_session", fake_continue)
+
+    call = await append_entry(
+        db_session,
+        test_session_id,
+        EntryKind.TOOL_CALL,
+        {"call_id": "c1", "tool_name": "store_memory", "arguments": {"relevant_messages": ["x"]}},
+    )
+    register_batch(test_session_id, ["c1"])
+    try:
+        await worker._process_entry(test_session_id, call.id)
+        await asyncio.sleep(0)
+
+        # The orchestrator was re-triggered while the tool is still running
+        assert continued == [test_session_id]
+        entries = await get_session_entries(db_session, test_session_id)
+        results = [e for e in entries if e.kind == EntryKind.TOOL_RESULT]
+        assert [r.data["result"] for r in results] == [ACCEPTED_RESULT]
+        assert (await get_entry(db_session, call.id)).status == EntryStatus.RUNNING
+
+        release.set()
+        await worker.drain_background_tasks()
+
+        entries = await get_session_entries(db_session, test_session_id)
+        sub_results = [e for e in entries if e.kind == EntryKind.SUB_AGENT_RESULT]
+        assert sub_results[0].data["result"]["summary"] == "Stored"
+        assert (await get_entry(db_session, call.id)).status == EntryStatus.DONE
+    finally:
+        remove_slot(test_session_id)
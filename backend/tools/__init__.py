@@ -3,6 +3,7 @@ from tools import (  # noqa: F401 — trigger self-registration
     memory_create, memory_update, memory_delete, memory_list, store_memory,
     mapbox_geocode, geo_midpoint, geo_distance,
     save_parking_sign_location, search_nearby_signs, task_location,
+    check_parking_rules,
 )
 from tools._registry import TOOL_DEFINITIONS, TOOL_REGISTRY
 
@@ -3,12 +3,36 @@ import types
 TOOL_DEFINITIONS: list[dict] = []
 TOOL_REGISTRY: dict[str, types.ModuleType] = {}
 SUB_AGENT_TOOLS: dict[str, str] = {}  # tool_name -> agent display name
+# Fire-and-forget tools: the caller gets an "accepted" result immediately
+BACKGROUND_TOOLS: set[str] = set()
 
+ACCEPTED_RESULT = {"status": "accepted", "summary": "Running in the background."}
 
-def register(definition: dict, module: types.ModuleType, *, agent_name: str | None = None) -> None:
+
+def register(
+    definition: dict,
+    module: types.ModuleType,
+    *,
+    agent_name: str | None = None,
+    background: bool = False,
+) -> None:
     """Register a tool's OpenAI schema and backing module."""
     tool_name = definition["function"]["name"]
     TOOL_DEFINITIONS.append(definition)
     TOOL_REGISTRY[tool_name] = module
     if agent_name:
         SUB_AGENT_TOOLS[tool_name] = agent_name
+    if background:
+        BACKGROUND_TOOLS.add(tool_name)
+
+
+def project_result(tool_name: str, result):
+    """Lean view of a tool result for LLM input; the entry keeps the full result.
+
+    Tool modules opt in by defining ``project(result: dict) -> dict``.
+    Errors are always passed through untouched.
+    """
+    project = getattr(TOOL_REGISTRY.get(tool_name), "project", None)
+    if project is None or not isinstance(result, dict) or "error" in result:
+        return result
+    return project(result)
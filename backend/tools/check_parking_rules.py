@@ -0,0 +1,84 @@
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from tools._registry import register
+from tools.time_utils import get_override, to_parking_local
+
+DEFINITION = {
+    "type": "function",
+    "function": {
+        "name": "check_parking_rules",
+        "description": (
+            "Check a parking sign that was already read with task_read_parking_sign: "
+            "can the user park at a given time or for a given window? Evaluates the sign's "
+            "compiled rules locally. If the result is ambiguous, also reason over the sign text."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "file_id": {
+                    "type": "string",
+                    "description": "The uploaded file ID of the parking sign image.",
+                },
+                "at": {
+                    "type": "string",
+                    "description": (
+                        "Local date and time to check, ISO 8601 (e.g. '2026-10-24T14:30'). "
+                        "Defaults to now."
+                    ),
+                },
+                "duration_minutes": {
+                    "type": "integer",
+                    "description": "How long the user wants to stay. Omit to check a single moment.",
+                },
+                "permits": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Residential permit areas the user holds, e.g. ['S'].",
+                },
+            },
+            "required": ["file_id"],
+        },
+    },
+}
+
+register(DEFINITION, sys.modules[__name__])
+
+
+def _local_now() -> datetime:
+    # The override is the local wall-clock time picked in the UI, not an instant
+    override = get_override()
+    if override is not None:
+        return override.replace(tzinfo=None)
+    return to_parking_local(datetime.now(timezone.utc))
+
+
+async def run(
+    *,
+    file_id: str,
+    at: str | None = None,
+    duration_minutes: int | None = None,
+    permits: list[str] | None = None,
+    **kwargs,
+) -> dict:
+    from db.database import get_db
+    from db.repository import get_uploaded_file
+    from rules.evaluator import evaluate
+
+    async with get_db() as db:
+        uploaded = await get_uploaded_file(db, uuid.UUID(file_id))
+    if not uploaded:
+        return {"error": f"File not found: {file_id}"}
+    if uploaded.sign_rules is None:
+        return {"error": "This sign has not been read yet; call task_read_parking_sign first."}
+
+    try:
+        start = to_parking_local(datetime.fromisoformat(at)) if at else _local_now()
+    except ValueError:
+        return {"error": f"Invalid time: {at}"}
+    end = start + timedelta(minutes=duration_minutes) if duration_minutes else None
+
+    result = evaluate(uploaded.sign_rules, start, end, permits or ())
+    result["checked_at"] = start.replace(tzinfo=None).isoformat()
+    return result
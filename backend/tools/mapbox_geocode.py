@@ -1,16 +1,13 @@
-import json
 import logging
 import sys
-import urllib.parse
-import urllib.request
+
+import httpx
 
 from config import settings
 from tools._registry import register
 
 logger = logging.getLogger(__name__)
 
-GEOCODE_URL = "https://api.mapbox.com/search/geocode/v6/forward"
-
 DEFINITION = {
     "type": "function",
     "function": {
@@ -53,12 +50,11 @@ async def run(*, query: str, proximity: str | None = None, **kwargs) -> dict:
     if proximity:
         params["proximity"] = proximity
 
-    url = f"{GEOCODE_URL}?{urllib.parse.urlencode(params)}"
-
     try:
-        req = urllib.request.Request(url)
-        with urllib.request.urlopen(req) as resp:
-            data = json.loads(resp.read().decode())
+        async with httpx.AsyncClient(timeout=10) as client:
+            resp = await client.get(settings.MAPBOX_GEOCODE_URL, params=params)
+            resp.raise_for_status()
+            data = resp.json()
     except Exception as e:
         logger.exception("Mapbox geocode request failed")
         return {"error": str(e)}
@@ -77,3 +73,8 @@ async def run(*, query: str, proximity: str | None = None, **kwargs) -> dict:
         "full_address": props.get("full_address", ""),
         "name": props.get("name", ""),
     }
+
+
+def project(result: dict) -> dict:
+    """``name`` is a prefix of ``full_address``."""
+    return {k: v for k, v in result.items() if k != "name"}
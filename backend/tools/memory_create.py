@@ -24,10 +24,12 @@ register(DEFINITION, sys.modules[__name__])
 
 
 async def run(*, content: str, **kwargs) -> dict:
+    from agent.memory_cache import invalidate
     from db.database import get_db
     from db.repository import create_memory
 
     async with get_db() as db:
         memory = await create_memory(db, content)
+    await invalidate()
 
     return {"id": str(memory.id), "content": memory.content}
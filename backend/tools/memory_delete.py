@@ -25,11 +25,14 @@ register(DEFINITION, sys.modules[__name__])
 
 
 async def run(*, memory_id: str, **kwargs) -> dict:
+    from agent.memory_cache import invalidate
     from db.database import get_db
     from db.repository import delete_memory
 
     async with get_db() as db:
         deleted = await delete_memory(db, uuid.UUID(memory_id))
+    if deleted:
+        await invalidate()
 
     if not deleted:
         return {"error": f"Memory {memory_id} not found"}
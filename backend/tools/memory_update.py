@@ -29,13 +29,18 @@ register(DEFINITION, sys.modules[__name__])
 
 
 async def run(*, memory_id: str, content: str, **kwargs) -> dict:
+    from agent.memory_cache import invalidate
     from db.database import get_db
     from db.repository import update_memory
 
     async with get_db() as db:
         memory = await update_memory(db, uuid.UUID(memory_id), content)
+    if memory is not None:
+        await invalidate()
 
     if memory is None:
         return {"error": f"Memory {memory_id} not found"}
 
+    if memory.id != uuid.UUID(memory_id):
+        return {"id": str(memory.id), "content": memory.content, "merged_into_existing": True}
     return {"id": str(memory.id), "content": memory.content}
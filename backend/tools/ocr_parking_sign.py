@@ -1,6 +1,9 @@
+import asyncio
+import logging
 import sys
 import uuid
 import base64
+from collections import OrderedDict
 
 import httpx
 
@@ -33,16 +36,46 @@ DEFINITION = {
 
 register(DEFINITION, sys.modules[__name__])
 
-ROBOFLOW_WORKSPACE = "robolook"
-ROBOFLOW_WORKFLOW_ID = "parking-sign"
-ROBOFLOW_WORKFLOW_URL = (
-    f"https://detect.roboflow.com/infer/workflows/"
-    f"{ROBOFLOW_WORKSPACE}/{ROBOFLOW_WORKFLOW_ID}"
-)
+logger = logging.getLogger(__name__)
+
+# file_id -> OCR started at upload time; oldest dropped past the limit
+_MAX_PREFETCHED = 64
+_prefetched: OrderedDict[str, asyncio.Task] = OrderedDict()
+
+
+def _log_prefetch_failure(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Speculative OCR failed: %s", task.exception())
+
+
+def prefetch(file_id: str, image_bytes: bytes) -> None:
+    """Start OCR for a just-uploaded image so ``run`` can reuse the result."""
+    task = asyncio.create_task(_ocr_image(image_bytes))
+    task.add_done_callback(_log_prefetch_failure)
+    _prefetched[file_id] = task
+    while len(_prefetched) > _MAX_PREFETCHED:
+        _, evicted = _prefetched.popitem(last=False)
+        evicted.cancel()
+
+
+async def _take_prefetched(file_id: str) -> dict | None:
+    task = _prefetched.get(file_id)
+    if task is None:
+        return None
+    try:
+        return await asyncio.shield(task)
+    except Exception:
+        # Drop the failed attempt; the caller retries normally
+        _prefetched.pop(file_id, None)
+        return None
 
 
 async def run(*, file_id: str, **kwargs) -> dict:
     """Read image from DB/disk, send to Roboflow workflow, return OCR results."""
+    prefetched = await _take_prefetched(file_id)
+    if prefetched is not None:
+        return prefetched
+
     file_uuid = uuid.UUID(file_id)
 
     # 1. Look up the uploaded file record
@@ -59,6 +92,10 @@ async def run(*, file_id: str, **kwargs) -> dict:
     path = storage.upload_dir / storage_key
     async with aiofiles.open(path, "rb") as f:
         image_bytes = await f.read()
+    return await _ocr_image(image_bytes)
+
+
+async def _ocr_image(image_bytes: bytes) -> dict:
     image_b64 = base64.b64encode(image_bytes).decode("ascii")
 
     # 3. Call Roboflow workflow API
@@ -73,7 +110,7 @@ async def run(*, file_id: str, **kwargs) -> dict:
     }
 
     async with httpx.AsyncClient(timeout=60) as client:
-        resp = await client.post(ROBOFLOW_WORKFLOW_URL, json=payload)
+        resp = await client.post(settings.ROBOFLOW_WORKFLOW_URL, json=payload)
         resp.raise_for_status()
         result = resp.json()
 
@@ -29,3 +29,8 @@ async def run(*, file_id: str, session_id: uuid.UUID | None = None, call_id: str
     from agent.subagents.parking_sign_reader import run_agent
 
     return await run_agent(uploaded_file_id=uuid.UUID(file_id), session_id=session_id)
+
+
+def project(result: dict) -> dict:
+    """The compiled rules are for check_parking_rules, not for the model to read."""
+    return {k: v for k, v in result.items() if k != "rules"}
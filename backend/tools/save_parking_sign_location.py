@@ -53,6 +53,7 @@ async def run(
 ) -> dict:
     from db.database import get_db
     from db.repository import create_parking_sign_location
+    from rules.compiler import compile_sign_text
 
     async with get_db() as db:
         location = await create_parking_sign_location(
@@ -62,6 +63,7 @@ async def run(
             longitude=longitude,
             description=description,
             sign_text=sign_text,
+            rules=compile_sign_text(sign_text),
         )
 
     return {
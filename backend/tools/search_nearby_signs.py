@@ -1,8 +1,10 @@
 import math
 import sys
+from datetime import datetime
 
 from config import settings
 from tools._registry import register
+from tools.time_utils import to_parking_local
 
 DEFINITION = {
     "type": "function",
@@ -10,7 +12,9 @@ DEFINITION = {
         "name": "search_nearby_signs",
         "description": (
             "Search for saved parking sign locations near a given point. "
-            "Returns results sorted by distance with pagination."
+            "Returns results sorted by distance with pagination. "
+            "With start_time and end_time, only returns signs where parking is legal "
+            "for that whole window."
         ),
         "parameters": {
             "type": "object",
@@ -35,6 +39,14 @@ DEFINITION = {
                     "type": "integer",
                     "description": "Results per page (default 5).",
                 },
+                "start_time": {
+                    "type": "string",
+                    "description": "Local start of the parking window, ISO 8601 (e.g. '2026-10-24T18:00').",
+                },
+                "end_time": {
+                    "type": "string",
+                    "description": "Local end of the parking window, ISO 8601.",
+                },
             },
             "required": ["latitude", "longitude"],
         },
@@ -44,6 +56,7 @@ DEFINITION = {
 register(DEFINITION, sys.modules[__name__])
 
 EARTH_RADIUS_METERS = 6_371_000
+METERS_PER_DEGREE_LAT = 111_320
 
 
 def _haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
@@ -58,6 +71,14 @@ def _haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     return EARTH_RADIUS_METERS * c
 
 
+def _bbox(latitude: float, longitude: float, radius_meters: float) -> tuple[float, float, float, float]:
+    """(min_lat, max_lat, min_lon, max_lon) enclosing the search circle."""
+    dlat = radius_meters / METERS_PER_DEGREE_LAT
+    cos_lat = max(math.cos(math.radians(latitude)), 1e-6)
+    dlon = min(radius_meters / (METERS_PER_DEGREE_LAT * cos_lat), 180.0)
+    return latitude - dlat, latitude + dlat, longitude - dlon, longitude + dlon
+
+
 async def run(
     *,
     latitude: float,
@@ -65,45 +86,95 @@ async def run(
     radius_meters: float = 1600,
     page: int = 1,
     page_size: int = 5,
+    start_time: str | None = None,
+    end_time: str | None = None,
     **kwargs,
 ) -> dict:
     from db.database import get_db
-    from db.repository import list_parking_sign_locations, get_uploaded_file
+    from db.repository import get_uploaded_file, list_parking_sign_locations_in_bbox
+    from rules.availability import from_hex, is_available, window_mask
+
+    window = None
+    if start_time or end_time:
+        try:
+            window_start = to_parking_local(datetime.fromisoformat(start_time or ""))
+            window_end = to_parking_local(datetime.fromisoformat(end_time or ""))
+        except ValueError:
+            return {"error": "start_time and end_time must both be ISO 8601 datetimes"}
+        if window_end <= window_start:
+            return {"error": "end_time must be after start_time"}
+        window = window_mask(window_start, window_end)
 
     async with get_db() as db:
-        all_locations = await list_parking_sign_locations(db)
+        candidates = await list_parking_sign_locations_in_bbox(
+            db, *_bbox(latitude, longitude, radius_meters)
+        )
 
-        results = []
-        for loc in all_locations:
+        unknown_rules = 0
+        matches = []
+        for loc in candidates:
             dist = _haversine(latitude, longitude, loc.latitude, loc.longitude)
-            if dist <= radius_meters:
-                # Build image URL from uploaded file's storage key
-                uploaded_file = await get_uploaded_file(db, loc.uploaded_file_id)
-                image_url = ""
-                if uploaded_file:
-                    image_url = f"{settings.BASE_URL}/uploads/{uploaded_file.storage_key}"
-
-                results.append({
-                    "id": str(loc.id),
-                    "latitude": loc.latitude,
-                    "longitude": loc.longitude,
-                    "description": loc.description,
-                    "sign_text": loc.sign_text,
-                    "distance_meters": round(dist, 1),
-                    "distance_miles": round(dist / 1609.344, 3),
-                    "image_url": image_url,
-                })
-
-    results.sort(key=lambda r: r["distance_meters"])
-
-    total_results = len(results)
-    total_pages = max(1, math.ceil(total_results / page_size))
-    start = (page - 1) * page_size
-    end = start + page_size
+            if dist > radius_meters:
+                continue
+            if window is not None:
+                if loc.forbidden_mask is None:
+                    unknown_rules += 1
+                    continue
+                if not is_available(
+                    from_hex(loc.forbidden_mask),
+                    from_hex(loc.limited_mask),
+                    loc.limit_minutes,
+                    window,
+                ):
+                    continue
+            matches.append((dist, loc))
 
-    return {
-        "results": results[start:end],
+        matches.sort(key=lambda m: m[0])
+        total_results = len(matches)
+        total_pages = max(1, math.ceil(total_results / page_size))
+        start = (page - 1) * page_size
+
+        results = []
+        for dist, loc in matches[start:start + page_size]:
+            # Build image URL from uploaded file's storage key
+            uploaded_file = await get_uploaded_file(db, loc.uploaded_file_id)
+            image_url = ""
+            if uploaded_file:
+                image_url = f"{settings.BASE_URL}/uploads/{uploaded_file.storage_key}"
+
+            results.append({
+                "id": str(loc.id),
+                "latitude": loc.latitude,
+                "longitude": loc.longitude,
+                "description": loc.description,
+                "sign_text": loc.sign_text,
+                "distance_meters": round(dist, 1),
+                "distance_miles": round(dist / 1609.344, 3),
+                "image_url": image_url,
+            })
+
+    response = {
+        "results": results,
         "page": page,
         "total_pages": total_pages,
         "total_results": total_results,
     }
+    if window is not None:
+        # Signs whose rules couldn't be compiled; their text needs a manual check
+        response["unknown_rules"] = unknown_rules
+    return response
+
+
+def project(result: dict) -> dict:
+    """Drop image URLs, coordinates, IDs and the duplicated miles field."""
+    return {
+        **result,
+        "results": [
+            {
+                "description": r["description"],
+                "sign_text": r["sign_text"],
+                "distance_meters": r["distance_meters"],
+            }
+            for r in result.get("results", [])
+        ],
+    }
@@ -26,10 +26,16 @@ DEFINITION = {
     },
 }
 
-register(DEFINITION, sys.modules[__name__], agent_name="memory_manager")
+# Nothing in the reply depends on the outcome, so don't make the user wait for it
+register(DEFINITION, sys.modules[__name__], agent_name="memory_manager", background=True)
 
 
 async def run(*, relevant_messages: list[str], session_id: uuid.UUID | None = None, call_id: str | None = None, **kwargs) -> dict:
     from agent.subagents.memory_manager import run_agent
 
     return await run_agent(relevant_messages=relevant_messages, session_id=session_id)
+
+
+def project(result: dict) -> dict:
+    """The raw memory rows in ``actions`` only restate what the summary says was stored."""
+    return {"summary": result.get("summary", "")}
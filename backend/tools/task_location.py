@@ -57,3 +57,8 @@ async def run(
         uploaded_file_id=uploaded_file_id,
         sign_text=sign_text,
     )
+
+
+def project(result: dict) -> dict:
+    """The summary already describes the saved or found signs; ``actions`` is raw tool JSON."""
+    return {"summary": result.get("summary", "")}
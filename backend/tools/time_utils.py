@@ -1,6 +1,8 @@
 import sys
 from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
 
+from config import settings
 from tools._registry import register
 
 DEFINITION = {
@@ -31,6 +33,13 @@ def clear_override() -> None:
     _override_dt = None
 
 
+def to_parking_local(value: datetime) -> datetime:
+    """Naive wall-clock time in PARKING_TIMEZONE; naive input is taken as local already."""
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(ZoneInfo(settings.PARKING_TIMEZONE)).replace(tzinfo=None)
+
+
 async def run(**kwargs) -> dict:
     """Return the current date and time in UTC (or the override if set)."""
     now = _override_dt if _override_dt is not None else datetime.now(timezone.utc)
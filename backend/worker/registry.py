@@ -1,9 +1,13 @@
 import asyncio
+import time
 import uuid
 from dataclasses import dataclass, field
 
 from fastapi import WebSocket
 
+from interface import wire
+from observability import metrics, tracing
+
 
 class ToolBatch:
     """Tracks which tool calls are still outstanding for one LLM response."""
@@ -22,11 +26,18 @@ class SessionSlot:
     queue: asyncio.Queue = field(default_factory=asyncio.Queue)
     websocket: WebSocket | None = None
     batch: ToolBatch | None = None
+    # While a reconnecting client is being sent what it missed, live pushes
+    # are parked here so they reach the socket after the replay, in order.
+    replay_buffer: list[dict | bytes] | None = None
 
 
 _slots: dict[uuid.UUID, SessionSlot] = {}
 
 
+def active_slots() -> dict[uuid.UUID, SessionSlot]:
+    return _slots
+
+
 def get_or_create_slot(session_id: uuid.UUID) -> SessionSlot:
     if session_id not in _slots:
         _slots[session_id] = SessionSlot()
@@ -40,13 +51,38 @@ def set_websocket(session_id: uuid.UUID, ws: WebSocket | None) -> None:
 
 def enqueue_entry(session_id: uuid.UUID, entry_id: uuid.UUID) -> None:
     slot = get_or_create_slot(session_id)
+    tracing.mark_enqueued(entry_id)
     slot.queue.put_nowait(entry_id)
 
 
-async def push_to_client(session_id: uuid.UUID, data: dict) -> None:
+async def push_to_client(session_id: uuid.UUID, data: dict | bytes) -> None:
+    """Send a message to the session's client; ``data`` may be pre-encoded, see entry_frame."""
+    slot = _slots.get(session_id)
+    if slot and slot.replay_buffer is not None:
+        slot.replay_buffer.append(data)
+    elif slot and slot.websocket:
+        started = time.perf_counter()
+        await wire.send(slot.websocket, data)
+        metrics.WS_SEND_SECONDS.observe(time.perf_counter() - started)
+
+
+def begin_replay(session_id: uuid.UUID) -> None:
+    """Start buffering live pushes while missed entries are replayed."""
+    slot = get_or_create_slot(session_id)
+    slot.replay_buffer = []
+
+
+async def finish_replay(session_id: uuid.UUID) -> None:
+    """Flush pushes buffered during the replay, then switch to live streaming."""
     slot = _slots.get(session_id)
-    if slot and slot.websocket:
-        await slot.websocket.send_json(data)
+    if not slot or slot.replay_buffer is None:
+        return
+    # Pushes may keep arriving while we await sends; drain until empty.
+    while slot.replay_buffer:
+        data = slot.replay_buffer.pop(0)
+        if slot.websocket:
+            await wire.send(slot.websocket, data)
+    slot.replay_buffer = None
 
 
 def register_batch(session_id: uuid.UUID, call_ids: list[str]) -> None:
@@ -67,4 +103,9 @@ def mark_batch_done(session_id: uuid.UUID, call_id: str) -> bool:
 
 
 def remove_slot(session_id: uuid.UUID) -> None:
-    _slots.pop(session_id, None)
+    slot = _slots.pop(session_id, None)
+    if slot is None:
+        return
+    # Entries still queued will never be dequeued; forget when they were queued
+    while not slot.queue.empty():
+        tracing.take_enqueued(slot.queue.get_nowait())
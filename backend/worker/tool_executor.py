@@ -1,3 +1,4 @@
+from observability import tracing
 from tools import TOOL_REGISTRY
 
 
@@ -6,4 +7,5 @@ async def execute_tool(tool_name: str, arguments: dict) -> dict:
     module = TOOL_REGISTRY.get(tool_name)
     if module is None:
         return {"error": f"Unknown tool: {tool_name}"}
-    return await module.run(**arguments)
+    with tracing.span(f"tool.{tool_name}"):
+        return await module.run(**arguments)
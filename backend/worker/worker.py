@@ -8,22 +8,31 @@ from worker.tool_executor import execute_tool
 from db.database import get_db
 from db.models import EntryKind, EntryStatus
 from db.repository import append_entry, get_entry, mark_entry_status
-from interface.models import entry_to_wire
-from tools._registry import SUB_AGENT_TOOLS
+from interface.models import entry_frame
+from observability import metrics, tracing
+from tools._registry import ACCEPTED_RESULT, BACKGROUND_TOOLS, SUB_AGENT_TOOLS
 
 logger = logging.getLogger(__name__)
 
+# Strong references to in-flight background tools so they aren't collected
+_background_tasks: set[asyncio.Task] = set()
+
 
 async def run_worker(session_id: uuid.UUID, queue: asyncio.Queue) -> None:
     """Per-session async loop. Processes pending executable entries."""
+    tracing.bind_session(session_id)
     while True:
         entry_id: uuid.UUID = await queue.get()
+        queued_at = tracing.take_enqueued(entry_id)
+        if queued_at is not None:
+            tracing.record("worker.queue_wait", queued_at)
         try:
             await _process_entry(session_id, entry_id)
         except Exception:
             logger.exception("Worker error processing entry %s", entry_id)
 
 
+@tracing.traced("worker.process_entry")
 async def _process_entry(session_id: uuid.UUID, entry_id: uuid.UUID) -> None:
     # Mark as running
     async with get_db() as db:
@@ -40,6 +49,7 @@ async def _process_entry(session_id: uuid.UUID, entry_id: uuid.UUID) -> None:
             call_id = entry.data["call_id"]
             arguments = entry.data.get("arguments", {})
             agent_name = SUB_AGENT_TOOLS.get(tool_name)
+            tracing.current_span().set(tool=tool_name)
 
             # If this is a sub-agent tool, create a SUB_AGENT_CALL entry
             sub_agent_call_entry = None
@@ -49,53 +59,61 @@ async def _process_entry(session_id: uuid.UUID, entry_id: uuid.UUID) -> None:
                     sub_agent_call_entry = await append_entry(
                         db, session_id, EntryKind.SUB_AGENT_CALL, sub_agent_call_data
                     )
-                await push_to_client(session_id, entry_to_wire(sub_agent_call_entry))
+                await push_to_client(session_id, entry_frame(sub_agent_call_entry))
 
             # Pass session_id to sub-agent tools so they can write their own entries
             if agent_name:
-                result = await execute_tool(
-                    tool_name, {**arguments, "session_id": session_id, "call_id": call_id}
+                arguments = {**arguments, "session_id": session_id, "call_id": call_id}
+
+            if tool_name in BACKGROUND_TOOLS:
+                # The orchestrator continues on an "accepted" result; the tool
+                # call entry stays running until the work actually finishes.
+                async with get_db() as db:
+                    result_entry = await append_entry(
+                        db,
+                        session_id,
+                        EntryKind.TOOL_RESULT,
+                        {"call_id": call_id, "result": ACCEPTED_RESULT},
+                    )
+                await push_to_client(session_id, entry_frame(result_entry))
+                task = asyncio.create_task(
+                    _run_background(
+                        session_id, entry_id, call_id, tool_name, arguments,
+                        sub_agent_call_entry,
+                    )
                 )
+                _background_tasks.add(task)
+                task.add_done_callback(_background_tasks.discard)
             else:
                 result = await execute_tool(tool_name, arguments)
+                await _record_sub_agent_result(session_id, call_id, result, sub_agent_call_entry)
 
-            result_kind = EntryKind.TOOL_RESULT
-            result_data = {"call_id": call_id, "result": result}
-
-            # If this is a sub-agent tool, create a SUB_AGENT_RESULT entry
-            if agent_name and sub_agent_call_entry:
-                sub_agent_result_data = {"call_id": call_id, "result": result}
+                # Write result entry and mark original as done
                 async with get_db() as db:
-                    sub_agent_result_entry = await append_entry(
-                        db, session_id, EntryKind.SUB_AGENT_RESULT, sub_agent_result_data
+                    result_entry = await append_entry(
+                        db,
+                        session_id,
+                        EntryKind.TOOL_RESULT,
+                        {"call_id": call_id, "result": result},
                     )
-                    await mark_entry_status(db, sub_agent_call_entry.id, EntryStatus.DONE)
-                await push_to_client(session_id, entry_to_wire(sub_agent_result_entry))
+                    await mark_entry_status(db, entry_id, EntryStatus.DONE)
+
+                await push_to_client(session_id, entry_frame(result_entry))
                 await push_to_client(
                     session_id,
-                    {"type": "status", "entry_id": str(sub_agent_call_entry.id), "status": "done"},
+                    {"type": "status", "entry_id": str(entry_id), "status": "done"},
                 )
 
         else:
             return
 
-        # Write result entry and mark original as done
-        async with get_db() as db:
-            result_entry = await append_entry(db, session_id, result_kind, result_data)
-            await mark_entry_status(db, entry_id, EntryStatus.DONE)
-
-        await push_to_client(session_id, entry_to_wire(result_entry))
-        await push_to_client(
-            session_id,
-            {"type": "status", "entry_id": str(entry_id), "status": "done"},
-        )
-
         # Re-trigger orchestrator when all tool calls in this batch are done
         if mark_batch_done(session_id, entry.data["call_id"]):
             asyncio.create_task(continue_session(session_id))
 
     except Exception:
         logger.exception("Failed to process entry %s", entry_id)
+        metrics.FAILED_ENTRIES.labels(entry.data.get("tool_name", entry.kind.value)).inc()
         async with get_db() as db:
             await mark_entry_status(db, entry_id, EntryStatus.FAILED)
             # Write an error TOOL_RESULT so the message history stays valid
@@ -110,7 +128,7 @@ async def _process_entry(session_id: uuid.UUID, entry_id: uuid.UUID) -> None:
                         "result": {"error": "Tool execution failed"},
                     },
                 )
-                await push_to_client(session_id, entry_to_wire(error_entry))
+                await push_to_client(session_id, entry_frame(error_entry))
         await push_to_client(
             session_id,
             {"type": "status", "entry_id": str(entry_id), "status": "failed"},
@@ -118,3 +136,57 @@ async def _process_entry(session_id: uuid.UUID, entry_id: uuid.UUID) -> None:
         if entry.kind == EntryKind.TOOL_CALL:
             if mark_batch_done(session_id, entry.data["call_id"]):
                 asyncio.create_task(continue_session(session_id))
+
+
+async def _record_sub_agent_result(
+    session_id: uuid.UUID, call_id: str, result: dict, sub_agent_call_entry
+) -> None:
+    """Close out a SUB_AGENT_CALL entry with its SUB_AGENT_RESULT."""
+    if sub_agent_call_entry is None:
+        return
+    async with get_db() as db:
+        sub_agent_result_entry = await append_entry(
+            db, session_id, EntryKind.SUB_AGENT_RESULT, {"call_id": call_id, "result": result}
+        )
+        await mark_entry_status(db, sub_agent_call_entry.id, EntryStatus.DONE)
+    await push_to_client(session_id, entry_frame(sub_agent_result_entry))
+    await push_to_client(
+        session_id,
+        {"type": "status", "entry_id": str(sub_agent_call_entry.id), "status": "done"},
+    )
+
+
+async def _run_background(
+    session_id: uuid.UUID,
+    entry_id: uuid.UUID,
+    call_id: str,
+    tool_name: str,
+    arguments: dict,
+    sub_agent_call_entry,
+) -> None:
+    """Run a fire-and-forget tool after its accepted result has been written."""
+    status = EntryStatus.DONE
+    try:
+        result = await execute_tool(tool_name, arguments)
+    except Exception:
+        logger.exception("Background tool %s failed for entry %s", tool_name, entry_id)
+        result = {"error": "Tool execution failed"}
+        status = EntryStatus.FAILED
+        metrics.FAILED_ENTRIES.labels(tool_name).inc()
+
+    try:
+        await _record_sub_agent_result(session_id, call_id, result, sub_agent_call_entry)
+        async with get_db() as db:
+            await mark_entry_status(db, entry_id, status)
+        await push_to_client(
+            session_id,
+            {"type": "status", "entry_id": str(entry_id), "status": status.value},
+        )
+    except Exception:
+        logger.exception("Failed to record background result for entry %s", entry_id)
+
+
+async def drain_background_tasks() -> None:
+    """Wait for in-flight background tools, e.g. before shutdown."""
+    if _background_tasks:
+        await asyncio.gather(*_background_tasks, return_exceptions=True)
@@ -1,8 +1,16 @@
 import { useState, useRef, useEffect, useCallback, FormEvent } from "react";
 import { useParams, useNavigate } from "react-router-dom";
 import ReactMarkdown from "react-markdown";
-import { Entry, isMessageEntry } from "./types";
-import { buildResultByCallId, visibleEntries, getResultEntry } from "./entries";
+import { Entry, SubAgentCallData, ToolCallData, isMessageEntry } from "./types";
+import {
+  advanceCursor,
+  appendSubAgentDelta,
+  buildResultByCallId,
+  clearSubAgentStream,
+  getResultEntry,
+  SubAgentStream,
+  visibleEntries,
+} from "./entries";
 import { MessageBubble } from "./components/MessageBubble";
 import { EventCard } from "./components/EventCard";
 import { Menu, Paperclip, Settings, X } from "lucide-react";
@@ -15,6 +23,7 @@ interface Memory {
 }
 
 const API_BASE = "/api";
+const ENTRIES_PAGE_SIZE = 200;
 const WS_BASE = `${window.location.protocol === "https:" ? "wss:" : "ws:"}//${window.location.host}`;
 
 function App() {
@@ -40,10 +49,18 @@ function App() {
   const dragCounterRef = useRef(0);
   const [streamingReasoning, setStreamingReasoning] = useState<string | null>(null);
   const [streamingContent, setStreamingContent] = useState<string | null>(null);
+  // Sub-agent deltas, per agent, kept apart from the orchestrator's answer
+  const [subAgentStreams, setSubAgentStreams] = useState<Record<string, SubAgentStream>>({});
+  // call_id → agent_name of sub_agent_call entries, to clear streams on their result
+  const subAgentCallsRef = useRef<Map<string, string>>(new Map());
   const messagesEndRef = useRef<HTMLDivElement>(null);
   const inputRef = useRef<HTMLInputElement>(null);
   const fileInputRef = useRef<HTMLInputElement>(null);
   const wsRef = useRef<WebSocket | null>(null);
+  // Resume cursor: updatedAt of the newest entry we hold, sent as ?since= on reconnect
+  const cursorRef = useRef<string | null>(null);
+  const reconnectTimerRef = useRef<number | null>(null);
+  const reconnectAttemptsRef = useRef(0);
   const pendingMessageRef = useRef<{ content: string; file_id?: string } | null>(null);
 
   // Send datetime override to backend
@@ -107,33 +124,60 @@ function App() {
   // Scroll to bottom when entries or streaming state change
   useEffect(() => {
     messagesEndRef.current?.scrollIntoView({ behavior: "smooth" });
-  }, [entries, debugMode, streamingReasoning, streamingContent]);
+  }, [entries, debugMode, streamingReasoning, streamingContent, subAgentStreams]);
 
   // Load existing entries when navigating to a session
   useEffect(() => {
+    cursorRef.current = null;
     if (!sessionId) return;
     (async () => {
       try {
-        const res = await fetch(`${API_BASE}/sessions/${sessionId}/entries`);
-        if (res.ok) {
+        // Page through the transcript by seq so long sessions load incrementally
+        const loaded: Entry[] = [];
+        let afterSeq = 0;
+        while (true) {
+          const res = await fetch(
+            `${API_BASE}/sessions/${sessionId}/entries?after_seq=${afterSeq}&limit=${ENTRIES_PAGE_SIZE}`
+          );
+          if (!res.ok) break;
           const data = await res.json();
-          setEntries(
-            data.map((e: any) => ({
+          loaded.push(
+            ...data.map((e: any) => ({
               id: e.id,
               sessionId: e.session_id,
+              seq: e.seq,
               kind: e.kind,
               data: e.data,
               createdAt: e.created_at,
+              updatedAt: e.updated_at,
               status: e.status,
             }))
           );
+          if (data.length < ENTRIES_PAGE_SIZE) break;
+          afterSeq = data[data.length - 1].seq;
         }
+        cursorRef.current = loaded.reduce<string | null>(
+          (cursor, e) => advanceCursor(cursor, e),
+          cursorRef.current
+        );
+        setEntries(loaded);
       } catch {
         // Session may be new with no entries yet
       }
     })();
   }, [sessionId]);
 
+  // Close the socket on purpose (no auto-reconnect)
+  const closeWebSocket = useCallback(() => {
+    if (reconnectTimerRef.current !== null) {
+      clearTimeout(reconnectTimerRef.current);
+      reconnectTimerRef.current = null;
+    }
+    const ws = wsRef.current;
+    wsRef.current = null;
+    ws?.close();
+  }, []);
+
   // WebSocket connection management
   const connectWebSocket = useCallback(
     (sid: string) => {
@@ -141,10 +185,13 @@ function App() {
         wsRef.current.close();
       }
 
-      const ws = new WebSocket(`${WS_BASE}/ws/${sid}`);
+      // Reconnects resume from the cursor instead of refetching the transcript
+      const since = cursorRef.current ? `?since=${encodeURIComponent(cursorRef.current)}` : "";
+      const ws = new WebSocket(`${WS_BASE}/ws/${sid}${since}`);
       wsRef.current = ws;
 
       ws.onopen = () => {
+        reconnectAttemptsRef.current = 0;
         // If we have a pending message (from session creation), send it now
         if (pendingMessageRef.current) {
           ws.send(JSON.stringify(pendingMessageRef.current));
@@ -154,13 +201,22 @@ function App() {
 
       ws.onmessage = (event) => {
         const msg = JSON.parse(event.data);
+        const subAgent = msg.agent_name && msg.agent_name !== "orchestrator" ? msg.agent_name : null;
 
         if (msg.type === "reasoning_delta") {
-          setStreamingReasoning((prev) => (prev ?? "") + msg.text);
+          if (subAgent) {
+            setSubAgentStreams((prev) => appendSubAgentDelta(prev, subAgent, "reasoning", msg.text));
+          } else {
+            setStreamingReasoning((prev) => (prev ?? "") + msg.text);
+          }
         }
 
         if (msg.type === "content_delta") {
-          setStreamingContent((prev) => (prev ?? "") + msg.text);
+          if (subAgent) {
+            setSubAgentStreams((prev) => appendSubAgentDelta(prev, subAgent, "content", msg.text));
+          } else {
+            setStreamingContent((prev) => (prev ?? "") + msg.text);
+          }
         }
 
         if (msg.type === "entry") {
@@ -168,11 +224,14 @@ function App() {
           const entry: Entry = {
             id: e.id,
             sessionId: e.session_id,
+            seq: e.seq,
             kind: e.kind,
             data: e.data,
             createdAt: e.created_at,
+            updatedAt: e.updated_at,
             status: e.status,
           };
+          cursorRef.current = advanceCursor(cursorRef.current, entry);
           // Clear streaming buffers when finalized entries arrive
           if (entry.kind === "reasoning") {
             setStreamingReasoning(null);
@@ -180,6 +239,23 @@ function App() {
           if (entry.kind === "assistant_message") {
             setStreamingContent(null);
           }
+          // A sub-agent's LLM call is over once its tool calls or result arrive
+          if (entry.kind === "tool_call") {
+            const agentName = (entry.data as ToolCallData).agent_name;
+            if (agentName && agentName !== "orchestrator") {
+              setSubAgentStreams((prev) => clearSubAgentStream(prev, agentName));
+            }
+          }
+          if (entry.kind === "sub_agent_call") {
+            const d = entry.data as SubAgentCallData;
+            subAgentCallsRef.current.set(d.call_id, d.agent_name);
+          }
+          if (entry.kind === "sub_agent_result") {
+            const agentName = subAgentCallsRef.current.get((entry.data as { call_id: string }).call_id);
+            if (agentName) {
+              setSubAgentStreams((prev) => clearSubAgentStream(prev, agentName));
+            }
+          }
           setEntries((prev) => {
             // Replace if entry already exists (status update), otherwise append
             const idx = prev.findIndex((p) => p.id === entry.id);
@@ -207,13 +283,23 @@ function App() {
         if (msg.type === "turn_complete") {
           setStreamingReasoning(null);
           setStreamingContent(null);
+          setSubAgentStreams({});
           setLoading(false);
           fetchMemories();
         }
       };
 
-      ws.onclose = () => {
+      ws.onclose = (event) => {
+        // Superseded by a newer socket or closed on purpose
+        if (wsRef.current !== ws) return;
         wsRef.current = null;
+        if (event.code === 4004 || event.code === 4400) return;
+        const delay = Math.min(30000, 1000 * 2 ** reconnectAttemptsRef.current);
+        reconnectAttemptsRef.current++;
+        reconnectTimerRef.current = window.setTimeout(() => {
+          reconnectTimerRef.current = null;
+          connectWebSocket(sid);
+        }, delay);
       };
 
       ws.onerror = () => {
@@ -227,11 +313,8 @@ function App() {
   useEffect(() => {
     if (!sessionId) return;
     connectWebSocket(sessionId);
-    return () => {
-      wsRef.current?.close();
-      wsRef.current = null;
-    };
-  }, [sessionId, connectWebSocket]);
+    return closeWebSocket;
+  }, [sessionId, connectWebSocket, closeWebSocket]);
 
   // Build lookup: call_id → tool_result/sub_agent_result entry
   const resultByCallId = buildResultByCallId(entries);
@@ -383,7 +466,7 @@ function App() {
         onClose={() => setSidebarOpen(false)}
         currentSessionId={sessionId}
         onNewChat={() => {
-          wsRef.current?.close();
+          closeWebSocket();
           setEntries([]);
           setInput("");
           setLoading(false);
@@ -401,7 +484,7 @@ function App() {
           <Menu size={20} />
         </button>
         <h1 onClick={() => {
-          wsRef.current?.close();
+          closeWebSocket();
           setEntries([]);
           setInput("");
           setLoading(false);
@@ -492,6 +575,17 @@ function App() {
             <pre className="event-card-body">{streamingReasoning}</pre>
           </div>
         )}
+        {debugMode &&
+          Object.entries(subAgentStreams).map(([agentName, stream]) => (
+            <div key={agentName} className="event-card streaming">
+              <div className="event-card-header">
+                <span className="event-icon">{"\uD83E\uDD16"}</span>
+                <span className="event-label">{agentName}</span>
+                <span className="streaming-indicator">{"\u25CF"}</span>
+              </div>
+              <pre className="event-card-body">{[stream.reasoning, stream.content].filter(Boolean).join("\n\n")}</pre>
+            </div>
+          ))}
         {streamingContent ? (
           <div className="message assistant">
             <div className="bubble"><ReactMarkdown>{streamingContent}</ReactMarkdown></div>
@@ -503,6 +597,15 @@ function App() {
               <span className="dot" />
               <span className="dot" />
             </div>
+            <div className="sub-agent-statuses">
+              {Object.entries(subAgentStreams)
+                .filter(([, stream]) => stream.content)
+                .map(([agentName, stream]) => (
+                  <div key={agentName} className="sub-agent-status">
+                    {agentName.replace(/_/g, " ")}: {stream.content.slice(-120)}
+                  </div>
+                ))}
+            </div>
           </div>
         )}
         <div ref={messagesEndRef} />
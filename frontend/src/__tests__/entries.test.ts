@@ -1,6 +1,13 @@
 import { describe, it, expect } from "vitest";
 import { Entry } from "../types";
-import { buildResultByCallId, visibleEntries, getResultEntry } from "../entries";
+import {
+  advanceCursor,
+  appendSubAgentDelta,
+  buildResultByCallId,
+  clearSubAgentStream,
+  visibleEntries,
+  getResultEntry,
+} from "../entries";
 
 /** Helper to build a minimal Entry */
 function entry(kind: Entry["kind"], data: Entry["data"], id = "e-" + Math.random()): Entry {
@@ -56,3 +63,35 @@ describe("getResultEntry", () => {
     expect(getResultEntry(userMsg, map)).toBeUndefined();
   });
 });
+
+describe("advanceCursor", () => {
+  it("moves forward to newer updatedAt and never backwards", () => {
+    const older = { ...userMsg, updatedAt: "2026-01-01T10:00:00.100000" };
+    const newer = { ...userMsg, updatedAt: "2026-01-01T10:00:05.200000" };
+    expect(advanceCursor(null, older)).toBe(older.updatedAt);
+    expect(advanceCursor(older.updatedAt!, newer)).toBe(newer.updatedAt);
+    expect(advanceCursor(newer.updatedAt!, older)).toBe(newer.updatedAt);
+  });
+
+  it("ignores entries without updatedAt", () => {
+    expect(advanceCursor(null, userMsg)).toBeNull();
+  });
+});
+
+describe("sub-agent streams", () => {
+  it("accumulates deltas per agent without touching other agents", () => {
+    let streams = appendSubAgentDelta({}, "location_agent", "content", "Found ");
+    streams = appendSubAgentDelta(streams, "memory_manager", "reasoning", "Checking");
+    streams = appendSubAgentDelta(streams, "location_agent", "content", "3 signs");
+    expect(streams).toEqual({
+      location_agent: { reasoning: "", content: "Found 3 signs" },
+      memory_manager: { reasoning: "Checking", content: "" },
+    });
+  });
+
+  it("clears one agent's stream and leaves unknown agents alone", () => {
+    const streams = appendSubAgentDelta({}, "location_agent", "content", "x");
+    expect(clearSubAgentStream(streams, "location_agent")).toEqual({});
+    expect(clearSubAgentStream(streams, "memory_manager")).toBe(streams);
+  });
+});
@@ -7,6 +7,7 @@ import {
   ReasoningData,
   SubAgentCallData,
   SubAgentResultData,
+  ContextSummaryData,
 } from "../types";
 
 interface Props {
@@ -21,6 +22,7 @@ const EVENT_META: Record<
   tool_call: { icon: "\uD83D\uDD27", label: "Tool Call" },
   reasoning: { icon: "\uD83E\uDDE0", label: "Reasoning" },
   sub_agent_call: { icon: "\uD83E\uDD16", label: "Sub-Agent Call" },
+  context_summary: { icon: "\uD83D\uDDDC\uFE0F", label: "Context Summary" },
 };
 
 const STATUS_INDICATOR: Record<string, string> = {
@@ -43,6 +45,10 @@ export function formatCallBody(kind: EntryKind, data: Entry["data"]): string {
       const d = data as SubAgentCallData;
       return `Delegating to ${d.agent_name}`;
     }
+    case "context_summary": {
+      const d = data as ContextSummaryData;
+      return `Summarized through #${d.through_seq}:\n${d.content}`;
+    }
     default:
       return JSON.stringify(data);
   }
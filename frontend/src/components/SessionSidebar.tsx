@@ -5,6 +5,10 @@ import { X, Plus } from "lucide-react";
 interface Session {
   id: string;
   started_at: string;
+  last_activity_at: string;
+  entry_count: number;
+  preview: string | null;
+  has_image: boolean;
 }
 
 interface SessionSidebarProps {
@@ -15,6 +19,16 @@ interface SessionSidebarProps {
 }
 
 const API_BASE = "/api";
+const PAGE_SIZE = 50;
+
+function sessionsUrl(after?: Session): string {
+  const params = new URLSearchParams({ limit: String(PAGE_SIZE) });
+  if (after) {
+    params.set("before_activity", after.last_activity_at);
+    params.set("before_id", after.id);
+  }
+  return `${API_BASE}/sessions?${params}`;
+}
 
 function formatTime(isoString: string): string {
   const date = new Date(isoString);
@@ -24,17 +38,23 @@ function formatTime(isoString: string): string {
 export function SessionSidebar({ open, onClose, currentSessionId, onNewChat }: SessionSidebarProps) {
   const navigate = useNavigate();
   const [sessions, setSessions] = useState<Session[]>([]);
+  const [hasMore, setHasMore] = useState(false);
+
+  const loadPage = async (after?: Session) => {
+    try {
+      const res = await fetch(sessionsUrl(after));
+      if (!res.ok) return;
+      const page: Session[] = await res.json();
+      setSessions((prev) => (after ? [...prev, ...page] : page));
+      setHasMore(page.length === PAGE_SIZE);
+    } catch {
+      // ignore
+    }
+  };
 
   useEffect(() => {
     if (!open) return;
-    (async () => {
-      try {
-        const res = await fetch(`${API_BASE}/sessions`);
-        if (res.ok) setSessions(await res.json());
-      } catch {
-        // ignore
-      }
-    })();
+    loadPage();
   }, [open]);
 
   return (
@@ -67,9 +87,18 @@ export function SessionSidebar({ open, onClose, currentSessionId, onNewChat }: S
                 onClose();
               }}
             >
-              {formatTime(s.started_at)}
+              <span className="sidebar-item-preview">
+                {s.has_image ? "\uD83D\uDCF7 " : ""}
+                {s.preview || "New chat"}
+              </span>
+              <span className="sidebar-item-time">{formatTime(s.last_activity_at)}</span>
             </button>
           ))}
+          {hasMore && (
+            <button className="sidebar-load-more" onClick={() => loadPage(sessions[sessions.length - 1])}>
+              Load more
+            </button>
+          )}
         </div>
       </div>
     </>
@@ -35,3 +35,40 @@ export function getResultEntry(
   }
   return undefined;
 }
+
+/** Advance a resume cursor to an entry's updatedAt if it is newer */
+export function advanceCursor(cursor: string | null, entry: Entry): string | null {
+  if (!entry.updatedAt) return cursor;
+  if (cursor === null || Date.parse(entry.updatedAt) >= Date.parse(cursor)) {
+    return entry.updatedAt;
+  }
+  return cursor;
+}
+
+/** Live text of a sub-agent's current LLM call, built from its tagged deltas */
+export interface SubAgentStream {
+  reasoning: string;
+  content: string;
+}
+
+/** Append a reasoning or content delta to its agent's stream */
+export function appendSubAgentDelta(
+  streams: Record<string, SubAgentStream>,
+  agentName: string,
+  field: keyof SubAgentStream,
+  text: string,
+): Record<string, SubAgentStream> {
+  const current = streams[agentName] ?? { reasoning: "", content: "" };
+  return { ...streams, [agentName]: { ...current, [field]: current[field] + text } };
+}
+
+/** Drop an agent's stream once its output has arrived as entries */
+export function clearSubAgentStream(
+  streams: Record<string, SubAgentStream>,
+  agentName: string,
+): Record<string, SubAgentStream> {
+  if (!(agentName in streams)) return streams;
+  const rest = { ...streams };
+  delete rest[agentName];
+  return rest;
+}
@@ -5,14 +5,19 @@ export type EntryKind =
   | "tool_result"
   | "reasoning"
   | "sub_agent_call"
-  | "sub_agent_result";
+  | "sub_agent_result"
+  | "context_summary";
 
 export interface Entry {
   id: string;
   sessionId: string;
+  /** Per-session position assigned by the server */
+  seq?: number;
   kind: EntryKind;
   data: EntryData;
   createdAt: string;
+  /** Last server-side change; used as the resume cursor on reconnect */
+  updatedAt?: string;
   status?: "pending" | "running" | "done" | "failed";
 }
 
@@ -24,7 +29,8 @@ export type EntryData =
   | ToolResultData
   | ReasoningData
   | SubAgentCallData
-  | SubAgentResultData;
+  | SubAgentResultData
+  | ContextSummaryData;
 
 export interface UserMessageData {
   content: string;
@@ -61,6 +67,11 @@ export interface SubAgentResultData {
   result: unknown;
 }
 
+export interface ContextSummaryData {
+  content: string;
+  through_seq: number;
+}
+
 /** Whether an entry kind is a chat message (always visible) or a debug event (toggleable) */
 export function isMessageEntry(kind: EntryKind): boolean {
   return kind === "user_message" || kind === "assistant_message";